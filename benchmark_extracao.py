@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+from parsers.bdtd_parser import iter_result_cards
+
+# Nome do arquivo de banco de dados (páginas reais do histórico, se existir)
+DB_NAME = "database.db"
+REPETICOES = 5
+
+
+def extrair_cards_legado(html_content):
+    """Implementação anterior: árvore completa com html.parser e vários select por card."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    linhas = []
+    for res in soup.select('.result.card-results'):
+        title_tag = res.select_one('h2 a.title')
+        titulo = title_tag.get_text(" ", strip=True) if title_tag else "-"
+        l_busc = title_tag['href'] if title_tag else "-"
+        if l_busc.startswith('/'):
+            l_busc = "https://bdtd.ibict.br" + l_busc
+
+        autor = res.select_one('a[href*="/Author/"]').get_text(" ", strip=True) if res.select_one('a[href*="/Author/"]') else "-"
+        repo_tag = res.find('a', string=lambda s: s and "Acessar documento" in s)
+        l_repo = repo_tag['href'] if repo_tag else "-"
+        linhas.append((titulo, autor, l_busc, l_repo))
+    return linhas
+
+
+def pagina_sintetica(cards=100):
+    """Página de resultados no formato do VuFind da BDTD, com cabeçalho, filtros e rodapé."""
+    ruido = "".join(f'<li class="facet"><a href="/vufind/Search/Results?filter[]=x{i}">Filtro {i}</a></li>' for i in range(300))
+    itens = "".join(f"""
+        <div class="result card-results" id="result{i}">
+          <div class="media-body">
+            <h2><a class="title" href="/vufind/Record/REC_{i}">Título da pesquisa número {i}</a></h2>
+            <div class="result-author">por <a href="/vufind/Author/Home?author=Autor+{i}">Autor {i}</a></div>
+            <div class="result-links">
+              <a href="https://repositorio.exemplo.br/handle/123/{i}">Acessar documento</a>
+              <a href="/vufind/Record/REC_{i}/Export?style=RIS">Exportar</a>
+            </div>
+          </div>
+        </div>""" for i in range(cards))
+    return (f'<html><head><script>var x = 1;</script></head><body><nav>{ruido}</nav>'
+            f'<div class="search-stats">Mostrando 1 - {cards} de 1000</div>{itens}'
+            f'<footer>{ruido}</footer></body></html>')
+
+
+def carregar_paginas():
+    if not os.path.exists(DB_NAME):
+        return [pagina_sintetica()] * 20, "sintéticas"
+    from models.db_handler import DatabaseHandler
+    db = DatabaseHandler(DB_NAME)
+    paginas = []
+    for rowid in db.get_history_ids():
+        record = db.get_scrape_full_details(rowid)
+        if record and record[4]:
+            paginas.append(record[4])
+    db.close()
+    return (paginas, "do histórico") if paginas else ([pagina_sintetica()] * 20, "sintéticas")
+
+
+def medir(funcao, paginas):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        for html in paginas:
+            list(funcao(html))
+    return (time.perf_counter() - inicio) / REPETICOES
+
+
+def executar_benchmark():
+    paginas, origem = carregar_paginas()
+    print(f"{len(paginas)} páginas {origem}, {REPETICOES} repetições")
+
+    # As duas implementações devem produzir exatamente as mesmas linhas
+    for html in paginas:
+        if extrair_cards_legado(html) != list(iter_result_cards(html)):
+            print("Erro: resultados divergentes entre as implementações.")
+            sys.exit(1)
+
+    legado = medir(extrair_cards_legado, paginas)
+    streaming = medir(iter_result_cards, paginas)
+    print("-" * 30)
+    print(f"Legado (árvore completa): {legado * 1000:.1f} ms")
+    print(f"Streaming (SoupStrainer): {streaming * 1000:.1f} ms")
+    print(f"Ganho: {legado / streaming:.1f}x")
+
+
+if __name__ == "__main__":
+    executar_benchmark()
@@ -0,0 +1,207 @@
+import argparse
+import json
+import sys
+import time
+from viewmodels.main_vm import MainViewModel
+from services.job_control import (
+    JOB_PAUSED, JOB_CANCELLED, JobBusyError,
+    JOB_KIND_PAGINATION, JOB_KIND_EXTRACTION, JOB_KIND_DOWNLOAD, JOB_KIND_PARSE
+)
+
+# Códigos de saída do processo
+EXIT_OK = 0
+EXIT_ERROR = 1          # Falha fatal: a etapa não chegou ao fim
+EXIT_USAGE = 2          # Argumentos inválidos (mesmo código do argparse)
+EXIT_PARTIAL = 3        # Lote concluído com itens em falha ou adiados (ex.: disjuntor aberto)
+EXIT_INTERRUPTED = 130  # Ctrl+C ou lote cancelado/pausado
+
+# Etapas executadas pelo subcomando `pipeline`, em ordem
+PIPELINE_STEPS = ("paginate", "extract", "download", "parse")
+
+# Tipo de job que cada subcomando pode retomar com --job
+COMMAND_KINDS = {
+    'paginate': JOB_KIND_PAGINATION,
+    'extract': JOB_KIND_EXTRACTION,
+    'download': JOB_KIND_DOWNLOAD,
+    'parse': JOB_KIND_PARSE,
+}
+
+
+def emit(event, **fields):
+    """Uma linha JSON por evento no stdout (fácil de filtrar com jq ou ler de outro processo)."""
+    print(json.dumps({'ts': round(time.time(), 3), 'event': event, **fields}, ensure_ascii=False), flush=True)
+
+
+def status_printer(command):
+    return lambda message: emit('status', command=command, message=message)
+
+
+def job_result(vm, command, job_id):
+    """Emite o resumo do job da etapa e retorna o código de saída correspondente."""
+    summary = vm.db.get_job_summary(job_id) if job_id is not None else None
+    if summary is None:
+        emit('result', command=command, job_id=None, exit_code=EXIT_OK)
+        return EXIT_OK
+
+    if summary['estado'] in (JOB_PAUSED, JOB_CANCELLED):
+        code = EXIT_INTERRUPTED
+    elif summary['falha'] or summary['pendente']:
+        # Itens pendentes num job ainda 'executando' foram adiados (disjuntor): retome com --job
+        code = EXIT_PARTIAL
+    else:
+        code = EXIT_OK
+    emit('result', command=command, job_id=job_id, exit_code=code, **summary)
+    return code
+
+
+def check_job(vm, command, job_id):
+    """Mensagem de erro se o job a retomar não existe ou é de outra etapa; None se estiver ok."""
+    summary = vm.db.get_job_summary(job_id)
+    if summary is None:
+        return f"Job {job_id} não encontrado."
+    if summary['tipo'] != COMMAND_KINDS[command]:
+        return f"Job {job_id} é do tipo '{summary['tipo']}'; o subcomando '{command}' retoma '{COMMAND_KINDS[command]}'."
+    return None
+
+
+# --- Etapas (núcleos síncronos do MainViewModel) ---
+
+def run_scrape(vm, args):
+    vm.run_scrape(args.url, args.termo, args.ano, status_printer('scrape'))
+    emit('result', command='scrape', exit_code=EXIT_OK)
+    return EXIT_OK
+
+
+def run_paginate(vm, args):
+    if args.workers:
+        vm.pagination.max_workers = args.workers
+    if args.per_host:
+        vm.pagination.per_host = args.per_host
+    ids = None if args.job else (args.ids or vm.get_history_ids(first_page_only=True))
+    job_id = vm.run_pagination_batch(ids, status_printer('paginate'), args.job)
+    return job_result(vm, 'paginate', job_id)
+
+
+def run_extract(vm, args):
+    ids = None if args.job else (args.ids or vm.get_history_ids())
+    job_id = vm.run_extraction_batch(ids, status_printer('extract'), args.job)
+    return job_result(vm, 'extract', job_id)
+
+
+def run_download(vm, args):
+    job_id = vm.run_download_batch(status_printer('download'), args.download_workers, args.per_domain, args.job,
+                                   getattr(args, 'refresh', False))
+    return job_result(vm, 'download', job_id)
+
+
+def run_parse(vm, args):
+    job_id = vm.run_parser_batch(status_printer('parse'), args.processes, args.job)
+    return job_result(vm, 'parse', job_id)
+
+
+COMMANDS = {
+    'scrape': run_scrape,
+    'paginate': run_paginate,
+    'extract': run_extract,
+    'download': run_download,
+    'parse': run_parse,
+}
+
+
+def run_pipeline(vm, args):
+    """Paginação, extração, download e parser em sequência; para na primeira etapa que falhar."""
+    args.job = None
+    args.ids = None
+    worst = EXIT_OK
+    for step in PIPELINE_STEPS:
+        emit('step', command=step)
+        code = COMMANDS[step](vm, args)
+        if code in (EXIT_ERROR, EXIT_INTERRUPTED):
+            return code
+        worst = max(worst, code)
+    return worst
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Executa as etapas do scraper sem interface gráfica (progresso em linhas JSON no stdout)."
+    )
+    parser.add_argument('--db', default="database.db", help="Arquivo do banco SQLite (padrão: database.db)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    scrape = sub.add_parser('scrape', help="Captura a página 1 de uma busca da BDTD")
+    scrape.add_argument('url', help="URL de resultados da busca")
+    scrape.add_argument('--termo', required=True, help="Termo gravado no histórico")
+    scrape.add_argument('--ano', required=True, help="Ano gravado no histórico")
+
+    def add_job(command, ids=False):
+        if ids:
+            command.add_argument('--ids', type=int, nargs='+', help="IDs do histórico (padrão: todos)")
+        command.add_argument('--job', type=int, help="Retoma o job interrompido com este id")
+
+    def add_pagination(command):
+        command.add_argument('--workers', type=int, help="Páginas baixadas em paralelo")
+        command.add_argument('--per-host', type=int, help="Conexões simultâneas por host na paginação")
+
+    def add_download(command, flag):
+        command.add_argument(flag, dest='download_workers', type=int, help="Downloads em paralelo")
+        command.add_argument('--per-domain', type=int, help="Downloads simultâneos por domínio")
+
+    def add_parse(command):
+        command.add_argument('--processes', type=int, help="Processos do parser (padrão: um por núcleo)")
+
+    paginate = sub.add_parser('paginate', help="Captura as páginas restantes das buscas")
+    add_job(paginate, ids=True)
+    add_pagination(paginate)
+
+    extract = sub.add_parser('extract', help="Extrai as pesquisas das páginas do histórico")
+    add_job(extract, ids=True)
+
+    download = sub.add_parser('download', help="Baixa o HTML dos repositórios pendentes")
+    add_job(download)
+    add_download(download, '--workers')
+    download.add_argument('--refresh', action='store_true',
+                          help="Revalida também os HTMLs já salvos (GET condicional: páginas inalteradas voltam 304)")
+
+    parse = sub.add_parser('parse', help="Extrai sigla, universidade, programa e PDF dos HTMLs salvos")
+    add_job(parse)
+    add_parse(parse)
+
+    pipeline = sub.add_parser('pipeline', help="paginate, extract, download e parse em sequência")
+    add_pagination(pipeline)
+    add_download(pipeline, '--download-workers')
+    add_parse(pipeline)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    vm = MainViewModel(args.db)
+    try:
+        if getattr(args, 'job', None) is not None:
+            message = check_job(vm, args.command, args.job)
+            if message:
+                emit('error', command=args.command, message=message, exit_code=EXIT_USAGE)
+                return EXIT_USAGE
+        if args.command == 'pipeline':
+            return run_pipeline(vm, args)
+        return COMMANDS[args.command](vm, args)
+    except JobBusyError as e:
+        emit('error', command=args.command, message=str(e), exit_code=EXIT_ERROR)
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        # Jobs interrompidos continuam 'executando' e podem ser retomados com --job
+        jobs = [job_id for job_id, *_ in vm.db.get_unfinished_jobs()]
+        emit('interrupted', command=args.command, jobs=jobs, exit_code=EXIT_INTERRUPTED)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        vm.db.log_event(f"Erro na linha de comando ({args.command}): {e}")
+        emit('error', command=args.command, message=str(e), exit_code=EXIT_ERROR)
+        return EXIT_ERROR
+    finally:
+        vm.db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import sqlite3
 import os
+from models.blob_store import HtmlBlobStore
 
 # Nome do arquivo de banco de dados (ajuste se o seu arquivo tiver outro nome)
 DB_NAME = "database.db"
@@ -20,6 +21,10 @@ def limpar_tabela_pesquisas():
         print(f"Limpando a tabela 'pesquisas_extraidas'...")
         cursor.execute("DELETE FROM pesquisas_extraidas")
         
+        # Remove os HTMLs comprimidos que só as pesquisas apagadas usavam
+        removidos = HtmlBlobStore(conn).purge_orphans(cursor)
+        print(f"{removidos} HTMLs sem referência removidos do armazenamento.")
+
         # Opcional: Reiniciar o contador de ID (autoincrement)
         cursor.execute("DELETE FROM sqlite_sequence WHERE name='pesquisas_extraidas'")
 
@@ -1,10 +1,20 @@
 import sqlite3
 import os
+from models.blob_store import HtmlBlobStore
+from models.search_index import register_functions
 
 # Nomes dos arquivos de banco de dados
 SOURCE_DB = "resultados_scraper.db"
 DEST_DB = "database.db"
 
+# Colunas HTML convertidas para referências do armazenamento de blobs
+HTML_COLUMNS = [
+    ("paginas_busca", "rowid", "html_source"),
+    ("pesquisas_extraidas", "id", "html_buscador"),
+    ("pesquisas_extraidas", "id", "html_repositorio"),
+]
+BATCH_SIZE = 200
+
 def migrate_data():
     # 1. Verificar se os arquivos existem
     if not os.path.exists(SOURCE_DB):
@@ -84,5 +94,73 @@ def migrate_data():
         if 'conn_src' in locals(): conn_src.close()
         if 'conn_dest' in locals(): conn_dest.close()
 
+def migrar_html_para_blobs(db_path=DEST_DB):
+    """
+    Converte, no próprio banco, o HTML bruto das colunas HTML em referências
+    comprimidas e deduplicadas (tabela html_blobs). Pode ser executada mais de
+    uma vez: valores já convertidos são ignorados.
+    """
+    if not os.path.exists(db_path):
+        print(f"ERRO: O banco '{db_path}' não foi encontrado.")
+        return
+
+    print(f"--- Compactando HTML em '{db_path}' ---")
+    conn = sqlite3.connect(db_path)
+    # Os triggers do índice de busca chamam esta função ao atualizar as colunas HTML
+    register_functions(conn)
+    try:
+        store = HtmlBlobStore(conn)
+        store.create_table()
+        conn.commit()
+
+        for table, key, column in HTML_COLUMNS:
+            try:
+                conn.execute(f"SELECT {column} FROM {table} LIMIT 1")
+            except sqlite3.OperationalError:
+                print(f"Coluna {table}.{column} não existe. Ignorando.")
+                continue
+
+            converted = 0
+            while True:
+                # Cada lote é uma transação: uma interrupção não deixa registros pela metade
+                rows = conn.execute(f"""
+                    SELECT {key}, {column} FROM {table}
+                    WHERE {column} IS NOT NULL AND {column} != '' AND {column} != '-'
+                      AND {column} NOT LIKE 'blob:%'
+                    LIMIT ?
+                """, (BATCH_SIZE,)).fetchall()
+                if not rows:
+                    break
+
+                with conn:
+                    for row_key, html in rows:
+                        ref = store.put(html)
+                        conn.execute(f"UPDATE {table} SET {column} = ? WHERE {key} = ?", (ref, row_key))
+                converted += len(rows)
+                print(f"{table}.{column}: {converted} registros convertidos...")
+
+            print(f"{table}.{column}: concluído ({converted} registros).")
+
+        try:
+            with conn:
+                removed = store.purge_orphans()
+            print(f"Blobs órfãos removidos: {removed}")
+        except sqlite3.OperationalError:
+            print("Limpeza de blobs órfãos ignorada (tabelas do aplicativo ausentes).")
+
+        # Devolve ao sistema o espaço ocupado pelo HTML sem compressão
+        print("Executando VACUUM (pode demorar)...")
+        conn.execute("VACUUM")
+
+        total_blobs, bruto = conn.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM html_blobs").fetchone()
+        print("-" * 30)
+        print("COMPACTAÇÃO CONCLUÍDA!")
+        print(f"Blobs únicos: {total_blobs} ({bruto / 1024 / 1024:.1f} MB sem compressão)")
+    except sqlite3.Error as e:
+        print(f"Ocorreu um erro no banco de dados: {e}")
+    finally:
+        conn.close()
+
 if __name__ == "__main__":
-    migrate_data()
\ No newline at end of file
+    migrate_data()
+    migrar_html_para_blobs()
\ No newline at end of file
@@ -0,0 +1,138 @@
+import hashlib
+import sqlite3
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # Dependência opcional: zlib (stdlib) é usado como alternativa
+    zstandard = None
+
+# Valores das colunas HTML que apontam para o armazenamento de blobs
+BLOB_PREFIX = "blob:"
+
+# Índices parciais das referências: só as linhas 'blob:<sha256>' entram no índice,
+# então o HTML bruto legado (antes de migrar_dados.py) não é copiado para as árvores
+REF_INDEXES = (
+    ('idx_paginas_busca_blob', 'paginas_busca', 'html_source'),
+    ('idx_pesquisas_blob_busc', 'pesquisas_extraidas', 'html_buscador'),
+    ('idx_pesquisas_blob_repo', 'pesquisas_extraidas', 'html_repositorio'),
+)
+
+
+class HtmlBlobStore:
+    """
+    Armazenamento de HTML comprimido e endereçado pelo conteúdo (SHA-256).
+
+    As colunas HTML guardam apenas a referência 'blob:<sha256>'. Páginas
+    idênticas (ex.: o mesmo boilerplate da BDTD) são gravadas uma única vez,
+    e a descompressão só acontece quando o conteúdo é de fato lido.
+    """
+
+    def __init__(self, conn):
+        # Conexão fixa ou função que devolve a conexão de leitura da thread atual
+        self._conn = conn
+        self.codec = "zstd" if zstandard else "zlib"
+
+    @property
+    def conn(self):
+        return self._conn if isinstance(self._conn, sqlite3.Connection) else self._conn()
+
+    def create_table(self, cursor=None):
+        (cursor or self.conn).execute("""
+            CREATE TABLE IF NOT EXISTS html_blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                tamanho INTEGER,
+                dados BLOB NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def create_ref_indexes(cursor):
+        """Cria os índices parciais das referências; retorna True se algum foi criado agora."""
+        existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for name, table, column in REF_INDEXES:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column}) WHERE {column} LIKE 'blob:%'"
+            )
+        return any(name not in existing for name, _, _ in REF_INDEXES)
+
+    @staticmethod
+    def is_ref(value):
+        return isinstance(value, str) and value.startswith(BLOB_PREFIX)
+
+    @staticmethod
+    def hash_of(value):
+        """Hash do conteúdo a partir da referência (sem descomprimir) ou do próprio HTML."""
+        if HtmlBlobStore.is_ref(value):
+            return value[len(BLOB_PREFIX):]
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+    def put(self, html, cursor=None):
+        """Grava o HTML (se ainda não existir) e retorna a referência a ser salva na coluna."""
+        if not html or self.is_ref(html):
+            return html
+
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        (cursor or self.conn).execute(
+            "INSERT OR IGNORE INTO html_blobs (hash, codec, tamanho, dados) VALUES (?, ?, ?, ?)",
+            (digest, self.codec, len(raw), self._compress(raw))
+        )
+        return BLOB_PREFIX + digest
+
+    def get(self, value):
+        """Resolve uma referência para o HTML original; valores legados são devolvidos como estão."""
+        if not self.is_ref(value):
+            return value
+
+        row = self.conn.execute(
+            "SELECT codec, dados FROM html_blobs WHERE hash = ?", (value[len(BLOB_PREFIX):],)
+        ).fetchone()
+        if not row:
+            return None
+        return self.decompress(row[0], row[1])
+
+    def _compress(self, raw):
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(raw)
+        return zlib.compress(raw, 6)
+
+    @staticmethod
+    def decompress(codec, data):
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Blob comprimido com zstd, mas o pacote 'zstandard' não está instalado.")
+            return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+        return zlib.decompress(data).decode("utf-8")
+
+    def release(self, refs, cursor=None):
+        """
+        Remove os blobs das referências informadas que deixaram de ser usadas
+        (chamado após updates/deletes, na mesma transação). O LIKE repete a condição
+        dos índices parciais das referências (ver REF_INDEXES) para que sejam usados.
+        """
+        cur = cursor or self.conn
+        removed = 0
+        for ref in {ref for ref in refs if self.is_ref(ref)}:
+            removed += cur.execute("""
+                DELETE FROM html_blobs WHERE hash = ?
+                AND NOT EXISTS (SELECT 1 FROM paginas_busca
+                                WHERE html_source = ? AND html_source LIKE 'blob:%')
+                AND NOT EXISTS (SELECT 1 FROM pesquisas_extraidas
+                                WHERE html_buscador = ? AND html_buscador LIKE 'blob:%')
+                AND NOT EXISTS (SELECT 1 FROM pesquisas_extraidas
+                                WHERE html_repositorio = ? AND html_repositorio LIKE 'blob:%')
+            """, (ref[len(BLOB_PREFIX):], ref, ref, ref)).rowcount
+        return removed
+
+    def purge_orphans(self, cursor=None):
+        """Remove blobs que não são mais referenciados por nenhuma coluna HTML."""
+        cur = (cursor or self.conn).execute("""
+            DELETE FROM html_blobs WHERE ('blob:' || hash) NOT IN (
+                SELECT html_source FROM paginas_busca WHERE html_source LIKE 'blob:%'
+                UNION SELECT html_buscador FROM pesquisas_extraidas WHERE html_buscador LIKE 'blob:%'
+                UNION SELECT html_repositorio FROM pesquisas_extraidas WHERE html_repositorio LIKE 'blob:%'
+            )
+        """)
+        return cur.rowcount
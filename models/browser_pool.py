@@ -0,0 +1,199 @@
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.edge.service import Service
+from selenium.webdriver.edge.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Marcadores de DOM que indicam que a página do item terminou de renderizar
+READY_SELECTORS = (
+    "ds-item-page",                      # DSpace 7+ (Angular)
+    "meta[name='citation_pdf_url']",     # Meta tags Google Scholar
+    "meta[name='citation_title']",
+    "table.itemDisplayTable",            # DSpace JSPUI
+)
+
+# Textos presentes apenas enquanto o desafio antirrobô ainda está na tela
+CHALLENGE_MARKERS = ("anubis", "not a bot", "verificando sua sessão", "recaptcha")
+
+
+class _PooledBrowser:
+    """Navegador do pool com a contagem de páginas já servidas."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """
+    Pool de navegadores Edge headless reaproveitados entre downloads.
+
+    Os navegadores são criados sob demanda até `size` instâncias e reciclados
+    após `max_pages` páginas ou após qualquer erro durante o uso. Um navegador
+    ocioso cujo driver morreu é descartado no checkout (verificação de saúde).
+    """
+
+    def __init__(self, driver_path, user_agent, size=2, max_pages=50, ready_timeout=20):
+        self.driver_path = driver_path
+        self.user_agent = user_agent
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.ready_timeout = ready_timeout
+
+        # Ociosos (LIFO) e vagas protegidos pela mesma condição: quem devolve ou
+        # descarta um navegador acorda as threads esperando no checkout
+        self._idle = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _new_browser(self):
+        edge_options = Options()
+        edge_options.add_argument("--headless")  # Executa sem abrir janela visual
+        edge_options.add_argument("--disable-gpu")
+        edge_options.add_argument(f"user-agent={self.user_agent}")
+        driver = webdriver.Edge(service=Service(self.driver_path), options=edge_options)
+        return _PooledBrowser(driver)
+
+    def checkout(self, timeout=None):
+        """
+        Retira um navegador do pool, criando um novo se ainda houver vaga.
+        Com o pool cheio, espera até `timeout` segundos (queue.Empty ao esgotar).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("O pool de navegadores já foi encerrado.")
+                    if self._idle:
+                        browser = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        browser = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Empty
+                    self._cond.wait(remaining)
+
+            if browser is None:
+                try:
+                    return self._new_browser()
+                except Exception:
+                    self._release_slot()
+                    raise
+            if self._alive(browser):
+                return browser
+            self._discard(browser)
+
+    @staticmethod
+    def _alive(browser):
+        """Consulta barata ao driver: falha se o processo do msedgedriver ou do Edge morreu."""
+        try:
+            browser.driver.title
+            return True
+        except Exception:
+            return False
+
+    def checkin(self, browser, broken=False):
+        """Devolve o navegador; descarta se quebrou ou atingiu o limite de páginas."""
+        browser.pages += 1
+        if broken or self._closed or browser.pages >= self.max_pages:
+            self._discard(browser)
+        else:
+            with self._cond:
+                self._idle.append(browser)
+                self._cond.notify()
+
+    @contextmanager
+    def browser(self, timeout=None):
+        """Uso: `with pool.browser() as b: b.driver.get(url)`."""
+        browser = self.checkout(timeout=timeout)
+        broken = False
+        try:
+            yield browser
+        except BaseException:
+            # Driver morto costuma vir como MaxRetryError/ConnectionRefusedError, não WebDriverException
+            broken = True
+            raise
+        finally:
+            self.checkin(browser, broken=broken)
+
+    def fetch(self, url):
+        """Carrega a URL e aguarda o DOM ficar pronto em vez de um sleep fixo."""
+        with self.browser() as browser:
+            browser.driver.get(url)
+            try:
+                WebDriverWait(browser.driver, self.ready_timeout, poll_frequency=0.25).until(_page_ready)
+            except TimeoutException:
+                # Captura o que houver: alguns repositórios não expõem nenhum marcador
+                pass
+            return browser.driver.page_source
+
+    def _release_slot(self):
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _discard(self, browser):
+        self._release_slot()
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Encerra todos os navegadores ociosos (chamado ao sair do processo)."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for browser in idle:
+            self._discard(browser)
+
+
+def _page_ready(driver):
+    """Condição de prontidão: marcador de item presente ou documento completo sem desafio."""
+    for selector in READY_SELECTORS:
+        if driver.find_elements("css selector", selector):
+            return True
+
+    if driver.execute_script("return document.readyState") != "complete":
+        return False
+
+    # DSpace Angular: o documento fica "complete" antes do item ser renderizado
+    if driver.find_elements("css selector", "ds-app"):
+        return False
+
+    source = driver.page_source.lower()
+    return not any(marker in source for marker in CHALLENGE_MARKERS)
+
+
+# Pool compartilhado pelo processo
+BROWSER_POOL_CONFIG = {
+    'size': 2,
+    'max_pages': 50,
+    'ready_timeout': 20,
+}
+
+_shared_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(driver_path, user_agent):
+    """Retorna o pool de navegadores do processo, criando-o na primeira chamada."""
+    global _shared_pool
+    if _shared_pool is None:
+        with _pool_lock:
+            if _shared_pool is None:
+                _shared_pool = BrowserPool(driver_path, user_agent, **BROWSER_POOL_CONFIG)
+                atexit.register(_shared_pool.close)
+    return _shared_pool
+
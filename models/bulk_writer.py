@@ -0,0 +1,72 @@
+import time
+
+
+class BulkWriter:
+    """
+    Unidade de trabalho para gravações em lote.
+
+    As operações ficam em memória e são aplicadas numa única transação a cada
+    `max_rows` linhas ou `max_ms` milissegundos (o que vier primeiro), em vez
+    de um commit por registro. Se qualquer operação falhar, o lote inteiro é
+    desfeito: o banco nunca fica com um lote aplicado pela metade.
+
+    Uso:
+        with db.bulk() as bulk:
+            bulk.call(db.update_html_repositorio, rid, html)
+            bulk.execute("UPDATE ... WHERE id = ?", params)
+    """
+
+    def __init__(self, db, max_rows=500, max_ms=1000):
+        self.db = db
+        self.max_rows = max(1, int(max_rows))
+        self.max_ms = max_ms
+        self._ops = []
+        self._rows = 0
+        self._started = time.monotonic()
+
+    def execute(self, sql, params):
+        """Agenda um comando SQL; comandos iguais em sequência viram um único `executemany`."""
+        if self._ops and self._ops[-1][0] == "sql" and self._ops[-1][1] == sql:
+            self._ops[-1][2].append(params)
+        else:
+            self._ops.append(("sql", sql, [params]))
+        self._added(1)
+
+    def call(self, method, *args, rows=1):
+        """Agenda um método de gravação do DatabaseHandler para rodar dentro da transação do lote."""
+        self._ops.append(("call", method, args))
+        self._added(rows)
+
+    def _added(self, rows):
+        if self._rows == 0:
+            self._started = time.monotonic()
+        self._rows += rows
+        elapsed_ms = (time.monotonic() - self._started) * 1000
+        if self._rows >= self.max_rows or elapsed_ms >= self.max_ms:
+            self.flush()
+
+    @property
+    def pending(self):
+        return self._rows
+
+    def flush(self):
+        """Aplica as operações pendentes em uma transação (rollback completo em caso de erro)."""
+        ops, self._ops, self._rows = self._ops, [], 0
+        if ops:
+            self.db.write(self._apply, ops)
+
+    def _apply(self, ops):
+        with self.db.transaction() as cursor:
+            for kind, target, args in ops:
+                if kind == "sql":
+                    cursor.executemany(target, args)
+                else:
+                    target(*args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # O que já foi enfileirado são registros completos: grava mesmo se o lote foi interrompido
+        self.flush()
+        return False
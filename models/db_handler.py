@@ -1,45 +1,152 @@
 import sqlite3
+import json
+import atexit
+import threading
+import functools
+from contextlib import contextmanager
 from datetime import datetime
+from urllib.parse import urlparse, unquote
+from models.blob_store import HtmlBlobStore, BLOB_PREFIX
+from models.bulk_writer import BulkWriter
+from models.db_writer import DbWriter
+from models.event_log import BufferedEventLog
+from models.search_index import register_functions, create_search_index, build_match_query, FTS_WEIGHTS
+
+# Colunas exibidas na grade da aba Pesquisas (o id vem primeiro e não é exibido)
+RESEARCH_GRID_COLUMNS = """id, titulo, autor, link_buscador, link_repositorio,
+                   sigla_univ, nome_univ, programa, link_pdf,
+                   termo_pesquisado, ano_pesquisado"""
+
+# Coluna da Treeview -> coluna ordenável no banco
+RESEARCH_SORT_COLUMNS = {
+    'titulo': 'titulo', 'autor': 'autor', 'link_busc': 'link_buscador',
+    'link_repo': 'link_repositorio', 'sigla': 'sigla_univ', 'univ': 'nome_univ',
+    'prog': 'programa', 'pdf': 'link_pdf', 'termo': 'termo_pesquisado',
+    'ano': 'ano_pesquisado'
+}
+
+# Expressão que define se uma coluna HTML tem conteúdo útil
+HAS_HTML_EXPR = "({col} IS NOT NULL AND {col} != '' AND {col} != '-')"
+
+# Itens de um job que ainda precisam ser processados (pendentes ou falhas com tentativas restantes)
+PENDING_JOB_ITEMS_SQL = """
+    SELECT {cast} FROM job_items
+    WHERE job_id = ? AND (estado = 'pendente' OR (estado = 'falha' AND tentativas < ?))
+"""
+
+# Gravação do estado de um item; entra no mesmo lote (BulkWriter) que os dados do item
+JOB_ITEM_UPDATE_SQL = """
+    UPDATE job_items SET estado = ?, tentativas = tentativas + 1, erro = ?, atualizado_em = ?
+    WHERE job_id = ? AND item = ?
+"""
+
+# Campos copiados das duplicatas para a pesquisa mantida quando ela ainda não os tem
+RESEARCH_MERGE_FIELDS = (
+    'titulo', 'autor', 'link_repositorio', 'html_buscador', 'html_repositorio',
+    'sigla_univ', 'nome_univ', 'programa', 'link_pdf',
+)
+
+# Pragmas aplicados a todas as conexões (leitura e escrita)
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -20000",       # ~20 MB de cache de páginas
+    "PRAGMA mmap_size = 268435456",     # 256 MB mapeados em memória
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def writes(method):
+    """Executa o método na thread escritora (transação própria, ou aninhada se já estiver nela)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._writer.submit(method, self, *args, **kwargs)
+    return wrapper
+
+
+def research_link_key(url):
+    """
+    Chave de identidade de uma pesquisa: link do buscador sem esquema, 'www.',
+    porta padrão, query, fragmento e barra final (host em minúsculas).
+    Retorna None para links vazios ou '-', que não participam da deduplicação.
+    """
+    if not url or url.strip() in ("", "-"):
+        return None
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if not host:
+        return None
+    host = host.removeprefix("www.").removesuffix(":443").removesuffix(":80")
+    return f"{host}{unquote(parsed.path).rstrip('/')}"
+
 
 class DatabaseHandler:
 
+    @writes
     def delete_scrape(self, rowid):
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM paginas_busca WHERE rowid = ?", (rowid,))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            old = cursor.execute("SELECT html_source FROM paginas_busca WHERE rowid = ?", (rowid,)).fetchone()
+            cursor.execute("DELETE FROM paginas_busca WHERE rowid = ?", (rowid,))
+            if old:
+                self.blobs.release([old[0]], cursor)
 
     def get_scrape_content_by_id(self, rowid):
         cursor = self.conn.cursor()
         cursor.execute("SELECT html_source FROM paginas_busca WHERE rowid = ?", (rowid,))
         result = cursor.fetchone()
-        return result[0] if result else None
+        return self.blobs.get(result[0]) if result else None
 
     def log_event(self, message):
-        """Grava logs com proteção para não quebrar caso a tabela ainda não exista."""
+        """Registra o evento no buffer; a gravação acontece em lote, em segundo plano."""
+        self.events.log(message)
+
+    @writes
+    def insert_logs(self, entries):
+        """Grava [(mensagem, data)] com proteção para não quebrar caso a tabela ainda não exista."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("INSERT INTO system_logs (message, created_at) VALUES (?, ?)", 
-                          (message, datetime.now()))
-            self.conn.commit()
+            with self.transaction() as cursor:
+                cursor.executemany("INSERT INTO system_logs (message, created_at) VALUES (?, ?)", entries)
         except sqlite3.OperationalError:
             # Fallback silencioso caso a tabela realmente não exista no momento da chamada
-            print(f"Log (Console apenas): {message}")
-        except Exception as e:
-            print(f"Erro inesperado ao salvar log: {e}")
+            for message, _ in entries:
+                print(f"Log (Console apenas): {message}")
 
-    def fetch_all_logs(self):
+    @writes
+    def prune_logs(self, older_than, max_rows):
+        """Remove logs anteriores a `older_than` e mantém no máximo `max_rows` registros."""
+        with self.transaction() as cursor:
+            cursor.execute("DELETE FROM system_logs WHERE created_at < ?", (older_than,))
+            cursor.execute("""
+                DELETE FROM system_logs WHERE id <= (
+                    SELECT id FROM system_logs ORDER BY id DESC LIMIT 1 OFFSET ?
+                )
+            """, (max_rows,))
+
+    def fetch_logs(self, limit=100, offset=0):
+        """Página de logs, do mais recente para o mais antigo: (created_at, message)."""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT created_at, message FROM system_logs ORDER BY created_at DESC")
+        cursor.execute(
+            "SELECT created_at, message FROM system_logs ORDER BY id DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
         return cursor.fetchall()
 
+    def fetch_all_logs(self):
+        """Mantido por compatibilidade: devolve apenas a primeira página."""
+        return self.fetch_logs()
+
     def get_last_log_message(self):
+        recent = self.events.last_message()
+        if recent:
+            return recent
         cursor = self.conn.cursor()
         cursor.execute("SELECT message FROM system_logs ORDER BY id DESC LIMIT 1")
         result = cursor.fetchone()
         return result[0] if result else "Pronto para iniciar."
 
     def close(self):
-        self.conn.close()
+        self.events.close()
+        self._writer.close()
+        self._write_conn.close()
         
     def get_scrape_full_details(self, rowid):
         """Recupera os detalhes completos incluindo a URL original para possibilitar a paginação."""
@@ -49,15 +156,88 @@ class DatabaseHandler:
             FROM paginas_busca 
             WHERE rowid = ?
         """, (rowid,))
-        return cursor.fetchone()
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return row[:4] + (self.blobs.get(row[4]), row[5])
 
     def __init__(self, db_name="database.db"):
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
-        self.create_tables()
+        self.db_name = db_name
+
+        # Conexão exclusiva da thread escritora (WAL: leitores não bloqueiam a escrita)
+        self._write_conn = self._connect()
+        self._write_conn.execute("PRAGMA journal_mode = WAL")
+        self._write_conn.execute("PRAGMA synchronous = NORMAL")
+        # Função usada pelos triggers do índice de busca (texto visível do HTML)
+        register_functions(self._write_conn)
+        self._writer = DbWriter(self._write_conn)
+
+        # Uma conexão de leitura por thread (Tk, tarefas em segundo plano, pré-carga da grade)
+        self._local = threading.local()
+
+        # HTML comprimido e deduplicado; as colunas HTML guardam apenas referências
+        self.blobs = HtmlBlobStore(self._read_conn)
+
+        # Tamanho padrão dos lotes de gravação (linhas / milissegundos)
+        self.bulk_rows = 500
+        self.bulk_ms = 1000
+
+        # Logs acumulados em memória e gravados em lote (nada de commit por mensagem)
+        self.events = BufferedEventLog(self)
+        atexit.register(self.events.close)
+
+        self._writer.submit(self.create_tables)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, isolation_level=None)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _read_conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    @property
+    def conn(self):
+        """Conexão de leitura da thread atual (gravações passam pela thread escritora)."""
+        if self._writer.in_writer_thread():
+            return self._write_conn
+        return self._read_conn()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Bloco atômico na conexão de escrita (SAVEPOINT): um erro desfaz apenas o
+        que foi feito dentro dele. Só pode ser usado na thread escritora, ou seja,
+        dentro de métodos marcados com @writes ou de funções passadas a `write`.
+        """
+        if not self._writer.in_writer_thread():
+            raise RuntimeError("transaction() deve ser usada na thread escritora (use db.write).")
+        cursor = self._write_conn.cursor()
+        cursor.execute("SAVEPOINT tx")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK TO tx")
+            cursor.execute("RELEASE tx")
+            raise
+        cursor.execute("RELEASE tx")
+
+    def write(self, fn, *args, **kwargs):
+        """Executa `fn` na thread escritora, como uma unidade atômica, e aguarda o commit."""
+        return self._writer.submit(fn, *args, **kwargs)
+
+    def bulk(self, max_rows=None, max_ms=None):
+        """Cria um BulkWriter (commit a cada N linhas ou T ms) para os fluxos em lote."""
+        return BulkWriter(self, max_rows or self.bulk_rows, max_ms or self.bulk_ms)
 
     def create_tables(self):
         """Cria as tabelas necessárias garantindo que a tabela de logs exista primeiro."""
-        cursor = self.conn.cursor()
+        cursor = self._write_conn.cursor()
         
         # 1. CRIAR TABELA DE LOGS PRIMEIRO
         # Isso permite que qualquer erro ou migração subsequente seja registrado no banco.
@@ -68,7 +248,8 @@ class DatabaseHandler:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        self.conn.commit()
+        # Poda por idade sem varrer a tabela
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_system_logs_created ON system_logs (created_at)")
 
         # 2. Tabela de Histórico (Guia 2)
         cursor.execute("""
@@ -78,6 +259,8 @@ class DatabaseHandler:
                 PRIMARY KEY (engine, termo, ano, pagina)
             )
         """)
+        # Listagem paginada do histórico ordenada por data sem varrer a tabela
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_paginas_busca_data ON paginas_busca (data_coleta DESC)")
         
         # 3. Tabela consolidada para Pesquisas (Guia 3)
         # Iniciamos com a estrutura base para garantir a compatibilidade.
@@ -103,51 +286,314 @@ class DatabaseHandler:
             cursor.execute("ALTER TABLE pesquisas_extraidas ADD COLUMN ano_pesquisado TEXT")
             self.log_event("Migração: Coluna 'ano_pesquisado' adicionada com sucesso.")
 
+        # Indicadores de presença de HTML mantidos por triggers, para filtrar sem ler o HTML
+        for flag, col in (('has_html_buscador', 'html_buscador'), ('has_html_repositorio', 'html_repositorio')):
+            if flag not in columns:
+                cursor.execute(f"ALTER TABLE pesquisas_extraidas ADD COLUMN {flag} INTEGER NOT NULL DEFAULT 0")
+                cursor.execute(f"UPDATE pesquisas_extraidas SET {flag} = {HAS_HTML_EXPR.format(col=col)}")
+                self.log_event(f"Migração: Coluna '{flag}' adicionada com sucesso.")
+
+        flags_sql = f"""
+            UPDATE pesquisas_extraidas SET
+                has_html_buscador = {HAS_HTML_EXPR.format(col='NEW.html_buscador')},
+                has_html_repositorio = {HAS_HTML_EXPR.format(col='NEW.html_repositorio')}
+            WHERE id = NEW.id;
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pesquisas_has_html_ins
+            AFTER INSERT ON pesquisas_extraidas
+            BEGIN {flags_sql} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pesquisas_has_html_upd
+            AFTER UPDATE OF html_buscador, html_repositorio ON pesquisas_extraidas
+            BEGIN {flags_sql} END
+        """)
+
+        # Origens de cada pesquisa: a mesma tese pode aparecer em vários termos, anos e páginas
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pesquisas_origens (
+                pesquisa_id INTEGER NOT NULL,
+                termo TEXT, ano TEXT, parent_rowid INTEGER,
+                PRIMARY KEY (pesquisa_id, termo, ano, parent_rowid)
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_pesquisas_origens_del
+            AFTER DELETE ON pesquisas_extraidas
+            BEGIN DELETE FROM pesquisas_origens WHERE pesquisa_id = OLD.id; END
+        """)
+
+        # Identidade da pesquisa pelo link do buscador normalizado (ingestão idempotente)
+        if 'link_chave' not in columns:
+            cursor.execute("ALTER TABLE pesquisas_extraidas ADD COLUMN link_chave TEXT")
+            self._merge_duplicate_research(cursor)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_pesquisas_link_chave
+            ON pesquisas_extraidas (link_chave) WHERE link_chave IS NOT NULL
+        """)
+
+        # Índices dos filtros, agrupamentos e junções da aba Pesquisas
+        for name, cols in (
+            ('idx_pesquisas_sigla', 'sigla_univ'),
+            ('idx_pesquisas_univ', 'nome_univ'),
+            ('idx_pesquisas_programa', 'programa'),
+            ('idx_pesquisas_link_repo', 'link_repositorio'),
+            ('idx_pesquisas_parent', 'parent_rowid'),
+            ('idx_pesquisas_has_html_busc', 'has_html_buscador'),
+            ('idx_pesquisas_has_html_repo', 'has_html_repositorio'),
+        ):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON pesquisas_extraidas ({cols})")
+
+        # Armazenamento de HTML comprimido (referenciado pelas colunas HTML)
+        self.blobs.create_table(cursor)
+
+        # Índices das referências: liberar um blob órfão não varre as tabelas.
+        # Os antigos índices sobre a coluna inteira copiavam o HTML legado e são removidos.
+        for old_index in ('idx_paginas_busca_html', 'idx_pesquisas_html_busc', 'idx_pesquisas_html_repo'):
+            cursor.execute(f"DROP INDEX IF EXISTS {old_index}")
+        if self.blobs.create_ref_indexes(cursor):
+            # Órfãos deixados antes da liberação automática (recapturas, exclusões, deduplicação)
+            purged = self.blobs.purge_orphans(cursor)
+            if purged:
+                self.log_event(f"Migração: {purged} HTMLs sem referência removidos do armazenamento.")
+
+        # Busca textual (FTS5) sobre metadados e texto das páginas salvas
+        if create_search_index(cursor):
+            self.log_event("Migração: índice de busca textual (FTS5) criado.")
+
+        # Cache de resultados dos parsers: (hash do HTML, link, versão das rotas) -> parser
+        # que produziu o resultado, sua versão e os dados (que dependem também do link)
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(cache_extracoes)")]
+        if columns and 'link' not in columns:
+            cursor.execute("DROP TABLE cache_extracoes")  # Formato antigo: é só um cache
+        cursor.execute('''CREATE TABLE IF NOT EXISTS cache_extracoes (
+                            hash TEXT,
+                            link TEXT,
+                            rotas INTEGER,
+                            parser TEXT,
+                            versao INTEGER,
+                            dados TEXT,
+                            PRIMARY KEY (hash, link, rotas)
+                          )''')
+
+        # Jobs em lote retomáveis: estado do job e de cada item (checkpoint)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tipo TEXT NOT NULL,
+                estado TEXT NOT NULL,
+                parametros TEXT,
+                total INTEGER,
+                criado_em TIMESTAMP,
+                atualizado_em TIMESTAMP,
+                dono TEXT,
+                heartbeat TIMESTAMP
+            )
+        """)
+        # Processo que executa o job e seu último sinal de vida (retomada só de jobs abandonados)
+        job_columns = [row[1] for row in cursor.execute("PRAGMA table_info(jobs)")]
+        for column, col_type in (('dono', 'TEXT'), ('heartbeat', 'TIMESTAMP')):
+            if column not in job_columns:
+                cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} {col_type}")
+                self.log_event(f"Migração: Coluna '{column}' adicionada em jobs.")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id INTEGER NOT NULL,
+                item TEXT NOT NULL,
+                estado TEXT NOT NULL DEFAULT 'pendente',
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                erro TEXT,
+                atualizado_em TIMESTAMP,
+                PRIMARY KEY (job_id, item)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_items_estado ON job_items (job_id, estado)")
+
+        # Paginação de cada busca (termo, ano): total informado pelo buscador e páginas faltantes
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS paginacao_buscas (
+                engine TEXT, termo TEXT, ano TEXT,
+                total_resultados INTEGER,
+                por_pagina INTEGER,
+                total_paginas INTEGER,
+                paginas_faltantes INTEGER,
+                link_busca TEXT,
+                atualizado_em TIMESTAMP,
+                PRIMARY KEY (engine, termo, ano)
+            )
+        """)
+
+        # Coleta OAI-PMH incremental por domínio: endpoint, formato e ponto de retomada
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS oai_coletas (
+                dominio TEXT PRIMARY KEY,
+                endpoint TEXT,
+                formato TEXT,
+                conjunto TEXT,
+                ultimo_datestamp TEXT,
+                resumption_token TEXT,
+                registros INTEGER DEFAULT 0,
+                atualizado_em TIMESTAMP
+            )
+        """)
+
         # 4. Filtros de Domínio (Guia 4)
-        self.conn.execute('''CREATE TABLE IF NOT EXISTS dominios_filtros 
-                             (dominio TEXT PRIMARY KEY, ativo INTEGER)''')
-        
-        self.conn.commit()
+        cursor.execute('''CREATE TABLE IF NOT EXISTS dominios_filtros 
+                          (dominio TEXT PRIMARY KEY, ativo INTEGER)''')
+
+    def _merge_duplicate_research(self, cursor):
+        """
+        Migração: preenche link_chave e registra as origens das pesquisas existentes.
+        Pesquisas com a mesma chave são unidas na de menor id (campos vazios vêm das
+        duplicatas) e as demais são removidas, junto com os HTMLs que só elas usavam.
+        """
+        fields = ", ".join(RESEARCH_MERGE_FIELDS)
+        groups = {}
+        for rid, link, parent, termo, ano in cursor.execute("""
+            SELECT id, link_buscador, parent_rowid, termo_pesquisado, ano_pesquisado
+            FROM pesquisas_extraidas ORDER BY id
+        """).fetchall():
+            key = research_link_key(link)
+            groups.setdefault(key or ("sem-chave", rid), []).append((rid, parent, termo, ano))
+
+        merged = 0
+        for key, rows in groups.items():
+            keep = rows[0][0]
+            cursor.executemany(
+                "INSERT OR IGNORE INTO pesquisas_origens (pesquisa_id, termo, ano, parent_rowid) VALUES (?, ?, ?, ?)",
+                [(keep, termo, ano, parent) for _, parent, termo, ano in rows]
+            )
+            if len(rows) > 1:
+                kept = list(cursor.execute(f"SELECT {fields} FROM pesquisas_extraidas WHERE id = ?", (keep,)).fetchone())
+                for rid, *_ in rows[1:]:
+                    dup = cursor.execute(f"SELECT {fields} FROM pesquisas_extraidas WHERE id = ?", (rid,)).fetchone()
+                    kept = [k if k not in (None, "", "-") else d for k, d in zip(kept, dup)]
+                assignments = ", ".join(f"{field} = ?" for field in RESEARCH_MERGE_FIELDS)
+                cursor.execute(f"UPDATE pesquisas_extraidas SET {assignments} WHERE id = ?", (*kept, keep))
+                dup_ids = [(rid,) for rid, *_ in rows[1:]]
+                dup_refs = [
+                    ref for rid, in dup_ids for ref in cursor.execute(
+                        "SELECT html_buscador, html_repositorio FROM pesquisas_extraidas WHERE id = ?", (rid,)
+                    ).fetchone()
+                ]
+                cursor.executemany("DELETE FROM pesquisas_extraidas WHERE id = ?", dup_ids)
+                self.blobs.release(dup_refs, cursor)
+                merged += len(rows) - 1
+            if isinstance(key, str):
+                cursor.execute("UPDATE pesquisas_extraidas SET link_chave = ? WHERE id = ?", (key, keep))
+
+        if merged:
+            self.log_event(f"Migração: {merged} pesquisas duplicadas unidas pelo link do buscador.")
+        self.log_event("Migração: Coluna 'link_chave' e tabela 'pesquisas_origens' criadas com sucesso.")
 
+    @writes
     def update_html_repositorio(self, rowid_pesquisa, html):
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE pesquisas_extraidas SET html_repositorio = ? WHERE id = ?", (html, rowid_pesquisa))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            old = cursor.execute("SELECT html_repositorio FROM pesquisas_extraidas WHERE id = ?", (rowid_pesquisa,)).fetchone()
+            ref = self.blobs.put(html, cursor)
+            cursor.execute("UPDATE pesquisas_extraidas SET html_repositorio = ? WHERE id = ?", (ref, rowid_pesquisa))
+            # O HTML substituído sai do armazenamento se ninguém mais o referencia
+            if old and old[0] != ref:
+                self.blobs.release([old[0]], cursor)
 
     def get_html_repositorio(self, rowid_pesquisa):
         cursor = self.conn.cursor()
         cursor.execute("SELECT html_repositorio FROM pesquisas_extraidas WHERE id = ?", (rowid_pesquisa,))
         res = cursor.fetchone()
-        return res[0] if res else ""
+        return (self.blobs.get(res[0]) or "") if res else ""
     
+    @writes
     def insert_scrape(self, engine, termo, ano, pagina, html_source, link_busca):
         """Insere ou substitui um registro de busca. O 'termo' agora será o texto da Combobox."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO paginas_busca (engine, termo, ano, pagina, html_source, link_busca, data_coleta) 
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (engine, termo, str(ano), pagina, html_source, link_busca, datetime.now()))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            old = cursor.execute(
+                "SELECT html_source FROM paginas_busca WHERE engine = ? AND termo = ? AND ano = ? AND pagina = ?",
+                (engine, termo, str(ano), pagina)
+            ).fetchone()
+            ref = self.blobs.put(html_source, cursor)
+            # Upsert mantém o rowid da página recapturada (referenciado por parent_rowid)
+            cursor.execute("""
+                INSERT INTO paginas_busca (engine, termo, ano, pagina, html_source, link_busca, data_coleta) 
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (engine, termo, ano, pagina) DO UPDATE SET
+                    html_source = excluded.html_source,
+                    link_busca = excluded.link_busca,
+                    data_coleta = excluded.data_coleta
+            """, (engine, termo, str(ano), pagina, ref, link_busca, datetime.now()))
+            if old and old[0] != ref:
+                self.blobs.release([old[0]], cursor)
 
+    @writes
     def insert_extracted_data(self, data_list):
-        """Insere os dados extraídos vindo do Histórico para a aba de Pesquisas."""
-        cursor = self.conn.cursor()
-        cursor.executemany("""
-            INSERT INTO pesquisas_extraidas 
-            (titulo, autor, link_buscador, link_repositorio, parent_rowid, termo_pesquisado, ano_pesquisado)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, data_list)
-        self.conn.commit()
-
-    def fetch_all(self):
+        """
+        Insere os dados extraídos vindo do Histórico para a aba de Pesquisas.
+        Idempotente: uma pesquisa já conhecida (mesmo link do buscador normalizado)
+        só ganha a nova origem (termo, ano, página) e o link do repositório que lhe faltava.
+        Retorna o número de pesquisas novas.
+        """
+        inserted = 0
+        with self.transaction() as cursor:
+            for titulo, autor, l_busc, l_repo, parent, termo, ano in data_list:
+                key = research_link_key(l_busc)
+                row = cursor.execute("""
+                    INSERT INTO pesquisas_extraidas
+                    (titulo, autor, link_buscador, link_repositorio, parent_rowid, termo_pesquisado, ano_pesquisado, link_chave)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (link_chave) WHERE link_chave IS NOT NULL DO NOTHING
+                    RETURNING id
+                """, (titulo, autor, l_busc, l_repo, parent, termo, ano, key)).fetchone()
+                if row:
+                    inserted += 1
+                    research_id = row[0]
+                else:
+                    research_id = cursor.execute(
+                        "SELECT id FROM pesquisas_extraidas WHERE link_chave = ?", (key,)
+                    ).fetchone()[0]
+                    if l_repo and l_repo != '-':
+                        cursor.execute("""
+                            UPDATE pesquisas_extraidas SET link_repositorio = ?
+                            WHERE id = ? AND (link_repositorio IS NULL OR link_repositorio IN ('', '-'))
+                        """, (l_repo, research_id))
+                cursor.execute(
+                    "INSERT OR IGNORE INTO pesquisas_origens (pesquisa_id, termo, ano, parent_rowid) VALUES (?, ?, ?, ?)",
+                    (research_id, termo, ano, parent)
+                )
+        return inserted
+
+    def get_research_origin_keys(self):
+        """(link_chave, termo, ano) de todas as origens já ingeridas, para o filtro de links vistos."""
+        return self.conn.execute("""
+            SELECT p.link_chave, o.termo, o.ano
+            FROM pesquisas_origens o JOIN pesquisas_extraidas p ON p.id = o.pesquisa_id
+            WHERE p.link_chave IS NOT NULL
+        """).fetchall()
+
+    def fetch_history_page(self, limit=50, offset=0):
+        """Lista o histórico sem o HTML: (rowid, termo, data_coleta, pagina, ano)."""
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT rowid, termo, data_coleta, html_source, pagina 
+            SELECT rowid, termo, data_coleta, pagina, ano 
             FROM paginas_busca 
             ORDER BY data_coleta DESC
-        """)
+            LIMIT ? OFFSET ?
+        """, (limit, offset))
         return cursor.fetchall()
 
+    def count_history(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM paginas_busca")
+        return cursor.fetchone()[0]
+
+    def get_history_ids(self, first_page_only=False):
+        """IDs do histórico (opcionalmente apenas as páginas 1) sem tocar no HTML."""
+        cursor = self.conn.cursor()
+        query = "SELECT rowid FROM paginas_busca"
+        if first_page_only:
+            query += " WHERE pagina = 1"
+        cursor.execute(query + " ORDER BY data_coleta DESC")
+        return [row[0] for row in cursor.fetchall()]
+
     def fetch_extracted_data(self):
         """Retorna as 10 colunas para preencher a Treeview na Guia 3."""
         cursor = self.conn.cursor()
@@ -160,36 +606,102 @@ class DatabaseHandler:
         """)
         return cursor.fetchall()
 
+    @writes
     def update_html_buscador(self, rowid_pesquisa, html):
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE pesquisas_extraidas SET html_buscador = ? WHERE id = ?", (html, rowid_pesquisa))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            old = cursor.execute("SELECT html_buscador FROM pesquisas_extraidas WHERE id = ?", (rowid_pesquisa,)).fetchone()
+            ref = self.blobs.put(html, cursor)
+            cursor.execute("UPDATE pesquisas_extraidas SET html_buscador = ? WHERE id = ?", (ref, rowid_pesquisa))
+            # O HTML substituído sai do armazenamento se ninguém mais o referencia
+            if old and old[0] != ref:
+                self.blobs.release([old[0]], cursor)
 
     def get_html_buscador(self, rowid_pesquisa):
         cursor = self.conn.cursor()
         cursor.execute("SELECT html_buscador FROM pesquisas_extraidas WHERE id = ?", (rowid_pesquisa,))
         res = cursor.fetchone()
-        return res[0] if res and res[0] else None
+        return self.blobs.get(res[0]) if res and res[0] else None
 
+    @writes
     def update_univ_data(self, res_id, sigla, nome):
         """Atualiza a sigla e o nome da universidade no banco de dados."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE pesquisas_extraidas 
-            SET sigla_univ = ?, nome_univ = ? 
-            WHERE id = ?
-        """, (sigla, nome, res_id))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute("""
+                UPDATE pesquisas_extraidas 
+                SET sigla_univ = ?, nome_univ = ? 
+                WHERE id = ?
+            """, (sigla, nome, res_id))
 
     def update_parser_data(self, res_id, data):
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE pesquisas_extraidas 
-            SET sigla_univ = ?, nome_univ = ?, programa = ?, link_pdf = ?
-            WHERE id = ?
-        """, (data.get('sigla', '-'), data.get('universidade', '-'), 
-              data.get('programa', '-'), data.get('link_pdf', '-'), res_id))
-        self.conn.commit()
+        self.update_parser_data_many([(res_id, data)])
+
+    @writes
+    def update_parser_data_many(self, items):
+        """Grava os resultados de vários parsers [(id, dados)] em uma única transação."""
+        params = [
+            (data.get('sigla', '-'), data.get('universidade', '-'),
+             data.get('programa', '-'), data.get('link_pdf', '-'), res_id)
+            for res_id, data in items
+        ]
+        if not params:
+            return
+        with self.transaction() as cursor:
+            cursor.executemany("""
+                UPDATE pesquisas_extraidas 
+                SET sigla_univ = ?, nome_univ = ?, programa = ?, link_pdf = ?
+                WHERE id = ?
+            """, params)
+
+    @writes
+    def update_research_details_many(self, items):
+        """
+        Grava dados de universidade/programa/PDF [(id, dados)] preenchendo apenas
+        os campos informados: "-" e vazios mantêm o valor atual.
+        """
+        params = [
+            (data.get('sigla'), data.get('universidade'), data.get('programa'), data.get('link_pdf'), res_id)
+            for res_id, data in items
+        ]
+        if not params:
+            return
+        with self.transaction() as cursor:
+            cursor.executemany("""
+                UPDATE pesquisas_extraidas SET
+                    sigla_univ = COALESCE(NULLIF(NULLIF(?, '-'), ''), sigla_univ),
+                    nome_univ = COALESCE(NULLIF(NULLIF(?, '-'), ''), nome_univ),
+                    programa = COALESCE(NULLIF(NULLIF(?, '-'), ''), programa),
+                    link_pdf = COALESCE(NULLIF(NULLIF(?, '-'), ''), link_pdf)
+                WHERE id = ?
+            """, params)
+
+    def get_research_join_links(self):
+        """(id, link_buscador, link_repositorio) de todas as pesquisas, para junções por handle/id."""
+        cursor = self.conn.execute("SELECT id, link_buscador, link_repositorio FROM pesquisas_extraidas")
+        return cursor.fetchall()
+
+    def get_oai_state(self, domain):
+        """(endpoint, formato, conjunto, ultimo_datestamp, resumption_token) da coleta do domínio, ou None."""
+        return self.conn.execute("""
+            SELECT endpoint, formato, conjunto, ultimo_datestamp, resumption_token
+            FROM oai_coletas WHERE dominio = ?
+        """, (domain,)).fetchone()
+
+    @writes
+    def save_oai_state(self, domain, endpoint, fmt, set_spec, last_datestamp, token, harvested=0):
+        with self.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO oai_coletas
+                (dominio, endpoint, formato, conjunto, ultimo_datestamp, resumption_token, registros, atualizado_em)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (dominio) DO UPDATE SET
+                    endpoint = excluded.endpoint,
+                    formato = excluded.formato,
+                    conjunto = excluded.conjunto,
+                    ultimo_datestamp = excluded.ultimo_datestamp,
+                    resumption_token = excluded.resumption_token,
+                    registros = registros + excluded.registros,
+                    atualizado_em = excluded.atualizado_em
+            """, (domain, endpoint, fmt, set_spec, last_datestamp, token, harvested, datetime.now()))
 
     def get_link_by_id(self, res_id):
         cursor = self.conn.execute("SELECT link_buscador FROM pesquisas_extraidas WHERE id=?", (res_id,))
@@ -207,12 +719,18 @@ class DatabaseHandler:
 
     def save_domain_state(self, domain, is_active):
         """Salva a escolha do usuário (marcado/desmarcado) sobre um domínio."""
-        status = 1 if is_active else 0
-        self.conn.execute("""
-            INSERT OR REPLACE INTO dominios_filtros (dominio, ativo) 
-            VALUES (?, ?)
-        """, (domain, status))
-        self.conn.commit()
+        self.save_domain_states({domain: is_active})
+
+    @writes
+    def save_domain_states(self, states):
+        """Salva vários estados {domínio: ativo} em uma única transação."""
+        if not states:
+            return
+        with self.transaction() as cursor:
+            cursor.executemany("""
+                INSERT OR REPLACE INTO dominios_filtros (dominio, ativo) 
+                VALUES (?, ?)
+            """, [(domain, 1 if is_active else 0) for domain, is_active in states.items()])
 
     def get_domain_states(self):
         """Recupera os estados salvos para renderizar os checkboxes."""
@@ -244,8 +762,8 @@ class DatabaseHandler:
     def save_html_repositorio(self, rowid, html):
         self.update_html_repositorio(rowid, html)
 
+    @writes
     def update_research_extracted_data(self, res_id, sigla, univ, prog, pdf):
-        cursor = self.conn.cursor()
         updates = []
         params = []
         
@@ -267,57 +785,360 @@ class DatabaseHandler:
 
         params.append(res_id)
         sql = f"UPDATE pesquisas_extraidas SET {', '.join(updates)} WHERE id = ?"
-        cursor.execute(sql, tuple(params))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute(sql, tuple(params))
 
     def get_research_links_and_ids(self):
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT id, link_repositorio 
             FROM pesquisas_extraidas 
-            WHERE html_repositorio IS NULL OR html_repositorio = ''
+            WHERE has_html_repositorio = 0
             ORDER BY id DESC
         """)
         return cursor.fetchall()
 
+    def get_extraction_sources(self, res_id):
+        """Links e HTMLs (já descomprimidos) usados pelo parser: (l_busc, h_busc, l_repo, h_repo)."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT link_buscador, html_buscador, link_repositorio, html_repositorio 
+            FROM pesquisas_extraidas WHERE id=?
+        """, (res_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return row[0], self.blobs.get(row[1]), row[2], self.blobs.get(row[3])
+
+    def get_pending_repository_downloads(self, include_stored=False):
+        """
+        Registros ainda sem HTML do repositório: (id, link_buscador, link_repositorio).
+        Com `include_stored`, também os que já têm HTML (atualização por GET condicional).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT id, link_buscador, link_repositorio FROM pesquisas_extraidas
+            WHERE {"1 = 1" if include_stored else "has_html_repositorio = 0"}
+            AND (link_repositorio IS NOT NULL OR link_buscador IS NOT NULL)
+        """)
+        return cursor.fetchall()
+
     def get_ids_with_stored_html(self):
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT id FROM pesquisas_extraidas 
-            WHERE (html_repositorio IS NOT NULL AND html_repositorio != '' AND html_repositorio != '-')
-               OR (html_buscador IS NOT NULL AND html_buscador != '' AND html_buscador != '-')
+            SELECT id FROM pesquisas_extraidas WHERE has_html_repositorio = 1
+            UNION
+            SELECT id FROM pesquisas_extraidas WHERE has_html_buscador = 1
         """)
         return [row[0] for row in cursor.fetchall()]
 
-    def fetch_filtered_researches(self, filters):
-        base_query = """
-            SELECT id, titulo, autor, link_buscador, link_repositorio, 
-                   sigla_univ, nome_univ, programa, link_pdf, 
-                   termo_pesquisado, ano_pesquisado 
-            FROM pesquisas_extraidas WHERE 1=1
+    def get_cached_extractions(self, keys):
         """
-        params = []
-        
+        Recebe chaves (hash, link, versão das rotas) e retorna {chave: (parser, versão, dados)}
+        das que já estão no cache.
+        """
+        wanted = set(keys)
+        if not wanted:
+            return {}
+        hashes = list({key[0] for key in wanted})
+        placeholders = ",".join("?" * len(hashes))
+        cursor = self.conn.execute(
+            f"SELECT hash, link, rotas, parser, versao, dados FROM cache_extracoes WHERE hash IN ({placeholders})",
+            hashes
+        )
+        found = {}
+        for h, link, rotas, parser, versao, dados in cursor.fetchall():
+            key = (h, link, rotas)
+            if key in wanted:
+                found[key] = (parser, versao, json.loads(dados))
+        return found
+
+    @writes
+    def save_cached_extractions(self, entries):
+        """Grava [(hash, link, versão das rotas, parser, versão do parser, dados)] no cache dos parsers."""
+        params = [(h, link, rotas, parser, versao, json.dumps(dados, ensure_ascii=False))
+                  for h, link, rotas, parser, versao, dados in entries]
+        if not params:
+            return
+        with self.transaction() as cursor:
+            cursor.executemany("""
+                INSERT OR REPLACE INTO cache_extracoes (hash, link, rotas, parser, versao, dados)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, params)
+
+    def count_records_with_stored_html(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM pesquisas_extraidas 
+            WHERE has_html_repositorio = 1 OR has_html_buscador = 1
+        """)
+        return cursor.fetchone()[0]
+
+    def iter_parse_sources(self, batch_size=50, job_id=None, max_attempts=3):
+        """
+        Percorre, em lotes, os registros com HTML salvo sem descomprimir nenhuma página:
+        listas de (id, link_buscador, ref_buscador, link_repositorio, ref_repositorio,
+        tamanho_repositorio, sigla, universidade, programa, link_pdf).
+        Com `job_id`, apenas os itens ainda pendentes do job.
+        """
+        job_clause, job_params = "", ()
+        if job_id is not None:
+            job_clause = f"AND p.id IN ({PENDING_JOB_ITEMS_SQL.format(cast='CAST(item AS INTEGER)')})"
+            job_params = (job_id, max_attempts)
+
+        last_id = 0
+        while True:
+            cursor = self.conn.cursor()
+            # Tamanho do HTML do repositório vem do blob (ou do próprio valor, se legado)
+            cursor.execute(f"""
+                SELECT p.id, p.link_buscador, p.html_buscador, p.link_repositorio, p.html_repositorio,
+                       COALESCE(b.tamanho, length(p.html_repositorio)),
+                       p.sigla_univ, p.nome_univ, p.programa, p.link_pdf
+                FROM pesquisas_extraidas p
+                LEFT JOIN html_blobs b ON b.hash = substr(p.html_repositorio, {len(BLOB_PREFIX) + 1})
+                WHERE (p.has_html_repositorio = 1 OR p.has_html_buscador = 1) AND p.id > ? {job_clause}
+                ORDER BY p.id
+                LIMIT ?
+            """, (last_id,) + job_params + (batch_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield rows
+
+    # --- Jobs em lote ---
+
+    @writes
+    def create_job(self, kind, items, params=None, owner=None):
+        """Registra um job e seus itens (todos pendentes) em nome de `owner`; retorna o id do job."""
+        now = datetime.now()
+        items = [str(item) for item in items]
+        with self.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO jobs (tipo, estado, parametros, total, criado_em, atualizado_em, dono, heartbeat)
+                VALUES (?, 'executando', ?, ?, ?, ?, ?, ?)
+            """, (kind, json.dumps(params or {}), len(items), now, now, owner, now))
+            job_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT OR IGNORE INTO job_items (job_id, item, atualizado_em) VALUES (?, ?, ?)",
+                [(job_id, item, now) for item in items]
+            )
+        return job_id
+
+    @writes
+    def set_job_state(self, job_id, state):
+        with self.transaction() as cursor:
+            cursor.execute("UPDATE jobs SET estado = ?, atualizado_em = ? WHERE id = ?",
+                           (state, datetime.now(), job_id))
+
+    @writes
+    def claim_job(self, job_id, owner, stale_before):
+        """
+        Assume o job para `owner` se ele não tem dono, já é dele ou o dono parou de dar
+        sinal de vida antes de `stale_before`. Retorna False se outro processo o executa.
+        """
+        with self.transaction() as cursor:
+            return cursor.execute("""
+                UPDATE jobs SET dono = ?, heartbeat = ?
+                WHERE id = ? AND (dono IS NULL OR dono = ? OR heartbeat IS NULL OR heartbeat < ?)
+            """, (owner, datetime.now(), job_id, owner, stale_before)).rowcount == 1
+
+    @writes
+    def touch_job(self, job_id, owner):
+        with self.transaction() as cursor:
+            cursor.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND dono = ?",
+                           (datetime.now(), job_id, owner))
+
+    @writes
+    def release_job(self, job_id, owner):
+        """Solta o job ao fim da execução: se ficou pendente, pode ser retomado de imediato."""
+        with self.transaction() as cursor:
+            cursor.execute("UPDATE jobs SET dono = NULL WHERE id = ? AND dono = ?", (job_id, owner))
+
+    @writes
+    def update_job_items(self, params):
+        """Grava estados de itens [(estado, erro, data, job_id, item)] fora de um BulkWriter."""
+        with self.transaction() as cursor:
+            cursor.executemany(JOB_ITEM_UPDATE_SQL, params)
+
+    @writes
+    def save_pagination_state(self, engine, termo, ano, total, per_page, total_pages, missing, link_busca):
+        """
+        Grava o plano de paginação da busca. Páginas além de `total_pages` (capturadas
+        com outro tamanho de página ou antes de o total diminuir) são removidas.
+        """
+        with self.transaction() as cursor:
+            stale = cursor.execute("""
+                DELETE FROM paginas_busca WHERE engine = ? AND termo = ? AND ano = ? AND pagina > ?
+                RETURNING html_source
+            """, (engine, termo, str(ano), total_pages)).fetchall()
+            self.blobs.release([row[0] for row in stale], cursor)
+            cursor.execute("""
+                INSERT OR REPLACE INTO paginacao_buscas
+                (engine, termo, ano, total_resultados, por_pagina, total_paginas,
+                 paginas_faltantes, link_busca, atualizado_em)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (engine, termo, str(ano), total, per_page, total_pages, missing, link_busca, datetime.now()))
+
+    def get_search_pages(self, engine, termo, ano):
+        """Páginas já capturadas de uma busca: {pagina: link_busca}."""
+        cursor = self.conn.execute(
+            "SELECT pagina, link_busca FROM paginas_busca WHERE engine = ? AND termo = ? AND ano = ?",
+            (engine, termo, str(ano))
+        )
+        return dict(cursor.fetchall())
+
+    def get_search_page_ids(self, engine, termo, ano):
+        """Rowids das páginas capturadas de uma busca, em ordem de página."""
+        cursor = self.conn.execute(
+            "SELECT rowid FROM paginas_busca WHERE engine = ? AND termo = ? AND ano = ? ORDER BY pagina",
+            (engine, termo, str(ano))
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_job_state(self, job_id):
+        row = self.conn.execute("SELECT estado FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_job_summary(self, job_id):
+        """
+        Tipo e estado do job e contagem dos itens por estado:
+        {'tipo', 'estado', 'total', 'ok', 'falha', 'pendente'}.
+        """
+        row = self.conn.execute("SELECT tipo, estado, total FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        summary = {'tipo': row[0], 'estado': row[1], 'total': row[2], 'ok': 0, 'falha': 0, 'pendente': 0}
+        for state, count in self.conn.execute(
+            "SELECT estado, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY estado", (job_id,)
+        ):
+            summary[state] = count
+        return summary
+
+    def get_unfinished_jobs(self, stale_before=None):
+        """
+        Jobs interrompidos (fechamento/queda) ou pausados: (id, tipo, estado, parametros).
+        Com `stale_before`, só os que nenhum processo vivo executa (sem dono ou sem sinal de vida).
+        """
+        query = "SELECT id, tipo, estado, parametros FROM jobs WHERE estado IN ('executando', 'pausado')"
+        params = ()
+        if stale_before is not None:
+            query += " AND (dono IS NULL OR heartbeat IS NULL OR heartbeat < ?)"
+            params = (stale_before,)
+        cursor = self.conn.execute(query + " ORDER BY id", params)
+        return [(r[0], r[1], r[2], json.loads(r[3] or "{}")) for r in cursor.fetchall()]
+
+    def get_pending_job_items(self, job_id, max_attempts=3):
+        """Itens ainda a processar: pendentes ou com falha abaixo do limite de tentativas."""
+        cursor = self.conn.execute(PENDING_JOB_ITEMS_SQL.format(cast='item'), (job_id, max_attempts))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _research_filter_clause(self, filters):
+        """Monta os predicados (Sim/Não) dos filtros da aba Pesquisas."""
+        clause = ""
+        # Presença de HTML usa as colunas indicadoras: nenhum HTML é lido no filtro
+        flag_map = {
+            'html_busc': 'has_html_buscador',
+            'html_repo': 'has_html_repositorio'
+        }
         field_map = {
-            'html_busc': 'html_buscador',
-            'html_repo': 'html_repositorio',
             'sigla': 'sigla_univ',
             'univ': 'nome_univ',
             'prog': 'programa'
         }
 
-        for key, value in filters.items():
+        for key, value in (filters or {}).items():
             if value == 'Indiferente':
                 continue
+
+            flag = flag_map.get(key)
+            if flag:
+                if value == 'Sim':
+                    clause += f" AND {flag} = 1"
+                elif value == 'Não':
+                    clause += f" AND {flag} = 0"
+                continue
             
             col = field_map.get(key)
             if not col: continue
 
             if value == 'Sim':
-                base_query += f" AND {col} IS NOT NULL AND {col} != '' AND {col} != '-'"
+                clause += f" AND {col} IS NOT NULL AND {col} != '' AND {col} != '-'"
             elif value == 'Não':
-                base_query += f" AND ({col} IS NULL OR {col} = '' OR {col} = '-')"
+                clause += f" AND ({col} IS NULL OR {col} = '' OR {col} = '-')"
+        return clause
+
+    def fetch_filtered_researches(self, filters):
+        base_query = f"""
+            SELECT {RESEARCH_GRID_COLUMNS}
+            FROM pesquisas_extraidas WHERE 1=1
+        """ + self._research_filter_clause(filters)
+
+        cursor = self.conn.cursor()
+        cursor.execute(base_query)
+        return cursor.fetchall()
+
+    def search_research_window(self, query, filters=None, sort_key=None, descending=False, offset=0, limit=200):
+        """
+        Busca textual (FTS5) combinada com os filtros da aba Pesquisas.
+        Sem ordenação escolhida, os resultados vêm por relevância (bm25).
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        col = RESEARCH_SORT_COLUMNS.get(sort_key)
+        if col:
+            direction = "DESC" if descending else "ASC"
+            order = f"COALESCE({col}, '') {direction}, id {direction}"
+        else:
+            order = "rank, id DESC"
+
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            WITH hits AS (
+                SELECT rowid AS hit_id, bm25(pesquisas_fts, {weights}) AS rank
+                FROM pesquisas_fts WHERE pesquisas_fts MATCH ?
+            )
+            SELECT {RESEARCH_GRID_COLUMNS}
+            FROM hits JOIN pesquisas_extraidas ON id = hit_id
+            WHERE 1=1 {self._research_filter_clause(filters)}
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+        """, (match, limit, offset))
+        return cursor.fetchall()
+
+    def fetch_research_window(self, filters, sort_key=None, descending=False, after=None, limit=200):
+        """
+        Busca uma janela da grade de Pesquisas por paginação keyset.
+        `after` é a chave (valor_ordenação, id) da última linha já exibida;
+        a ordenação acontece no banco, desempatada pelo id.
+        """
+        sort_col = RESEARCH_SORT_COLUMNS.get(sort_key)
+        where = self._research_filter_clause(filters)
+        params = []
+
+        if sort_col is None:
+            # Ordem padrão: registros mais recentes primeiro
+            if after is not None:
+                where += " AND id < ?"
+                params.append(after[1])
+            order = "id DESC"
+        else:
+            direction = "DESC" if descending else "ASC"
+            key_expr = f"COALESCE({sort_col}, '')"
+            if after is not None:
+                op = "<" if descending else ">"
+                where += f" AND ({key_expr}, id) {op} (?, ?)"
+                params.extend(after)
+            order = f"{key_expr} {direction}, id {direction}"
 
         cursor = self.conn.cursor()
-        cursor.execute(base_query, params)
+        cursor.execute(f"""
+            SELECT {RESEARCH_GRID_COLUMNS}
+            FROM pesquisas_extraidas WHERE 1=1 {where}
+            ORDER BY {order}
+            LIMIT ?
+        """, params + [limit])
         return cursor.fetchall()
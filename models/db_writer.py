@@ -0,0 +1,91 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class DbWriter:
+    """
+    Thread escritora dedicada do SQLite.
+
+    Todas as gravações passam por uma fila e são executadas em uma única
+    conexão, na ordem de chegada. Trabalhos que se acumulam na fila são
+    agrupados em uma mesma transação (um único commit/fsync), mas cada um
+    roda dentro de seu próprio SAVEPOINT: a falha de um trabalho desfaz só
+    as gravações dele.
+    """
+
+    def __init__(self, conn, max_group=200):
+        # A conexão deve estar em modo autocommit (isolation_level=None)
+        self.conn = conn
+        self.max_group = max_group
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn, *args, **kwargs):
+        """Executa `fn` na thread escritora e aguarda o commit; devolve o resultado ou relança o erro."""
+        if self.in_writer_thread():
+            return fn(*args, **kwargs)
+        return self.submit_nowait(fn, *args, **kwargs).result()
+
+    def submit_nowait(self, fn, *args, **kwargs):
+        """Enfileira `fn` sem esperar; retorna um Future resolvido após o commit."""
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def close(self):
+        """Processa o que ainda está na fila e encerra a thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            jobs = [job]
+            while len(jobs) < self.max_group:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    running = False
+                    break
+                jobs.append(job)
+
+            self._execute_group(jobs)
+
+    def _execute_group(self, jobs):
+        outcomes = []
+        try:
+            self.conn.execute("BEGIN")
+            for future, fn, args, kwargs in jobs:
+                self.conn.execute("SAVEPOINT job")
+                try:
+                    result = fn(*args, **kwargs)
+                    self.conn.execute("RELEASE job")
+                    outcomes.append((future, result, None))
+                except BaseException as e:
+                    self.conn.execute("ROLLBACK TO job")
+                    self.conn.execute("RELEASE job")
+                    outcomes.append((future, None, e))
+            self.conn.execute("COMMIT")
+        except Exception as e:
+            # Falha no próprio commit: nada do grupo foi gravado
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            outcomes = [(future, None, e) for future, _, _, _ in jobs]
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
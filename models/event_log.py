@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+
+class BufferedEventLog:
+    """
+    Log de eventos com gravação em lote.
+
+    `log` apenas acumula a mensagem em memória; uma thread em segundo plano
+    grava o acumulado a cada `flush_interval` segundos (ou quando o buffer
+    chega a `max_buffer` mensagens) em uma única transação. As últimas
+    `ring_size` mensagens ficam num buffer circular para a barra de status,
+    e a tabela é podada por idade (`retention_days`) e tamanho (`max_rows`).
+    """
+
+    def __init__(self, db, flush_interval=1.0, max_buffer=500, ring_size=200,
+                 retention_days=30, max_rows=50000, prune_interval=600.0):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.prune_interval = prune_interval
+
+        self._pending = []
+        self._recent = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._last_prune = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def log(self, message):
+        entry = (message, datetime.now())
+        with self._lock:
+            self._pending.append(entry)
+            self._recent.append(entry)
+            full = len(self._pending) >= self.max_buffer
+        if full:
+            self._wake.set()
+
+    def last_message(self):
+        with self._lock:
+            return self._recent[-1][0] if self._recent else None
+
+    def flush(self):
+        with self._lock:
+            entries, self._pending = self._pending, []
+        if not entries:
+            return
+        try:
+            self.db.insert_logs(entries)
+        except Exception as e:
+            # O log nunca deve derrubar a aplicação
+            print(f"Erro ao gravar logs ({len(entries)} mensagens): {e}")
+
+    def close(self):
+        """Grava o que restou no buffer e encerra a thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            if time.monotonic() - self._last_prune >= self.prune_interval:
+                self._last_prune = time.monotonic()
+                self._prune()
+
+    def _prune(self):
+        try:
+            cutoff = datetime.now() - timedelta(days=self.retention_days)
+            self.db.prune_logs(cutoff, self.max_rows)
+        except Exception as e:
+            print(f"Erro ao podar logs: {e}")
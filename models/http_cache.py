@@ -0,0 +1,169 @@
+import sqlite3
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+
+# Configuração padrão do cache HTTP em disco
+HTTP_CACHE_CONFIG = {
+    'path': "http_cache.db",
+    'default_ttl': 0,                     # Sem Cache-Control: sempre revalida (GET condicional)
+    'max_bytes': 512 * 1024 * 1024,       # Tamanho máximo (comprimido) antes da remoção por LRU
+}
+
+
+class CachedResponse:
+    """Entrada do cache: corpo já descomprimido e validadores para o GET condicional."""
+
+    def __init__(self, url, body, etag, last_modified, expires_at):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return self.expires_at is not None and time.time() < self.expires_at
+
+    def validators(self):
+        """Cabeçalhos If-None-Match / If-Modified-Since para revalidar a entrada."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Cache HTTP persistente (arquivo SQLite próprio) com validação condicional.
+
+    Guarda o corpo comprimido de cada URL junto com ETag, Last-Modified e a
+    validade calculada a partir de Cache-Control/Expires. Entradas ainda
+    válidas são servidas sem rede; as vencidas são revalidadas e um 304
+    reaproveita o corpo salvo. Acima de `max_bytes`, as entradas acessadas
+    há mais tempo são removidas.
+    """
+
+    def __init__(self, path=None, default_ttl=None, max_bytes=None):
+        self.path = path or HTTP_CACHE_CONFIG['path']
+        self.default_ttl = HTTP_CACHE_CONFIG['default_ttl'] if default_ttl is None else default_ttl
+        self.max_bytes = max_bytes or HTTP_CACHE_CONFIG['max_bytes']
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL,
+                accessed_at REAL,
+                tamanho INTEGER,
+                corpo BLOB
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache (accessed_at)")
+        self._conn.commit()
+        self._total = self._conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM http_cache").fetchone()[0]
+
+    def lookup(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, expires_at, corpo FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, expires_at, corpo = row
+        return CachedResponse(url, zlib.decompress(corpo).decode("utf-8"), etag, last_modified, expires_at)
+
+    def store(self, url, response, body):
+        """Grava a resposta 200; respeita no-store e só guarda o que pode ser revalidado ou tem validade."""
+        expires_at, cacheable = self._expiry(response.headers)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not cacheable or not (etag or last_modified or expires_at):
+            return
+
+        data = zlib.compress(body.encode("utf-8"), 6)
+        with self._lock:
+            old = self._conn.execute("SELECT tamanho FROM http_cache WHERE url = ?", (url,)).fetchone()
+            self._conn.execute("""
+                INSERT OR REPLACE INTO http_cache (url, etag, last_modified, expires_at, accessed_at, tamanho, corpo)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (url, etag, last_modified, expires_at, time.time(), len(data), data))
+            self._conn.commit()
+            self._total += len(data) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url, response):
+        """Resposta 304: renova validade e validadores da entrada existente."""
+        expires_at, _ = self._expiry(response.headers)
+        with self._lock:
+            self._conn.execute("""
+                UPDATE http_cache SET
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified),
+                    expires_at = ?,
+                    accessed_at = ?
+                WHERE url = ?
+            """, (response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                  expires_at, time.time(), url))
+            self._conn.commit()
+
+    def touch(self, url):
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def _evict(self):
+        """Remove as entradas menos acessadas até ficar em 90% do limite (chamado com o lock)."""
+        target = self.max_bytes * 0.9
+        cursor = self._conn.execute("SELECT url, tamanho FROM http_cache ORDER BY accessed_at")
+        victims = []
+        for url, size in cursor:
+            if self._total <= target:
+                break
+            victims.append((url,))
+            self._total -= size
+        self._conn.executemany("DELETE FROM http_cache WHERE url = ?", victims)
+        self._conn.commit()
+
+    def _expiry(self, headers):
+        """Calcula (expira_em, pode_guardar) a partir de Cache-Control e Expires."""
+        directives = {}
+        for part in headers.get("Cache-Control", "").split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+
+        if "no-store" in directives:
+            return None, False
+        if "no-cache" in directives:
+            return None, True
+
+        now = time.time()
+        for name in ("s-maxage", "max-age"):
+            if name in directives:
+                try:
+                    return now + int(directives[name]), True
+                except ValueError:
+                    break
+
+        expires = headers.get("Expires")
+        if expires:
+            try:
+                return parsedate_to_datetime(expires).timestamp(), True
+            except (TypeError, ValueError):
+                return None, True
+
+        return (now + self.default_ttl if self.default_ttl else None), True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,120 @@
+import html
+import re
+from models.blob_store import HtmlBlobStore
+
+# Caracteres do texto visível de cada HTML guardados no índice (limita o tamanho do banco)
+FTS_TEXT_LIMIT = 5000
+
+# Colunas indexadas e seus pesos no ranking bm25 (título pesa mais que o texto da página)
+FTS_COLUMNS = ("titulo", "autor", "programa", "nome_univ", "termo_pesquisado", "texto")
+FTS_WEIGHTS = (10.0, 6.0, 4.0, 3.0, 2.0, 1.0)
+
+_INVISIBLE = re.compile(r"<!--.*?-->|<(script|style|noscript|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+
+def html_to_text(content):
+    """Texto visível do HTML (sem scripts, estilos e marcações), truncado em FTS_TEXT_LIMIT."""
+    if not content:
+        return ""
+    text = _TAGS.sub(" ", _INVISIBLE.sub(" ", content))
+    return _SPACES.sub(" ", html.unescape(text)).strip()[:FTS_TEXT_LIMIT]
+
+
+def _fts_text(value, codec, data):
+    """Função SQL: resolve a coluna HTML (referência de blob ou HTML legado) e extrai o texto."""
+    try:
+        if data is not None:
+            return html_to_text(HtmlBlobStore.decompress(codec, data))
+        if value and not HtmlBlobStore.is_ref(value):
+            return html_to_text(value)
+    except Exception:
+        pass
+    return ""
+
+
+def register_functions(conn):
+    """Registra `fts_texto` na conexão; obrigatório em toda conexão que grava em pesquisas_extraidas."""
+    conn.create_function("fts_texto", 3, _fts_text, deterministic=True)
+
+
+def _text_expr(col):
+    blob = f"(SELECT {{field}} FROM html_blobs WHERE hash = substr({col}, 6))"
+    return f"fts_texto({col}, {blob.format(field='codec')}, {blob.format(field='dados')})"
+
+
+def _page_text_expr(prefix):
+    return (f"trim({_text_expr(prefix + '.html_buscador')} || ' ' || "
+            f"{_text_expr(prefix + '.html_repositorio')})")
+
+
+def create_search_index(cursor):
+    """
+    Cria a tabela FTS5 e os triggers que a mantêm sincronizada com
+    pesquisas_extraidas. Na primeira criação, indexa os registros existentes.
+    Retorna True quando o índice foi construído agora.
+    """
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pesquisas_fts'"
+    ).fetchone()
+
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS pesquisas_fts USING fts5(
+            {', '.join(FTS_COLUMNS)},
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+
+    meta = ", ".join(FTS_COLUMNS[:-1])
+    new_meta = ", ".join(f"NEW.{col}" for col in FTS_COLUMNS[:-1])
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pesquisas_fts_ins
+        AFTER INSERT ON pesquisas_extraidas
+        BEGIN
+            INSERT INTO pesquisas_fts (rowid, {meta}, texto)
+            VALUES (NEW.id, {new_meta}, {_page_text_expr('NEW')});
+        END
+    """)
+    # Metadados e HTML em triggers separados: atualizar o programa não descomprime a página
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pesquisas_fts_meta
+        AFTER UPDATE OF {meta} ON pesquisas_extraidas
+        BEGIN
+            UPDATE pesquisas_fts SET {', '.join(f'{col} = NEW.{col}' for col in FTS_COLUMNS[:-1])}
+            WHERE rowid = NEW.id;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_pesquisas_fts_html
+        AFTER UPDATE OF html_buscador, html_repositorio ON pesquisas_extraidas
+        BEGIN
+            UPDATE pesquisas_fts SET texto = {_page_text_expr('NEW')} WHERE rowid = NEW.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_pesquisas_fts_del
+        AFTER DELETE ON pesquisas_extraidas
+        BEGIN
+            DELETE FROM pesquisas_fts WHERE rowid = OLD.id;
+        END
+    """)
+
+    if exists:
+        return False
+    cursor.execute(f"""
+        INSERT INTO pesquisas_fts (rowid, {meta}, texto)
+        SELECT p.id, {', '.join(f'p.{col}' for col in FTS_COLUMNS[:-1])}, {_page_text_expr('p')}
+        FROM pesquisas_extraidas p
+    """)
+    return True
+
+
+def build_match_query(text):
+    """
+    Converte o texto digitado em uma expressão MATCH segura: cada palavra vira
+    um termo entre aspas com busca por prefixo, e todas precisam aparecer.
+    """
+    words = _WORDS.findall(text or "")
+    return " ".join(f'"{word}"*' for word in words)
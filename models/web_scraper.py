@@ -1,27 +1,144 @@
 import os
 import time
+import threading
 import requests
 import urllib3
-from selenium import webdriver
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.edge.options import Options
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from models.browser_pool import get_browser_pool
 
 # Desativar avisos de SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Configuração da sessão HTTP compartilhada pelo processo
+SESSION_CONFIG = {
+    'pool_connections': 32,   # Quantidade de hosts com pool mantido em cache
+    'pool_maxsize': 10,       # Conexões keep-alive simultâneas por host
+    'retries': 3,
+    'backoff_factor': 0.5,    # 0.5s, 1s, 2s...
+    'max_retry_after': 30,    # Teto (s) da espera pedida no Retry-After; acima disso, o throttle assume
+}
+
+_shared_session = None
+_session_lock = threading.Lock()
+
+
+class CappedRetry(Retry):
+    """
+    Retry que respeita o Retry-After até `max_retry_after` segundos. Um servidor
+    pedindo horas de espera não prende a thread (nem a conexão do pool): após o
+    teto, o 429/503 volta ao chamador e o throttle por domínio reduz o ritmo.
+    """
+
+    def __init__(self, *args, max_retry_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kw):
+        kw.setdefault('max_retry_after', self.max_retry_after)
+        return super().new(**kw)
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None or self.max_retry_after is None:
+            return retry_after
+        return min(retry_after, self.max_retry_after)
+
+
+def _build_session(pool_connections, pool_maxsize, retries, backoff_factor, max_retry_after):
+    retry = CappedRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        max_retry_after=max_retry_after,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+    session.verify = False
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_shared_session():
+    """Retorna a sessão HTTP única do processo (keep-alive e pool por host)."""
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                _shared_session = _build_session(**SESSION_CONFIG)
+    return _shared_session
+
+
+def configure_shared_session(**options):
+    """
+    Ajusta tamanhos de pool e política de retry da sessão compartilhada.
+    A sessão anterior é fechada e recriada com a nova configuração.
+    """
+    global _shared_session
+    with _session_lock:
+        SESSION_CONFIG.update(options)
+        old_session, _shared_session = _shared_session, _build_session(**SESSION_CONFIG)
+    if old_session:
+        old_session.close()
+    return _shared_session
+
+
 class WebScraper:
-    def __init__(self):
+    def __init__(self, session=None, throttle=None, cache=None):
         self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+            "User-Agent": DEFAULT_USER_AGENT
         }
+        # Reutiliza conexões TCP/TLS entre downloads em vez de abrir uma por requisição
+        self.session = session or get_shared_session()
+        # Limitador adaptativo/disjuntor por domínio (opcional)
+        self.throttle = throttle
+        # Cache HTTP em disco com GET condicional (opcional)
+        self.cache = cache
         # Assume que o driver está na raiz do projeto
         self.driver_path = os.path.join(os.getcwd(), "msedgedriver.exe")
 
     def download_page(self, url, on_progress=None):
         """Tenta requests; se houver bloqueio de bot (Anubis/reCAPTCHA), usa Selenium."""
+        # Entrada ainda válida no cache: nenhuma requisição é feita
+        cached = self.cache.lookup(url) if self.cache else None
+        if cached and cached.fresh:
+            self.cache.touch(url)
+            if on_progress: on_progress(f"Cache: {url[:40]}...")
+            return cached.body
+
+        domain = self.throttle.domain_of(url) if self.throttle else None
+        if self.throttle:
+            if not self.throttle.allow(domain):
+                if on_progress: on_progress(f"Domínio {domain} pausado pelo disjuntor. Ignorando.")
+                return None
+            self.throttle.acquire(domain)
+
+        started = time.monotonic()
+        response = None
         try:
             if on_progress: on_progress(f"Conectando: {url[:40]}...")
-            response = requests.get(url, headers=self.headers, verify=False, timeout=15)
+            headers = dict(self.headers)
+            if cached:
+                headers.update(cached.validators())
+            response = self.session.get(url, headers=headers, verify=False, timeout=15)
+            self._record(domain, started, response.status_code)
+
+            # 304: o conteúdo não mudou desde o último download
+            if response.status_code == 304 and cached:
+                self.cache.refresh(url, response)
+                if on_progress: on_progress(f"Sem alterações (304): {url[:40]}...")
+                return cached.body
             
             html_content = response.text.lower()
             # Detecta bloqueios que retornam 200 OK mas não mostram conteúdo
@@ -35,41 +152,46 @@ class WebScraper:
 
             if is_blocked:
                 if on_progress: on_progress("Desafio de bot/bloqueio detectado. Iniciando navegador...")
-                return self._download_with_selenium(url, on_progress)
+                return self._download_with_selenium_tracked(url, domain, on_progress)
             
             response.raise_for_status()
+            if self.cache:
+                self.cache.store(url, response, response.text)
             return response.text
         except Exception:
+            if response is None:
+                # Falha de conexão/timeout: conta para o disjuntor do domínio
+                self._record(domain, started, error=True)
+                if self.throttle and self.throttle.is_open(domain):
+                    if on_progress: on_progress(f"Domínio {domain} indisponível. Disjuntor acionado.")
+                    return None
             if on_progress: on_progress("Falha no acesso direto. Tentando via navegador...")
-            return self._download_with_selenium(url, on_progress)
-                
+            return self._download_with_selenium_tracked(url, domain, on_progress)
+
+    def _record(self, domain, started, status_code=None, error=False):
+        if self.throttle and domain:
+            self.throttle.record(domain, time.monotonic() - started, status_code, error)
+
+    def _download_with_selenium_tracked(self, url, domain, on_progress=None):
+        """Fallback via navegador; um sucesso aqui libera o domínio no disjuntor."""
+        html = self._download_with_selenium(url, on_progress)
+        if html and self.throttle and domain:
+            # Início do Edge e espera do conteúdo dinâmico não são latência do servidor: taxa intacta
+            self.throttle.record(domain, None, 200)
+        return html
+
     def _download_with_selenium(self, url, on_progress=None):
-        """Abre o navegador Edge para contornar proteções antirrobô."""
+        """Usa um navegador Edge do pool compartilhado para contornar proteções antirrobô."""
         if not os.path.exists(self.driver_path):
             if on_progress: on_progress("Erro: msedgedriver.exe não encontrado na raiz.")
             return None
 
-        edge_options = Options()
-        edge_options.add_argument("--headless")  # Executa sem abrir janela visual
-        edge_options.add_argument("--disable-gpu")
-        edge_options.add_argument(f"user-agent={self.headers['User-Agent']}")
-
-        service = Service(self.driver_path)
-        driver = None
         try:
-            driver = webdriver.Edge(service=service, options=edge_options)
-            driver.get(url)
-            
-            # Aguarda o carregamento do conteúdo dinâmico (DSpace 7/9)
-            time.sleep(6) 
-            
-            html = driver.page_source
+            pool = get_browser_pool(self.driver_path, self.headers['User-Agent'])
+            # Aguarda o conteúdo dinâmico (DSpace 7/9) por marcadores de DOM, não por tempo fixo
+            html = pool.fetch(url)
             if on_progress: on_progress("Conteúdo capturado com sucesso via Selenium.")
             return html
         except Exception as e:
             if on_progress: on_progress(f"Falha no Selenium: {str(e)[:30]}")
             return None
-        finally:
-            if driver:
-                driver.quit()
-    
\ No newline at end of file
@@ -1,12 +1,33 @@
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401
+    SOUP_FEATURES = "lxml"
+except ImportError:  # Dependência opcional: o parser nativo do Python é usado como alternativa
+    SOUP_FEATURES = "html.parser"
+
+
+def parse_document(html_content):
+    """
+    Constrói o documento (BeautifulSoup) uma única vez por página.
+    Um documento já analisado é devolvido como está, para ser compartilhado
+    entre o parser e suas classes-mãe.
+    """
+    if isinstance(html_content, BeautifulSoup):
+        return html_content
+    return BeautifulSoup(html_content or "", SOUP_FEATURES)
+
+
 class BaseParser:
     """
     Classe base que define o comportamento padrão para todos os parsers de universidades.
     Implementa a filosofia 'Small is Beautiful' centralizando o download e 
     padronizando a extração.
     """
+
+    # Incrementar ao mudar a lógica de extração: invalida o cache de resultados deste parser
+    VERSION = 1
     
     def __init__(self, sigla="-", universidade="Desconhecida"):
         self.sigla = sigla
@@ -26,7 +47,7 @@ class BaseParser:
             if resp.status_code == 200:
                 if on_progress: on_progress(f"Extraindo metadados de {self.sigla}...")
                 data['html_source'] = resp.text
-                extracted = self.extract_pure_soup(resp.text, url, on_progress)
+                extracted = self.extract_pure_soup(parse_document(resp.text), url, on_progress)
                 data.update(extracted)
             else:
                 if on_progress: on_progress(f"Falha: Status {resp.status_code}")
@@ -42,6 +63,10 @@ class BaseParser:
         """
         raise NotImplementedError("Os parsers filhos devem implementar o método extract_pure_soup")
 
+    def _soup(self, document):
+        """Aceita o HTML bruto ou um documento pré-analisado por `parse_document`."""
+        return parse_document(document)
+
     def _get_default_data(self, url):
         """Subfunção utilitária para manter o dicionário padronizado."""
         return {
@@ -1,6 +1,52 @@
 import re
-from bs4 import BeautifulSoup
-from parsers.base_parser import BaseParser
+from bs4 import BeautifulSoup, SoupStrainer
+from parsers.base_parser import BaseParser, SOUP_FEATURES
+
+BDTD_BASE_URL = "https://bdtd.ibict.br"
+
+# Só os cards de resultado entram na árvore; o restante da página é descartado na leitura.
+# O filtro recebe o atributo class inteiro ou cada classe, conforme a versão do bs4.
+_RESULT_CARDS = SoupStrainer(class_=lambda value: bool(value) and "card-results" in value.split())
+
+
+def iter_result_cards(html_content, base_url=BDTD_BASE_URL):
+    """
+    Gera (titulo, autor, link_buscador, link_repositorio) para cada card
+    `.result.card-results` de uma página de resultados da BDTD.
+    Cada card é percorrido uma única vez; campos ausentes viram "-".
+    """
+    html_content = html_content or ""
+    # Nenhum card começa antes da primeira ocorrência da classe: cabeçalho e filtros nem são lidos
+    first = html_content.find("card-results")
+    if first < 0:
+        return
+    html_content = html_content[html_content.rfind("<", 0, first):]
+
+    soup = BeautifulSoup(html_content, SOUP_FEATURES, parse_only=_RESULT_CARDS)
+    for card in soup.find_all(class_="card-results"):
+        if "result" not in card.get("class", []):
+            continue
+
+        title_tag = author_tag = repo_tag = None
+        for link in card.find_all("a"):
+            if title_tag is None and "title" in link.get("class", []) and link.find_parent("h2"):
+                title_tag = link
+            elif author_tag is None and "/Author/" in link.get("href", ""):
+                author_tag = link
+            elif repo_tag is None and link.string and "Acessar documento" in link.string:
+                repo_tag = link
+
+        l_busc = title_tag.get("href", "-") if title_tag else "-"
+        if l_busc.startswith("/"):
+            l_busc = base_url + l_busc
+
+        yield (
+            title_tag.get_text(" ", strip=True) if title_tag else "-",
+            author_tag.get_text(" ", strip=True) if author_tag else "-",
+            l_busc,
+            repo_tag.get("href", "-") if repo_tag else "-",
+        )
+
 
 class BDTDParser(BaseParser):
     def __init__(self):
@@ -8,7 +54,7 @@ class BDTDParser(BaseParser):
         super().__init__(sigla="-", universidade="-")
 
     def extract_pure_soup(self, html_content, url, on_progress=None):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         data = {'sigla': '-', 'universidade': '-', 'programa': '-', 'link_pdf': '-'}
 
         # Localiza a Sigla (ex: UDF) e Universidade (ex: Centro Univ. Distrito Federal)
@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -10,9 +9,14 @@ class DSpaceAngularParser(BaseParser):
     1. Breadcrumbs (Trilha de navegação)
     2. Meta Tags (citation_pdf_url)
     3. Links de arquivos na página
+
+    Também lê as páginas montadas pela API REST (services/dspace_rest), que
+    trazem os campos Dublin Core em meta tags (ex.: dc.publisher.program).
     """
+    VERSION = 2
+
     def extract_pure_soup(self, html_content, url, on_progress=None):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         # Verifica se há necessidade de ajuste dinâmico da sigla (ex: FGV/EBAPE)
         self._check_dynamic_context(soup, on_progress)
@@ -27,8 +31,13 @@ class DSpaceAngularParser(BaseParser):
         if on_progress: on_progress(f"{self.sigla}: Analisando (Angular/DSpace 7+)...")
 
         # --- 1. EXTRAÇÃO DO PROGRAMA ---
+        # Campo explícito do Dublin Core, quando exposto em meta tag
+        meta_program = soup.find('meta', attrs={'name': 'dc.publisher.program'})
+        raw_program = meta_program.get('content') if meta_program else None
+
         # Tenta encontrar o programa nos breadcrumbs
-        raw_program = self._find_program_in_breadcrumbs(soup)
+        if not raw_program:
+            raw_program = self._find_program_in_breadcrumbs(soup)
         
         # Se não achar, tenta fallback para meta tags ou divs específicos
         if not raw_program:
@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -12,7 +11,7 @@ class DSpaceJSPUIParser(BaseParser):
     3. Breadcrumbs (Trilha de navegação)
     """
     def extract_pure_soup(self, html_content, url, on_progress=None):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         data = {
             'sigla': self.sigla,
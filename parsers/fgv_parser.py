@@ -8,6 +8,10 @@ class FGVParser(DSpaceAngularParser):
         )
 
     def _check_dynamic_context(self, soup, on_progress):
+        # A instância é reaproveitada pela fábrica: volta ao padrão antes de cada página
+        self.sigla = "FGV"
+        self.universidade = "Escola de Direito de São Paulo da Fundação Getulio Vargas"
+
         # Verifica se é EBAPE e altera a instância dinamicamente
         if "EBAPE" in soup.get_text().upper():
             self.sigla = "FGV-RJ"
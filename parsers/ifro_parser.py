@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from parsers.dspace_angular import DSpaceAngularParser
 
 class IFROParser(DSpaceAngularParser):
@@ -13,7 +12,7 @@ class IFROParser(DSpaceAngularParser):
         Extrai dados do repositório do IFRO (DSpace 7+ / Angular).
         Corrige a extração de programa para focar na Descrição/Citação e não no Campus.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         # 1. Executa a extração padrão da classe pai
         data = super().extract_pure_soup(html_content, url, on_progress)
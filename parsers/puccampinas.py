@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -12,7 +11,7 @@ class PUCCampinasParser(BaseParser):
         Extrai dados do repositório da PUC-Campinas (DSpace 6.2).
         Foca nos blocos 'simple-item-view-description' para o programa e meta tags para o PDF.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         data = {
             'sigla': self.sigla,
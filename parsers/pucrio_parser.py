@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -13,7 +12,7 @@ class PUCRioParser(BaseParser):
         Extrai dados do repositório Maxwell da PUC-Rio.
         Ajustado para capturar o programa dentro de estruturas <pre> e links de PDF no seletor.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         data = {
             'sigla': self.sigla,
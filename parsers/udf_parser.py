@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.dspace_angular import DSpaceAngularParser
 
@@ -25,7 +24,7 @@ class UDFParser(DSpaceAngularParser):
         data = super().extract_pure_soup(html_content, url, on_progress)
 
         # 2. Refinamento específico para a estrutura do DSpace 8.2 da UDF
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
 
         # --- EXTRAÇÃO DO PROGRAMA ---
         if data['programa'] == '-':
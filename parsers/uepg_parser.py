@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -12,7 +11,7 @@ class UEPGParser(BaseParser):
         Extrai dados do repositório da UEPG (DSpace 5.x).
         Foca na tabela de metadados para o Programa e meta tags para o PDF.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         data = {
             'sigla': self.sigla,
@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -12,7 +11,7 @@ class UFPAParser(BaseParser):
         Extrai dados do repositório da UFPA (DSpace 7+).
         Busca o programa no campo de metadado específico ou breadcrumbs, e o PDF via meta tags.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         data = {
             'sigla': self.sigla,
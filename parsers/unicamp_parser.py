@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -8,7 +7,7 @@ class UnicampParser(BaseParser):
         super().__init__(sigla="UNICAMP", universidade="Universidade Estadual de Campinas")
 
     def extract_pure_soup(self, html_content, url, on_progress=None):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         data = {
             'sigla': self.sigla,
             'universidade': self.universidade,
@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from parsers.dspace_angular import DSpaceAngularParser
 
 class UNIFACSParser(DSpaceAngularParser):
@@ -12,7 +11,7 @@ class UNIFACSParser(DSpaceAngularParser):
         Extrai dados do repositório Deposita (IBICT).
         Corrige o problema de identificar o tipo de documento (Dissertação) como Programa.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         # 1. Executa a extração padrão
         data = super().extract_pure_soup(html_content, url, on_progress)
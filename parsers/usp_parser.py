@@ -1,5 +1,4 @@
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from parsers.base_parser import BaseParser
 
@@ -12,7 +11,7 @@ class USPParser(BaseParser):
         Extrai dados do repositório da USP (teses.usp.br).
         Utiliza Meta Tags Dublin Core como fonte primária e estrutura de DIVs como fallback.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self._soup(html_content)
         
         data = {
             'sigla': self.sigla,
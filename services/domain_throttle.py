@@ -0,0 +1,151 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+# Estados do disjuntor (exibidos na aba "Raízes de URLs")
+BREAKER_CLOSED = "ok"
+BREAKER_OPEN = "pausado"
+BREAKER_HALF_OPEN = "testando"
+
+
+class _DomainState:
+    """Balde de tokens e disjuntor de um único domínio."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate              # Requisições por segundo permitidas
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+        self.failures = 0             # Falhas consecutivas
+        self.breaker = BREAKER_CLOSED
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.trial_in_flight = False
+
+
+class DomainThrottle:
+    """
+    Limitador adaptativo por domínio (token bucket) com disjuntor.
+
+    A taxa de cada domínio cai pela metade a cada resposta 429/403 ou latência
+    acima do alvo, e volta a subir aos poucos com respostas rápidas (AIMD).
+    Após `failure_threshold` falhas seguidas o domínio é pausado por
+    `cooldown` segundos; depois disso uma única requisição de teste decide
+    se ele volta ao normal ou é pausado novamente por mais tempo.
+    """
+
+    def __init__(self, rate=2.0, burst=4, min_rate=0.1, max_rate=10.0,
+                 target_latency=3.0, failure_threshold=5, cooldown=120.0, max_cooldown=1800.0):
+        self.initial_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    def _state(self, domain):
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = _DomainState(self.initial_rate, self.burst)
+        return state
+
+    @staticmethod
+    def domain_of(url):
+        try:
+            return urlparse(url).netloc.lower()
+        except Exception:
+            return ""
+
+    # --- Disjuntor ---
+
+    def is_open(self, domain):
+        """Consulta sem efeitos colaterais: o domínio está pausado agora?"""
+        with self._lock:
+            state = self._domains.get(domain)
+            if not state or state.breaker != BREAKER_OPEN:
+                return False
+            return time.monotonic() - state.opened_at < state.cooldown
+
+    def allow(self, domain):
+        """Decide se uma requisição pode sair; libera uma requisição de teste após o cool-down."""
+        with self._lock:
+            state = self._state(domain)
+            if state.breaker == BREAKER_CLOSED:
+                return True
+            if state.breaker == BREAKER_OPEN:
+                if time.monotonic() - state.opened_at < state.cooldown:
+                    return False
+                state.breaker = BREAKER_HALF_OPEN
+                state.trial_in_flight = False
+            # Meio-aberto: apenas uma requisição de teste por vez
+            if state.trial_in_flight:
+                return False
+            state.trial_in_flight = True
+            return True
+
+    # --- Limitador ---
+
+    def acquire(self, domain):
+        """Bloqueia até haver um token disponível para o domínio."""
+        while True:
+            with self._lock:
+                state = self._state(domain)
+                now = time.monotonic()
+                state.tokens = min(state.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                if state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                wait = (1 - state.tokens) / state.rate
+            time.sleep(wait)
+
+    def record(self, domain, latency, status_code=None, error=False):
+        """
+        Registra o resultado de uma requisição e ajusta taxa e disjuntor.
+        Com `latency=None` (tempo que não mede o servidor, ex.: navegador), só o disjuntor é atualizado.
+        """
+        with self._lock:
+            state = self._state(domain)
+            throttled = status_code in (403, 429)
+            failed = error or throttled or (status_code is not None and status_code >= 500)
+
+            if throttled or (latency is not None and latency > self.target_latency):
+                state.rate = max(self.min_rate, state.rate / 2)
+            elif not failed and latency is not None:
+                state.rate = min(self.max_rate, state.rate + 0.1)
+
+            if failed:
+                state.failures += 1
+                if state.breaker == BREAKER_HALF_OPEN:
+                    self._open(state, min(self.max_cooldown, state.cooldown * 2))
+                elif state.failures >= self.failure_threshold:
+                    self._open(state, self.base_cooldown)
+            else:
+                state.failures = 0
+                state.breaker = BREAKER_CLOSED
+                state.cooldown = 0.0
+            state.trial_in_flight = False
+
+    def _open(self, state, cooldown):
+        state.breaker = BREAKER_OPEN
+        state.opened_at = time.monotonic()
+        state.cooldown = cooldown or self.base_cooldown
+
+    def breaker_states(self):
+        """Retorna {domínio: estado} apenas para domínios fora do estado normal."""
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for domain, state in self._domains.items():
+                if state.breaker == BREAKER_OPEN:
+                    remaining = state.cooldown - (now - state.opened_at)
+                    result[domain] = f"{BREAKER_OPEN} ({int(remaining)}s)" if remaining > 0 else BREAKER_HALF_OPEN
+                elif state.breaker == BREAKER_HALF_OPEN:
+                    result[domain] = BREAKER_HALF_OPEN
+        return result
@@ -0,0 +1,106 @@
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+
+class DownloadEngine:
+    """
+    Motor de downloads concorrentes com limite global e limite por domínio.
+
+    Os downloads rodam em um pool de threads, mas os resultados são entregues
+    ao callback `on_result` sempre na thread que chamou `run`. Assim existe um
+    único escritor no banco, mesmo com vários downloads em paralelo.
+    """
+
+    def __init__(self, fetch, max_workers=8, per_domain=2, is_blocked=None):
+        self.fetch = fetch
+        self.max_workers = max(1, int(max_workers))
+        self.per_domain = max(1, int(per_domain))
+        # Consulta opcional (ex.: disjuntor) para descartar domínios pausados
+        self.is_blocked = is_blocked
+
+    def run(self, jobs, on_result, on_progress=None, on_skip=None, should_stop=None):
+        """
+        Executa os downloads de `jobs` (lista de tuplas (chave, url)).
+        `on_result(chave, url, conteudo)` recebe None quando o download falha.
+        `on_skip(chave, url)` recebe os itens de domínios bloqueados que não foram baixados.
+        `on_progress(concluidos, total)` é chamado a cada item finalizado.
+        `should_stop()` verdadeiro interrompe o agendamento (os downloads em andamento terminam).
+        Retorna o número de itens processados.
+        """
+        pending = defaultdict(deque)
+        for key, url in jobs:
+            pending[self._domain_of(url)].append((key, url))
+
+        total = sum(len(q) for q in pending.values())
+        if total == 0:
+            return 0
+
+        in_flight = defaultdict(int)
+        futures = {}
+        done_count = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+
+            def skip_blocked():
+                nonlocal done_count
+                if not self.is_blocked:
+                    return
+                for domain in list(pending.keys()):
+                    if not self.is_blocked(domain):
+                        continue
+                    for key, url in pending.pop(domain):
+                        if on_skip:
+                            on_skip(key, url)
+                        done_count += 1
+                        if on_progress:
+                            on_progress(done_count, total)
+
+            def schedule():
+                if should_stop and should_stop():
+                    pending.clear()
+                    return
+                skip_blocked()
+                # Distribui as vagas livres em rodízio entre os domínios
+                progressed = True
+                while progressed and len(futures) < self.max_workers:
+                    progressed = False
+                    for domain in list(pending.keys()):
+                        if len(futures) >= self.max_workers:
+                            break
+                        queue = pending[domain]
+                        if not queue:
+                            del pending[domain]
+                            continue
+                        if in_flight[domain] >= self.per_domain:
+                            continue
+                        key, url = queue.popleft()
+                        in_flight[domain] += 1
+                        futures[pool.submit(self.fetch, url)] = (key, url, domain)
+                        progressed = True
+
+            schedule()
+            while futures:
+                finished, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key, url, domain = futures.pop(future)
+                    in_flight[domain] -= 1
+                    try:
+                        content = future.result()
+                    except Exception:
+                        content = None
+
+                    on_result(key, url, content)
+                    done_count += 1
+                    if on_progress:
+                        on_progress(done_count, total)
+                schedule()
+
+        return done_count
+
+    @staticmethod
+    def _domain_of(url):
+        try:
+            return urlparse(url).netloc.lower()
+        except Exception:
+            return ""
@@ -0,0 +1,204 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from html import escape
+from urllib.parse import urlparse
+from models.web_scraper import get_shared_session
+
+# Configuração padrão do cliente REST do DSpace 7+
+DSPACE_REST_CONFIG = {
+    'api_path': "/server/api",
+    'timeout': 15,
+    'cache_size': 1024,    # Respostas JSON mantidas em memória (coleções e comunidades se repetem)
+}
+
+# Campos exibidos como blocos "simple-view-element" (rótulos da página de item do DSpace em português)
+FIELD_LABELS = (
+    ("dc.identifier.citation", "Citação"),
+    ("dc.description", "Descrição"),
+    ("dc.description.abstract", "Resumo"),
+    ("dc.publisher.program", "Programa"),
+    ("dc.publisher.department", "Departamento"),
+    ("dc.publisher", "Editora"),
+    ("dc.contributor.advisor1", "Orientador"),
+    ("dc.date.issued", "Data de publicação"),
+)
+
+_HANDLE = re.compile(r"/handle/(\d+(?:\.\d+)*/\d+)")
+_UUID = re.compile(r"/(?:items|entities/[^/]+)/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})", re.I)
+
+
+class DSpaceRestClient:
+    """
+    Cliente da API REST do DSpace 7+ (/server/api).
+
+    Resolve o handle ou o UUID da URL do item, lê os metadados, o bundle
+    ORIGINAL e a trilha coleção/comunidade, e monta uma página HTML com a
+    mesma marcação da interface Angular (meta tags, blocos simple-view,
+    breadcrumbs e links /bitstreams/.../download). Assim os parsers
+    DSpaceAngularParser funcionam sem navegador. As respostas ficam num
+    cache LRU; hosts sem a API são lembrados e não são consultados de novo.
+    """
+
+    def __init__(self, session=None, throttle=None, timeout=None, cache_size=None):
+        self.session = session or get_shared_session()
+        self.throttle = throttle
+        self.timeout = timeout or DSPACE_REST_CONFIG['timeout']
+        self.cache_size = cache_size or DSPACE_REST_CONFIG['cache_size']
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._unavailable = set()
+
+    def api_base(self, url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme or 'https'}://{parsed.netloc}{DSPACE_REST_CONFIG['api_path']}"
+
+    def find_item(self, url):
+        """JSON do item a partir da URL (/handle/<prefixo>/<id> ou /items/<uuid>), ou None."""
+        base = self.api_base(url)
+        uuid = _UUID.search(url or "")
+        if uuid:
+            return self._get_json(f"{base}/core/items/{uuid.group(1)}")
+        handle = _HANDLE.search(url or "")
+        if handle:
+            # pid/find redireciona para /core/items/<uuid>
+            return self._get_json(f"{base}/pid/find?id={handle.group(1)}")
+        return None
+
+    def original_bitstreams(self, item):
+        """Arquivos do bundle ORIGINAL: [(nome, uuid)]."""
+        bundles = self._get_json(self._link(item, "bundles"))
+        for bundle in self._embedded(bundles, "bundles"):
+            if bundle.get("name") != "ORIGINAL":
+                continue
+            bitstreams = self._get_json(self._link(bundle, "bitstreams"))
+            return [
+                (bs.get("name") or "", bs.get("uuid"))
+                for bs in self._embedded(bitstreams, "bitstreams") if bs.get("uuid")
+            ]
+        return []
+
+    def trail(self, item):
+        """Nomes da comunidade e da coleção do item (ordem da trilha de navegação)."""
+        names = []
+        collection = self._get_json(self._link(item, "owningCollection"))
+        if collection:
+            names.append(collection.get("name"))
+            community = self._get_json(self._link(collection, "parentCommunity"))
+            if community:
+                names.insert(0, community.get("name"))
+        return [name for name in names if name]
+
+    def item_document(self, url):
+        """Página HTML equivalente à do item no DSpace Angular, montada pela API; None sem API/item."""
+        if urlparse(url).netloc in self._unavailable:
+            return None
+        item = self.find_item(url)
+        if not item or item.get("type") != "item":
+            return None
+        return render_item_html(item, self.original_bitstreams(item), self.trail(item), url)
+
+    # --- HTTP e cache ---
+
+    @staticmethod
+    def _link(resource, name):
+        return ((resource or {}).get("_links") or {}).get(name, {}).get("href")
+
+    @staticmethod
+    def _embedded(resource, name):
+        return ((resource or {}).get("_embedded") or {}).get(name) or []
+
+    def _get_json(self, api_url):
+        if not api_url:
+            return None
+        with self._lock:
+            if api_url in self._cache:
+                self._cache.move_to_end(api_url)
+                return self._cache[api_url]
+
+        domain = urlparse(api_url).netloc
+        if domain in self._unavailable:
+            return None
+        if self.throttle:
+            if not self.throttle.allow(domain):
+                return None
+            self.throttle.acquire(domain)
+
+        started = time.monotonic()
+        try:
+            response = self.session.get(
+                api_url, headers={"Accept": "application/json"}, timeout=self.timeout, verify=False
+            )
+        except Exception:
+            if self.throttle:
+                self.throttle.record(domain, time.monotonic() - started, error=True)
+            return None
+        if self.throttle:
+            self.throttle.record(domain, time.monotonic() - started, response.status_code)
+
+        try:
+            data = response.json() if response.status_code == 200 else None
+        except ValueError:
+            # HTML no lugar do JSON: o host não tem a API REST do DSpace 7
+            self._unavailable.add(domain)
+            return None
+        if data is None:
+            return None
+
+        with self._lock:
+            self._cache[api_url] = data
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+
+def _values(metadata, field):
+    return [entry.get("value") for entry in metadata.get(field, []) if entry.get("value")]
+
+
+def render_item_html(item, bitstreams, trail, url):
+    """Marcação mínima da página de item do DSpace Angular a partir do JSON da API."""
+    parsed = urlparse(url)
+    root = f"{parsed.scheme or 'https'}://{parsed.netloc}"
+    metadata = item.get("metadata") or {}
+    title = (_values(metadata, "dc.title") or [item.get("name") or ""])[0]
+
+    head = [f"<title>{escape(title)}</title>"]
+    for field in metadata:
+        for value in _values(metadata, field):
+            head.append(f'<meta name="{escape(field)}" content="{escape(value)}">')
+    head.append(f'<meta name="citation_title" content="{escape(title)}">')
+    for author in _values(metadata, "dc.contributor.author"):
+        head.append(f'<meta name="citation_author" content="{escape(author)}">')
+    for publisher in _values(metadata, "dc.publisher")[:1]:
+        head.append(f'<meta name="citation_publisher" content="{escape(publisher)}">')
+
+    downloads = [(name, f"{root}/bitstreams/{uuid}/download") for name, uuid in bitstreams]
+    pdf = next((link for name, link in downloads if name.lower().endswith(".pdf")), None)
+    if pdf:
+        head.append(f'<meta name="citation_pdf_url" content="{escape(pdf)}">')
+        head.append(f'<link rel="item" type="application/pdf" href="{escape(pdf)}">')
+
+    crumbs = ['<li class="breadcrumb-item"><a href="/">Início</a></li>']
+    crumbs += [f'<li class="breadcrumb-item"><a href="#">{escape(name)}</a></li>' for name in trail]
+    crumbs.append(f'<li class="breadcrumb-item active">{escape(title)}</li>')
+
+    body = [f'<ol class="breadcrumb">{"".join(crumbs)}</ol>', f"<h1>{escape(title)}</h1>"]
+    if trail:
+        body.append(f'<ds-item-page-collections><a href="#">{escape(trail[-1])}</a></ds-item-page-collections>')
+    for field, label in FIELD_LABELS:
+        values = _values(metadata, field)
+        if values:
+            body.append(
+                f'<div class="simple-view-element"><h5 class="simple-view-element-header">{label}</h5>'
+                f'<div class="simple-view-element-body">{"<br>".join(escape(v) for v in values)}</div></div>'
+            )
+    for name, link in downloads:
+        body.append(f'<a href="{escape(link)}">{escape(name)}</a>')
+
+    return (
+        f'<!DOCTYPE html><html><head>{"".join(head)}</head>'
+        f'<body data-fonte="dspace-rest" data-handle="{escape(item.get("handle") or "")}">'
+        f'{"".join(body)}</body></html>'
+    )
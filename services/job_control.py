@@ -0,0 +1,137 @@
+import threading
+from datetime import datetime, timedelta
+from models.db_handler import JOB_ITEM_UPDATE_SQL
+
+# Estados de um job (tabela jobs)
+JOB_RUNNING = "executando"
+JOB_PAUSED = "pausado"
+JOB_CANCELLED = "cancelado"
+JOB_DONE = "concluido"
+
+# Tipos de job (usados para retomar o lote certo na abertura do aplicativo)
+JOB_KIND_DOWNLOAD = "download_repositorios"
+JOB_KIND_PARSE = "parser_metadados"
+JOB_KIND_PAGINATION = "paginacao"
+JOB_KIND_EXTRACTION = "extracao_historico"
+
+# Estados de cada item (tabela job_items)
+ITEM_PENDING = "pendente"
+ITEM_DONE = "ok"
+ITEM_FAILED = "falha"
+
+# Posse dos jobs: o processo que executa um job renova `heartbeat` a cada intervalo;
+# sem sinal de vida por `stale_after` segundos, o job é considerado abandonado
+JOB_CONFIG = {
+    'heartbeat_interval': 15.0,
+    'stale_after': 60.0,
+}
+
+
+class JobBusyError(RuntimeError):
+    """O job está sendo executado por outro processo (CLI ou outra janela)."""
+
+
+def stale_cutoff():
+    """Heartbeats anteriores a este instante indicam um dono que já não executa o job."""
+    return datetime.now() - timedelta(seconds=JOB_CONFIG['stale_after'])
+
+
+class JobControl:
+    """
+    Controle de um job em lote persistido no banco (tabelas jobs/job_items).
+
+    O laço do lote consulta `wait_if_paused()` antes de cada item: a chamada
+    bloqueia enquanto o job estiver pausado e retorna False após o
+    cancelamento. O estado de cada item é gravado pelo mesmo BulkWriter dos
+    dados, logo depois deles: após uma queda, o item nunca aparece como
+    concluído sem que seus dados tenham sido gravados.
+
+    Com `owner`, uma thread renova o heartbeat do job enquanto ele estiver
+    aberto (inclusive pausado); `close()` para a renovação e solta o job.
+    """
+
+    def __init__(self, db, job_id, kind, paused=False, owner=None):
+        self.db = db
+        self.job_id = job_id
+        self.kind = kind
+        self.owner = owner
+        self.bulk = None
+        self._cancelled = False
+        self._running = threading.Event()
+        if not paused:
+            self._running.set()
+        self._closed = threading.Event()
+        if owner:
+            threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def _heartbeat(self):
+        while not self._closed.wait(JOB_CONFIG['heartbeat_interval']):
+            try:
+                self.db.touch_job(self.job_id, self.owner)
+            except Exception:
+                # Banco fechado no encerramento do processo
+                return
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def paused(self):
+        return not self._running.is_set() and not self._cancelled
+
+    def pause(self):
+        if self._cancelled:
+            return
+        self._running.clear()
+        self.db.set_job_state(self.job_id, JOB_PAUSED)
+
+    def resume(self):
+        if self._cancelled:
+            return
+        self.db.set_job_state(self.job_id, JOB_RUNNING)
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled = True
+        self.db.set_job_state(self.job_id, JOB_CANCELLED)
+        # Libera quem estiver esperando na pausa
+        self._running.set()
+
+    def wait_if_paused(self):
+        """Bloqueia durante a pausa; retorna False se o job foi cancelado."""
+        self._running.wait()
+        return not self._cancelled
+
+    # --- Checkpoint por item ---
+
+    def done(self, item):
+        self._mark(item, ITEM_DONE)
+
+    def failed(self, item, error=None):
+        self._mark(item, ITEM_FAILED, str(error)[:500] if error else None)
+
+    def _mark(self, item, state, error=None):
+        params = (state, error, datetime.now(), self.job_id, str(item))
+        if self.bulk:
+            self.bulk.execute(JOB_ITEM_UPDATE_SQL, params)
+        else:
+            self.db.update_job_items([params])
+
+    def finish(self, complete=True):
+        """
+        Fecha o job: concluído, ou mantém cancelado/pausado para a próxima abertura.
+        Com `complete=False` (itens adiados), o job continua em execução e é retomado depois.
+        """
+        if self.bulk:
+            self.bulk.flush()
+        if complete and not self._cancelled and self._running.is_set():
+            self.db.set_job_state(self.job_id, JOB_DONE)
+
+    def close(self):
+        """Para o heartbeat e solta o job (chamado ao fim da execução, mesmo após erro)."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self.owner:
+            self.db.release_job(self.job_id, self.owner)
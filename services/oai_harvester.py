@@ -0,0 +1,257 @@
+import re
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+from models.web_scraper import get_shared_session
+
+# Configuração padrão da coleta OAI-PMH
+OAI_CONFIG = {
+    'timeout': 60,
+    # Caminhos usuais do provedor OAI: DSpace 5/6, DSpace 7+ e VuFind (BDTD)
+    'endpoint_paths': ("/oai/request", "/server/oai/request", "/oai", "/vufind/OAI/Server"),
+    # Formatos em ordem de preferência: dim e xoai trazem programa e sigla do DSpace
+    'formats': ("dim", "xoai", "oai_dc"),
+}
+
+_HANDLE = re.compile(r"(?:/handle/|hdl\.handle\.net/)(\d+(?:\.\d+)*/\d+)")
+_RECORD_ID = re.compile(r"/Record/([^/?#]+)")
+# Nó de idioma do xoai (pt_BR, en, none, *): fica logo acima do <field name="value">
+_LANGUAGE = re.compile(r"^(?:[a-z]{2}(?:[_-][A-Z]{2})?|none|\*)$")
+
+
+def handle_of(url):
+    """Handle do DSpace (ex.: 10482/1234) contido em uma URL, ou None."""
+    match = _HANDLE.search(url or "")
+    return match.group(1) if match else None
+
+
+def record_id_of(url):
+    """Id do registro VuFind (/Record/<id>) contido em uma URL, ou None."""
+    match = _RECORD_ID.search(url or "")
+    return match.group(1) if match else None
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+# Código de OaiError usado quando o disjuntor do domínio está aberto (não é do protocolo)
+DOMAIN_PAUSED = "domainPaused"
+
+
+class OaiError(Exception):
+    """Erro retornado pelo provedor OAI (<error code="...">) ou domínio pausado (DOMAIN_PAUSED)."""
+
+    def __init__(self, code, message=""):
+        super().__init__(f"{code}: {message}" if message else code)
+        self.code = code
+
+
+class OaiHarvester:
+    """
+    Coletor OAI-PMH com leitura em streaming.
+
+    `ListRecords` é lido com iterparse direto do socket: cada <record> é
+    convertido em um dicionário de campos e descartado, então a memória não
+    cresce com o tamanho da página. As páginas seguintes vêm pelos
+    resumptionTokens; o chamador grava o token e o maior datestamp visto
+    para continuar a coleta de forma incremental.
+    """
+
+    def __init__(self, session=None, throttle=None, timeout=None):
+        self.session = session or get_shared_session()
+        self.throttle = throttle
+        self.timeout = timeout or OAI_CONFIG['timeout']
+
+    # --- Descoberta ---
+
+    def discover(self, domain, scheme="https"):
+        """Primeiro endpoint do domínio que responde ao verbo Identify, ou None."""
+        for path in OAI_CONFIG['endpoint_paths']:
+            endpoint = f"{scheme}://{domain}{path}"
+            try:
+                response = self._get(endpoint, {"verb": "Identify"})
+            except OaiError:
+                raise
+            except Exception:
+                continue
+            if response.status_code == 200 and "<Identify" in response.text:
+                return endpoint
+        return None
+
+    def pick_format(self, endpoint):
+        """Melhor formato de metadados oferecido pelo provedor (ver OAI_CONFIG['formats'])."""
+        try:
+            response = self._get(endpoint, {"verb": "ListMetadataFormats"})
+            offered = set(re.findall(r"<(?:\w+:)?metadataPrefix>\s*([^<\s]+)", response.text))
+        except OaiError:
+            raise
+        except Exception:
+            offered = set()
+        for prefix in OAI_CONFIG['formats']:
+            if prefix in offered:
+                return prefix
+        return "oai_dc"
+
+    # --- Coleta ---
+
+    def iter_pages(self, endpoint, metadata_prefix="oai_dc", set_spec=None, from_date=None, token=None):
+        """
+        Gera (registros, proximo_token) para cada página de ListRecords.
+        Com `token`, continua uma coleta interrompida.
+        """
+        while True:
+            if token:
+                params = {"verb": "ListRecords", "resumptionToken": token}
+            else:
+                params = {"verb": "ListRecords", "metadataPrefix": metadata_prefix}
+                if set_spec:
+                    params["set"] = set_spec
+                if from_date:
+                    params["from"] = from_date
+
+            try:
+                records, token = self._list_records(endpoint, params)
+            except OaiError as e:
+                if e.code == "noRecordsMatch":
+                    return
+                raise
+            yield records, token
+            if not token:
+                return
+
+    def _list_records(self, endpoint, params):
+        response = self._get(endpoint, params, stream=True)
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            records, token = [], None
+            for _, elem in ET.iterparse(response.raw, events=("end",)):
+                name = _local(elem.tag)
+                if name == "record":
+                    records.append(self._parse_record(elem))
+                    elem.clear()
+                elif name == "resumptionToken":
+                    token = (elem.text or "").strip() or None
+                elif name == "error":
+                    raise OaiError(elem.get("code", "error"), (elem.text or "").strip())
+            return records, token
+        finally:
+            response.close()
+
+    def _get(self, endpoint, params, stream=False):
+        domain = urlparse(endpoint).netloc
+        if self.throttle:
+            # Disjuntor aberto (ou teste já em andamento): a coleta do domínio para aqui
+            if not self.throttle.allow(domain):
+                raise OaiError(DOMAIN_PAUSED, f"{domain} pausado pelo disjuntor")
+            self.throttle.acquire(domain)
+        started = time.monotonic()
+        try:
+            response = self.session.get(endpoint, params=params, timeout=self.timeout, verify=False, stream=stream)
+        except Exception:
+            if self.throttle:
+                self.throttle.record(domain, time.monotonic() - started, error=True)
+            raise
+        if self.throttle:
+            self.throttle.record(domain, time.monotonic() - started, response.status_code)
+        return response
+
+    # --- Conversão dos registros ---
+
+    def _parse_record(self, record):
+        """{identifier, datestamp, deleted, fields: {chave: [valores]}} de um <record>."""
+        header = next((child for child in record if _local(child.tag) == "header"), None)
+        metadata = next((child for child in record if _local(child.tag) == "metadata"), None)
+        result = {
+            'identifier': None,
+            'datestamp': None,
+            'deleted': header is not None and header.get("status") == "deleted",
+            'fields': {},
+        }
+        if header is not None:
+            for child in header:
+                if _local(child.tag) in ("identifier", "datestamp"):
+                    result[_local(child.tag)] = (child.text or "").strip()
+
+        if metadata is not None and len(metadata):
+            root = metadata[0]
+            fields = result['fields']
+            if _local(root.tag) == "dim":
+                self._read_dim(root, fields)
+            elif _local(root.tag) == "metadata":
+                self._read_xoai(root, [], fields)
+            else:
+                # oai_dc e afins: <dc:title>, <dc:identifier>...
+                for elem in root.iter():
+                    if elem is not root and elem.text and elem.text.strip():
+                        fields.setdefault(f"dc.{_local(elem.tag)}", []).append(elem.text.strip())
+        return result
+
+    @staticmethod
+    def _read_dim(root, fields):
+        for field in root:
+            if not (field.text and field.text.strip()):
+                continue
+            parts = [field.get("mdschema"), field.get("element"), field.get("qualifier")]
+            key = ".".join(part for part in parts if part)
+            fields.setdefault(key, []).append(field.text.strip())
+
+    def _read_xoai(self, elem, path, fields, bundle=None):
+        """Achata a árvore <element name=...> do xoai em chaves pontuadas (sem o nó de idioma)."""
+        for child in elem:
+            name = _local(child.tag)
+            if name == "element":
+                child_bundle = bundle
+                if child.get("name") == "bundle":
+                    child_bundle = next(
+                        (f.text for f in child if _local(f.tag) == "field" and f.get("name") == "name"), None
+                    )
+                self._read_xoai(child, path + [child.get("name", "")], fields, child_bundle)
+            elif name == "field" and child.text and child.text.strip():
+                if path[:1] == ["bundles"]:
+                    # Arquivos: só o bundle ORIGINAL interessa (link do PDF)
+                    if child.get("name") == "url" and bundle == "ORIGINAL":
+                        fields.setdefault("bitstream.url", []).append(child.text.strip())
+                elif child.get("name") == "value":
+                    # Só há nó de idioma abaixo de schema.elemento (dc.title.pt_BR)
+                    key_path = path[:-1] if len(path) >= 3 and _LANGUAGE.match(path[-1]) else path
+                    fields.setdefault(".".join(key_path), []).append(child.text.strip())
+
+    @staticmethod
+    def join_keys(record):
+        """Chaves de junção com pesquisas_extraidas: handle do DSpace e/ou id do registro VuFind."""
+        keys = set()
+        identifier = record['identifier'] or ""
+        if identifier.startswith("oai:"):
+            keys.add(identifier.split(":", 2)[-1])
+        for values in (record['fields'].get("dc.identifier.uri", []), record['fields'].get("dc.identifier", [])):
+            for value in values:
+                handle = handle_of(value)
+                if handle:
+                    keys.add(handle)
+        return keys
+
+    @staticmethod
+    def to_details(record):
+        """Sigla, universidade, programa e link do PDF no formato dos parsers ("-" quando ausente)."""
+        fields = record['fields']
+
+        def first(*keys):
+            for key in keys:
+                for value in fields.get(key, []):
+                    if value:
+                        return value
+            return "-"
+
+        links = fields.get("bitstream.url", []) + [
+            value for value in fields.get("dc.identifier", []) + fields.get("dc.identifier.uri", [])
+            if "/bitstream/" in value or value.lower().endswith(".pdf")
+        ]
+        pdf = next((link for link in links if link.lower().split("?")[0].endswith(".pdf")), None)
+        return {
+            'sigla': first("dc.publisher.initials", "dc.publisher.sigla"),
+            'universidade': first("dc.publisher.institution", "dc.publisher"),
+            'programa': first("dc.publisher.program", "dc.publisher.department"),
+            'link_pdf': pdf or (links[0] if links else "-"),
+        }
@@ -0,0 +1,94 @@
+import math
+import re
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from services.download_engine import DownloadEngine
+
+# Configuração padrão da paginação das buscas (VuFind/BDTD)
+PAGINATION_CONFIG = {
+    'page_size': 100,      # Maior valor de `limit` aceito pelo VuFind da BDTD
+    'max_workers': 6,
+    'per_host': 3,         # Páginas da mesma busca baixadas em paralelo por host
+}
+
+_STATS_BLOCK = re.compile(
+    r'<(div|span|p)\b[^>]*class="[^"]*search-stats[^"]*"[^>]*>(.*?)</\1>', re.IGNORECASE | re.DOTALL
+)
+_RANGE_OF_TOTAL = re.compile(
+    r'(\d[\d.,]*)\s*[-–]\s*(\d[\d.,]*)\D{0,40}?\b(?:de|of)\s+(\d[\d.,]*)', re.IGNORECASE
+)
+_TAGS = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+
+
+def _to_int(number):
+    return int(re.sub(r"[.,]", "", number))
+
+
+def parse_search_stats(html):
+    """
+    Lê o bloco de estatísticas do VuFind ("Mostrando 1 - 20 resultados de 1.234")
+    e retorna (primeiro, último, total) da página, ou None se não houver.
+    Fora do bloco o padrão casaria com datas e faixas de anos dos cards.
+    """
+    block = _STATS_BLOCK.search(html or "")
+    if not block:
+        return None
+    match = _RANGE_OF_TOTAL.search(_SPACES.sub(" ", _TAGS.sub(" ", block.group(2))))
+    if not match:
+        return None
+    return tuple(_to_int(number) for number in match.groups())
+
+
+def page_url(link, page, page_size):
+    """URL da página `page` da busca com `limit=page_size`, preservando os demais parâmetros."""
+    parsed = urlparse(link)
+    params = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in ("page", "limit")]
+    params.append(("limit", str(page_size)))
+    if page > 1:
+        params.append(("page", str(page)))
+    return urlunparse(parsed._replace(query=urlencode(params, safe="[]")))
+
+
+class PaginationEngine:
+    """
+    Paginação de buscas do VuFind guiada pelo total de resultados.
+
+    O número de páginas vem do total informado pela própria busca e do
+    tamanho de página efetivamente servido (o VuFind pode limitar o `limit`
+    pedido). As páginas restantes são baixadas em paralelo pelo
+    DownloadEngine, respeitando o limite de conexões por host.
+    """
+
+    def __init__(self, fetch, page_size=None, max_workers=None, per_host=None, is_blocked=None):
+        self.fetch = fetch
+        self.page_size = page_size or PAGINATION_CONFIG['page_size']
+        self.max_workers = max_workers or PAGINATION_CONFIG['max_workers']
+        self.per_host = per_host or PAGINATION_CONFIG['per_host']
+        self.is_blocked = is_blocked
+
+    def needs_larger_page(self, stats, link):
+        """
+        Verdadeiro quando a página 1 foi capturada com menos itens do que o tamanho
+        máximo permitiria e o `limit` máximo ainda não foi pedido (o servidor pode limitá-lo).
+        """
+        first, last, total = stats
+        return last - first + 1 < min(total, self.page_size) and page_url(link, 1, self.page_size) != link
+
+    @staticmethod
+    def plan(stats):
+        """(total de resultados, itens por página, total de páginas) a partir das estatísticas da página 1."""
+        first, last, total = stats
+        per_page = max(1, last - first + 1)
+        return total, per_page, max(1, math.ceil(total / per_page))
+
+    def run(self, link, pages, per_page, on_page, on_progress=None, should_stop=None, fetch=None):
+        """
+        Baixa as `pages` da busca `link` em paralelo.
+        `on_page(pagina, url, html)` é chamado na thread de `run` (html None em caso de falha).
+        `fetch` substitui, só nesta execução, a função de download (ex.: para respeitar a pausa de um job).
+        """
+        jobs = [(page, page_url(link, page, per_page)) for page in pages]
+        engine = DownloadEngine(
+            fetch or self.fetch, max_workers=self.max_workers, per_domain=self.per_host, is_blocked=self.is_blocked
+        )
+        return engine.run(jobs, on_page, on_progress, should_stop=should_stop)
@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from parsers.base_parser import parse_document
+
+# Fábrica de parsers de cada processo trabalhador (criada uma vez por processo)
+_worker_factory = None
+
+
+def _init_worker():
+    global _worker_factory
+    from services.parser_factory import ParserFactory
+    _worker_factory = ParserFactory()
+
+
+def _parse_batch(batch):
+    """Executa os parsers sobre um lote de (id, link, html) dentro do processo trabalhador."""
+    if _worker_factory is None:
+        _init_worker()
+
+    results = []
+    # Hosts do lote resolvidos uma vez (lotes costumam vir do mesmo repositório)
+    routes = _worker_factory.route_domains(link for _, link, _ in batch)
+    for res_id, link, html in batch:
+        try:
+            parser = _worker_factory.get_parser(link, html_content=html, routes=routes)
+            # Cada página é analisada uma única vez, mesmo em parsers com herança
+            results.append((res_id, parser.extract_pure_soup(parse_document(html), link), None))
+        except Exception as e:
+            results.append((res_id, None, str(e)))
+    return results
+
+
+class ParseEngine:
+    """
+    Estágio de parsing em múltiplos processos.
+
+    O BeautifulSoup é limitado por CPU, então os lotes de páginas são
+    distribuídos entre processos (contornando o GIL). Os resultados voltam
+    para a thread que chamou `run`, que é a única a gravar no banco.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+
+    def run(self, batches, on_results, on_progress=None):
+        """
+        `batches`: iterável (pode ser um gerador) de listas (id, link, html).
+        `on_results(lista)` recebe tuplas (id, dados, erro) de cada lote concluído.
+        `on_progress(processados)` é chamado após cada lote.
+        Retorna o total de registros processados.
+        """
+        processed = 0
+
+        # Um único processo: executa no próprio processo (útil para depuração)
+        if self.max_workers == 1:
+            for batch in batches:
+                results = _parse_batch(batch)
+                processed += len(results)
+                on_results(results)
+                if on_progress:
+                    on_progress(processed)
+            return processed
+
+        # Limita os lotes em trânsito para manter a memória estável
+        max_in_flight = self.max_workers * 2
+        futures = set()
+
+        def drain(return_when):
+            nonlocal processed
+            done, _ = wait(futures, return_when=return_when)
+            for future in done:
+                futures.discard(future)
+                results = future.result()
+                processed += len(results)
+                on_results(results)
+                if on_progress:
+                    on_progress(processed)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as pool:
+            for batch in batches:
+                if not batch:
+                    continue
+                while len(futures) >= max_in_flight:
+                    drain(FIRST_COMPLETED)
+                futures.add(pool.submit(_parse_batch, batch))
+
+            while futures:
+                drain(FIRST_COMPLETED)
+
+        return processed
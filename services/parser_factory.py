@@ -1,3 +1,8 @@
+import re
+from urllib.parse import urlparse
+from parsers.bdtd_parser import BDTDParser
+from parsers.unipe_parser import UNIPEParser
+from parsers.udf_parser import UDFParser
 from parsers.unifg_parser import UNIFGParser
 from parsers.generic_parser import GenericParser
 from parsers.ufop_parser import UfopParser
@@ -67,7 +72,16 @@ from parsers.uem_parser import UEMParser
 from parsers.ufmt_parser import UfmtParser
 from parsers.uepg_parser import UEPGParser
 
+# Marcas procuradas no HTML sem precisar converter a página inteira de caixa
+VUFIND_PATTERN = re.compile(r"vufind", re.IGNORECASE)
+UNIPE_PATTERN = re.compile(r"UNIPÊ|JOÃO PESSOA", re.IGNORECASE)
+UDF_PATTERN = re.compile(r"UDF|DISTRITO FEDERAL", re.IGNORECASE)
+
+
 class ParserFactory:
+    # Incrementar ao mudar as regras de escolha do parser (invalida o cache de extrações)
+    VERSION = 1
+
     def __init__(self):
         self._default = GenericParser()
         # Mapeamento URL/Handle -> Classe
@@ -157,37 +171,143 @@ class ParserFactory:
             'hdl.handle.net/20.500.12733': UnicampParser,
         }
 
-    def get_parser(self, url, html_content=None):
+        # Instâncias reaproveitadas (um parser por classe)
+        self._instances = {}
+        self._build_index()
+
+    # --- Índice de rotas ---
+
+    def _build_index(self):
+        """
+        Compila o `_map` em estruturas de busca:
+        - `_hosts`: sufixo de host -> classe (percorrido rótulo a rótulo);
+        - `_prefixes`: host -> [(prefixo de caminho, classe)] (handles, ex.: hdl.handle.net/1843);
+        - `_segments`: segmento de caminho -> classe (ex.: '/fdv/');
+        - `_fragments`: chaves que não se encaixam acima (busca por substring).
+        """
+        self._hosts = {}
+        self._prefixes = {}
+        self._segments = {}
+        self._fragments = []
+
+        for key, parser_cls in self._map.items():
+            key = key.lower()
+            if key.startswith('/') and key.endswith('/') and key.count('/') == 2:
+                self._segments.setdefault(key.strip('/'), parser_cls)
+                continue
+
+            host, _, path = key.lstrip('.').partition('/')
+            if '.' not in host:
+                self._fragments.append((key, parser_cls))
+            elif path:
+                self._prefixes.setdefault(host, []).append(('/' + path.strip('/'), parser_cls))
+            else:
+                self._hosts.setdefault(host, parser_cls)
+
+        # Prefixo mais longo primeiro
+        for entries in self._prefixes.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+    @staticmethod
+    def _split_url(url):
+        try:
+            parsed = urlparse(url if '//' in url else '//' + url)
+            return (parsed.hostname or '').lower(), parsed.path.lower()
+        except ValueError:
+            return '', ''
+
+    def _host_route(self, host):
+        """(prefixos de handle/caminho do host, classe do sufixo de host mais específico ou None)."""
+        # Do host completo ao domínio registrado: o primeiro encontrado é o mais específico
+        labels = host.split('.')
+        host_cls = None
+        for i in range(len(labels) - 1):
+            host_cls = self._hosts.get('.'.join(labels[i:]))
+            if host_cls:
+                break
+        return self._prefixes.get(host, ()), host_cls
+
+    def route_domains(self, urls):
+        """
+        Pré-roteia os hosts de vários endereços de uma vez: {host: (prefixos, classe do host)}.
+        Cada host é resolvido uma única vez; o resultado é passado a `route`/`get_parser`
+        (parâmetro `routes`), que ainda aplica por URL os prefixos de handle do host.
+        """
+        routes = {}
+        for url in urls:
+            host, _ = self._split_url(url or '')
+            if host not in routes:
+                routes[host] = self._host_route(host)
+        return routes
+
+    def route(self, url, routes=None):
+        """
+        Retorna a classe de parser da URL (ou None) com semântica de prefixo mais longo:
+        prefixo de handle/caminho > sufixo de host > segmento de caminho.
+        `routes` (de `route_domains`) evita refazer a busca do host a cada URL.
+        """
+        if not url:
+            return None
+        host, path = self._split_url(url)
+        host_route = routes.get(host) if routes is not None else None
+        prefixes, host_cls = host_route or self._host_route(host)
+
+        for prefix, parser_cls in prefixes:
+            if path == prefix or path.startswith(prefix + '/'):
+                return parser_cls
+        if host_cls:
+            return host_cls
+
+        for segment in path.split('/'):
+            parser_cls = self._segments.get(segment)
+            if parser_cls:
+                return parser_cls
+
+        url_lower = url.lower()
+        for fragment, parser_cls in self._fragments:
+            if fragment in url_lower:
+                return parser_cls
+        return None
+
+    @staticmethod
+    def parser_name(parser_cls):
+        return f"{parser_cls.__module__}.{parser_cls.__qualname__}"
+
+    def parser_versions(self):
+        """{nome do parser: VERSION} de todas as classes que get_parser pode escolher."""
+        classes = set(self._map.values()) | {BDTDParser, UNIPEParser, UDFParser, type(self._default)}
+        return {self.parser_name(parser_cls): parser_cls.VERSION for parser_cls in classes}
+
+    def _instance(self, parser_cls):
+        parser = self._instances.get(parser_cls)
+        if parser is None:
+            parser = self._instances[parser_cls] = parser_cls()
+        return parser
+
+    def get_parser(self, url, html_content=None, routes=None):
         """
         Seleciona o parser adequado. Prioriza o BDTDParser se o HTML for do buscador VuFind.
+        Em lotes, `routes` vem de `route_domains` com os hosts do lote já resolvidos.
         """
         if not url: 
             return self._default
         
         url_lower = url.lower()
-        html_lower = html_content.lower() if html_content else ""
 
         # PRIORIDADE: Detecção de Buscador (VuFind/BDTD)
         # Verifica se o HTML possui a marca do sistema VuFind ou se a URL é do IBICT
-        if "vufind" in html_lower or "bdtd.ibict.br" in url_lower:
-            from parsers.bdtd_parser import BDTDParser
-            return BDTDParser()
+        if "bdtd.ibict.br" in url_lower or (html_content and VUFIND_PATTERN.search(html_content)):
+            return self._instance(BDTDParser)
 
         # Lógica para Repositórios Compartilhados (Cruzeiro do Sul / UDF / UNIPÊ)
         if "repositorio.cruzeirodosul.edu.br" in url_lower:
             if html_content:
-                html_upper = html_content.upper()
-                if "UNIPÊ" in html_upper or "JOÃO PESSOA" in html_upper:
-                    from parsers.unipe_parser import UNIPEParser
-                    return UNIPEParser()
-                if "UDF" in html_upper or "DISTRITO FEDERAL" in html_upper:
-                    from parsers.udf_parser import UDFParser
-                    return UDFParser()
+                if UNIPE_PATTERN.search(html_content):
+                    return self._instance(UNIPEParser)
+                if UDF_PATTERN.search(html_content):
+                    return self._instance(UDFParser)
             return self._default
 
         # Lógica Padrão por Domínio/Handle
-        for domain, parser_cls in self._map.items():
-            if domain in url_lower:
-                return parser_cls()
-        
-        return self._default    
\ No newline at end of file
+        parser_cls = self.route(url, routes)
+        return self._instance(parser_cls) if parser_cls else self._default
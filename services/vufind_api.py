@@ -0,0 +1,184 @@
+import math
+import re
+import time
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from models.web_scraper import get_shared_session
+
+# Configuração padrão do cliente da API REST do VuFind
+VUFIND_API_CONFIG = {
+    'page_size': 100,     # Máximo de registros por página aceito pela API
+    'timeout': 15,
+}
+
+# Campos pedidos à API: apenas o necessário para a aba de Pesquisas
+SEARCH_FIELDS = ("id", "title", "authors", "institutions", "urls")
+RECORD_FIELDS = SEARCH_FIELDS + ("rawData",)
+
+_RECORD_ID = re.compile(r"/Record/([^/?#]+)")
+
+
+class VuFindApiClient:
+    """
+    Cliente das rotas /api/v1/search e /api/v1/record do VuFind.
+
+    Devolve os dados já estruturados em JSON, em páginas grandes, sem baixar
+    nem analisar o HTML renderizado. Qualquer falha (API desativada, erro de
+    rede, JSON inválido) retorna None para que o chamador use o scraping de
+    HTML; um host cuja API não existe é lembrado e não é consultado de novo.
+    """
+
+    def __init__(self, session=None, throttle=None, page_size=None, timeout=None):
+        self.session = session or get_shared_session()
+        self.throttle = throttle
+        self.page_size = page_size or VUFIND_API_CONFIG['page_size']
+        self.timeout = timeout or VUFIND_API_CONFIG['timeout']
+        self._unavailable = set()
+
+    @staticmethod
+    def api_base(url):
+        """Raiz da API a partir de uma URL de busca ou registro (ex.: .../vufind/api/v1)."""
+        parsed = urlparse(url)
+        prefix = re.split(r"/(?:Search|Record)\b", parsed.path, maxsplit=1)[0].rstrip("/")
+        return urlunparse((parsed.scheme, parsed.netloc, f"{prefix}/api/v1", "", "", ""))
+
+    @staticmethod
+    def record_id(url):
+        match = _RECORD_ID.search(url or "")
+        return match.group(1) if match else None
+
+    def available(self, url):
+        return urlparse(url).netloc not in self._unavailable
+
+    def search(self, search_url, page=1):
+        """
+        Executa a busca de `search_url` (mesmos parâmetros da página de resultados)
+        e retorna (total, registros) da página pedida, ou None se a API falhar.
+        """
+        params = [(k, v) for k, v in parse_qsl(urlparse(search_url).query, keep_blank_values=True)
+                  if k not in ("page", "limit")]
+        params += [("field[]", field) for field in SEARCH_FIELDS]
+        params += [("limit", str(self.page_size)), ("page", str(page))]
+        data = self._get(search_url, "search", params)
+        if data is None:
+            return None
+        return int(data.get("resultCount") or 0), data.get("records") or []
+
+    def iter_search(self, search_url, should_stop=None):
+        """
+        Percorre todas as páginas da busca, gerando (pagina, total_paginas, registros).
+        Levanta LookupError se a primeira página não vier da API (use o fallback em HTML).
+        """
+        first = self.search(search_url, 1)
+        if first is None:
+            raise LookupError("API do VuFind indisponível")
+        total, records = first
+        total_pages = max(1, math.ceil(total / self.page_size))
+        yield 1, total_pages, records
+
+        for page in range(2, total_pages + 1):
+            if should_stop and should_stop():
+                return
+            result = self.search(search_url, page)
+            if result is None:
+                raise LookupError(f"Falha na página {page} da API do VuFind")
+            yield page, total_pages, result[1]
+
+    def record(self, record_url):
+        """Registro completo (inclui rawData) a partir da URL /Record/<id>, ou None."""
+        rid = self.record_id(record_url)
+        if not rid:
+            return None
+        params = [("id", rid)] + [("field[]", field) for field in RECORD_FIELDS]
+        data = self._get(record_url, "record", params)
+        records = (data or {}).get("records") or []
+        return records[0] if records else None
+
+    def _get(self, url, route, params):
+        domain = urlparse(url).netloc
+        if domain in self._unavailable:
+            return None
+        if self.throttle:
+            if not self.throttle.allow(domain):
+                return None
+            self.throttle.acquire(domain)
+
+        started = time.monotonic()
+        try:
+            response = self.session.get(
+                f"{self.api_base(url)}/{route}", params=urlencode(params, safe="[]"),
+                headers={"Accept": "application/json"}, timeout=self.timeout, verify=False
+            )
+        except Exception:
+            self._record(domain, started, error=True)
+            return None
+        self._record(domain, started, response.status_code)
+
+        try:
+            data = response.json()
+        except ValueError:
+            # HTML (ou nada) no lugar do JSON: a rota da API não existe neste VuFind.
+            # Erros 5xx sem JSON são falhas momentâneas e não desativam o host.
+            if response.status_code in (200, 404, 405, 501):
+                self._unavailable.add(domain)
+            return None
+        # Erro em JSON (registro inexistente, filtro inválido): falha só desta requisição
+        if response.status_code != 200 or not isinstance(data, dict) or data.get("status", "OK") != "OK":
+            return None
+        return data
+
+    def _record(self, domain, started, status_code=None, error=False):
+        if self.throttle and domain:
+            self.throttle.record(domain, time.monotonic() - started, status_code, error)
+
+    # --- Conversão para o formato das tabelas ---
+
+    @staticmethod
+    def authors_of(record):
+        authors = record.get("authors") or {}
+        for role in ("primary", "corporate", "secondary"):
+            names = authors.get(role) if isinstance(authors, dict) else None
+            if names:
+                return "; ".join(names.keys() if isinstance(names, dict) else names)
+        return "-"
+
+    @staticmethod
+    def access_link(record):
+        for link in record.get("urls") or []:
+            url = link.get("url") if isinstance(link, dict) else link
+            if url:
+                return url
+        return "-"
+
+    def to_research_row(self, record, search_url):
+        """(titulo, autor, link_buscador, link_repositorio) no formato dos cards da busca."""
+        base = self.api_base(search_url).rsplit("/api/v1", 1)[0]
+        return (
+            record.get("title") or "-",
+            self.authors_of(record),
+            f"{base}/Record/{record.get('id')}",
+            self.access_link(record),
+        )
+
+    def to_details(self, record):
+        """Sigla, universidade, programa e link de acesso de um registro (como o BDTDParser)."""
+        raw = record.get("rawData") or {}
+        institutions = record.get("institutions") or []
+
+        def first(*keys):
+            for key in keys:
+                value = raw.get(key)
+                if isinstance(value, list):
+                    value = value[0] if value else None
+                if value:
+                    return str(value).strip()
+            return None
+
+        programa = next(
+            (first(key) for key in sorted(raw) if "program" in key.lower() and first(key)), None
+        )
+        return {
+            'sigla': first("network_acronym_str", "institution_acronym_str") or "-",
+            'universidade': first("network_name_str", "institution") or (institutions[0] if institutions else "-"),
+            'programa': programa or "-",
+            'link_pdf': self.access_link(record),
+        }
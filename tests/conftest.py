@@ -0,0 +1,60 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import pytest
+
+
+class FixtureServer:
+    """
+    Servidor HTTP local em uma thread. `respond(path, query)` devolve
+    (status, content_type, corpo[, cabeçalhos]) para cada GET; as requisições ficam em `requests`.
+    Com `with_headers`, os cabeçalhos da requisição vão como terceiro argumento de `respond`.
+    """
+
+    def __init__(self, respond, with_headers=False):
+        self.respond = respond
+        self.with_headers = with_headers
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query, keep_blank_values=True)
+                server.requests.append((parsed.path, query))
+                args = (parsed.path, query, self.headers) if server.with_headers else (parsed.path, query)
+                status, content_type, body, *extra = server.respond(*args)
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                for name, value in (extra[0] if extra else {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def fixture_server():
+    """Fábrica de servidores locais: fixture_server(respond[, with_headers]) -> FixtureServer."""
+    servers = []
+
+    def start(respond, with_headers=False):
+        server = FixtureServer(respond, with_headers)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,54 @@
+import sqlite3
+from models.db_handler import DatabaseHandler
+from models.blob_store import REF_INDEXES
+
+
+def blob_count(db):
+    return db.conn.execute("SELECT COUNT(*) FROM html_blobs").fetchone()[0]
+
+
+def test_reference_indexes_skip_legacy_html(tmp_path):
+    path = str(tmp_path / "legado.db")
+    db = DatabaseHandler(path)
+    db.close()
+    # Banco ainda não migrado: HTML bruto direto na coluna
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO paginas_busca (engine, termo, ano, pagina, html_source, link_busca) VALUES (?, ?, ?, ?, ?, ?)",
+        ("BDTD", "x", "2020", 1, "<html>" + "a" * 5000 + "</html>", "l")
+    )
+    conn.commit()
+    conn.close()
+
+    db = DatabaseHandler(path)
+    try:
+        for name, _, column in REF_INDEXES:
+            sql = db.conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone()[0]
+            assert sql.endswith(f"WHERE {column} LIKE 'blob:%'")
+        # O HTML legado não entra no índice parcial
+        indexed = db.conn.execute(
+            "SELECT COUNT(*) FROM paginas_busca INDEXED BY idx_paginas_busca_blob WHERE html_source LIKE 'blob:%'"
+        ).fetchone()[0]
+        assert indexed == 0
+    finally:
+        db.close()
+
+
+def test_release_keeps_shared_blobs(tmp_path):
+    db = DatabaseHandler(str(tmp_path / "database.db"))
+    try:
+        db.insert_scrape("BDTD", "x", "2020", 1, "<html>igual</html>", "l1")
+        db.insert_scrape("BDTD", "x", "2020", 2, "<html>igual</html>", "l2")
+        db.insert_scrape("BDTD", "x", "2020", 3, "<html>única</html>", "l3")
+        assert blob_count(db) == 2
+
+        page_ids = db.get_search_page_ids("BDTD", "x", "2020")
+        db.delete_scrape(page_ids[0])
+        assert blob_count(db) == 2
+        db.delete_scrape(page_ids[2])
+        assert blob_count(db) == 1
+        # Recaptura com outro conteúdo libera o blob antigo na mesma transação
+        db.insert_scrape("BDTD", "x", "2020", 2, "<html>nova</html>", "l2")
+        assert blob_count(db) == 1
+    finally:
+        db.close()
@@ -0,0 +1,74 @@
+import threading
+from models.browser_pool import BrowserPool, _PooledBrowser
+
+
+class FakeDriver:
+    def __init__(self):
+        self.dead = False
+        self.quit_called = False
+
+    @property
+    def title(self):
+        if self.dead:
+            raise ConnectionRefusedError("driver morto")
+        return ""
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakePool(BrowserPool):
+    def __init__(self, **kwargs):
+        super().__init__("msedgedriver", "agente", **kwargs)
+        self.drivers = []
+
+    def _new_browser(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return _PooledBrowser(driver)
+
+
+def checkout_in_thread(pool):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('browser', pool.checkout()), daemon=True)
+    thread.start()
+    return thread, result
+
+
+def test_recycled_browser_wakes_a_waiting_checkout():
+    pool = FakePool(size=1, max_pages=1)
+    first = pool.checkout()
+    thread, result = checkout_in_thread(pool)
+    thread.join(0.2)
+    assert thread.is_alive()  # pool cheio: espera
+
+    pool.checkin(first)  # atingiu max_pages: descartado, vaga liberada
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert result['browser'].driver is pool.drivers[1]
+    assert pool.drivers[0].quit_called
+
+
+def test_broken_browser_wakes_a_waiting_checkout():
+    pool = FakePool(size=1, max_pages=50)
+    thread, result = None, None
+    try:
+        with pool.browser():
+            thread, result = checkout_in_thread(pool)
+            thread.join(0.2)
+            raise ValueError("falha no download")
+    except ValueError:
+        pass
+    thread.join(5)
+    assert not thread.is_alive()
+    assert result['browser'].driver is pool.drivers[1]
+
+
+def test_dead_idle_browser_is_replaced():
+    pool = FakePool(size=1, max_pages=50)
+    browser = pool.checkout()
+    pool.checkin(browser)
+    pool.drivers[0].dead = True
+
+    assert pool.checkout(timeout=1).driver is pool.drivers[1]
@@ -0,0 +1,64 @@
+import json
+import os
+from types import SimpleNamespace
+import pytest
+import cli
+
+
+def fake_vm(summary):
+    return SimpleNamespace(db=SimpleNamespace(get_job_summary=lambda job_id: summary))
+
+
+@pytest.mark.parametrize("estado, falha, pendente, expected", [
+    ("concluido", 0, 0, cli.EXIT_OK),
+    ("concluido", 2, 0, cli.EXIT_PARTIAL),
+    # Itens adiados pelo disjuntor: o job segue 'executando' para ser retomado
+    ("executando", 0, 3, cli.EXIT_PARTIAL),
+    ("pausado", 0, 3, cli.EXIT_INTERRUPTED),
+    ("cancelado", 0, 0, cli.EXIT_INTERRUPTED),
+])
+def test_job_result_exit_codes(capsys, estado, falha, pendente, expected):
+    summary = {'estado': estado, 'total': 5, 'ok': 5 - falha - pendente, 'falha': falha, 'pendente': pendente}
+
+    assert cli.job_result(fake_vm(summary), 'download', 7) == expected
+    event = json.loads(capsys.readouterr().out)
+    assert event['exit_code'] == expected and event['pendente'] == pendente
+
+
+def test_db_option_keeps_the_http_cache_next_to_the_database(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "dados"
+    data_dir.mkdir()
+
+    assert cli.main(["--db", str(data_dir / "outro.db"), "parse"]) == cli.EXIT_OK
+    assert os.path.exists(data_dir / "http_cache.db")
+    assert not os.path.exists(tmp_path / "http_cache.db")
+
+
+def create_job(db_path, kind, owner=None):
+    from models.db_handler import DatabaseHandler
+    db = DatabaseHandler(str(db_path))
+    try:
+        return db.create_job(kind, [1, 2], owner=owner)
+    finally:
+        db.close()
+
+
+def test_resuming_a_job_of_another_kind_is_a_usage_error(tmp_path, monkeypatch, capsys):
+    from services.job_control import JOB_KIND_PARSE
+    monkeypatch.chdir(tmp_path)
+    job_id = create_job(tmp_path / "database.db", JOB_KIND_PARSE)
+
+    assert cli.main(["download", "--job", str(job_id)]) == cli.EXIT_USAGE
+    event = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert event['event'] == 'error' and JOB_KIND_PARSE in event['message']
+
+
+def test_job_owned_by_a_live_process_is_not_resumed(tmp_path, monkeypatch, capsys):
+    from services.job_control import JOB_KIND_PARSE
+    monkeypatch.chdir(tmp_path)
+    job_id = create_job(tmp_path / "database.db", JOB_KIND_PARSE, owner="outro-processo")
+
+    assert cli.main(["parse", "--job", str(job_id)]) == cli.EXIT_ERROR
+    event = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert event['event'] == 'error' and "outro processo" in event['message']
@@ -0,0 +1,30 @@
+from services.domain_throttle import DomainThrottle, BREAKER_CLOSED, BREAKER_OPEN
+
+
+def open_breaker(throttle, domain):
+    for _ in range(throttle.failure_threshold):
+        throttle.record(domain, 0.1, error=True)
+    assert throttle._state(domain).breaker == BREAKER_OPEN
+
+
+def test_browser_success_closes_the_breaker_without_touching_the_rate():
+    throttle = DomainThrottle(cooldown=0.0)
+    domain = "repositorio.exemplo.br"
+    throttle.record(domain, 0.5, 200)
+    open_breaker(throttle, domain)
+    rate = throttle._state(domain).rate
+    assert throttle.allow(domain)  # cool-down zerado: requisição de teste
+    # Sucesso via navegador (dezenas de segundos) sem latência do servidor
+    throttle.record(domain, None, 200)
+
+    state = throttle._state(domain)
+    assert state.breaker == BREAKER_CLOSED
+    assert state.rate == rate
+
+
+def test_slow_responses_still_halve_the_rate():
+    throttle = DomainThrottle()
+    domain = "lento.exemplo.br"
+    rate = throttle._state(domain).rate
+    throttle.record(domain, throttle.target_latency + 1, 200)
+    assert throttle._state(domain).rate == max(throttle.min_rate, rate / 2)
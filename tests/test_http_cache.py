@@ -0,0 +1,55 @@
+import pytest
+
+PAGE = "<html><head><title>Item {n}</title></head><body>" + "conteúdo " * 30 + "</body></html>"
+
+
+def repository(path, query, headers):
+    """Repositório com ETag por item: If-None-Match igual devolve 304 sem corpo."""
+    if not path.startswith("/handle/123/"):
+        return 404, "text/html", "<html>Not found</html>"
+    n = path.rsplit("/", 1)[-1]
+    etag = f'"item-{n}-v1"'
+    if headers.get("If-None-Match") == etag:
+        return 304, "text/html", "", {"ETag": etag}
+    return 200, "text/html; charset=utf-8", PAGE.format(n=n), {"ETag": etag}
+
+
+@pytest.fixture
+def vm(tmp_path, monkeypatch, fixture_server):
+    from viewmodels.main_vm import MainViewModel
+
+    monkeypatch.chdir(tmp_path)
+    statuses = []
+
+    def respond(path, query, headers):
+        status, *rest = repository(path, query, headers)
+        statuses.append(status)
+        return (status, *rest)
+
+    server = fixture_server(respond, with_headers=True)
+    server.statuses = statuses
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    vm.db.insert_extracted_data([
+        (f"Tese {n}", "A", "-", f"{server.url}/handle/123/{n}", None, "t", "2024") for n in (1, 2)
+    ])
+    vm.server = server
+    yield vm
+    vm.db.close()
+
+
+def test_refresh_batch_revalidates_stored_pages(vm):
+    messages = []
+    vm.run_download_batch(messages.append, max_workers=1)
+    assert len(vm.server.requests) == 2
+
+    # Sem refresh, registros com HTML ficam fora do lote
+    assert vm.run_download_batch(messages.append) is None
+    assert len(vm.server.requests) == 2
+
+    job_id = vm.run_download_batch(messages.append, max_workers=1, refresh=True)
+
+    assert vm.server.statuses == [200, 200, 304, 304]
+    assert vm.db.get_job_summary(job_id)['ok'] == 2
+    # Respostas 304: o corpo salvo no cache é regravado sem ter sido baixado de novo
+    for res_id, n in vm.db.conn.execute("SELECT id, substr(titulo, 6) FROM pesquisas_extraidas"):
+        assert vm.db.get_html_repositorio(res_id) == PAGE.format(n=n)
@@ -0,0 +1,60 @@
+import time
+from datetime import datetime
+import pytest
+from models.db_handler import DatabaseHandler
+from services import job_control
+from services.job_control import JobControl, JobBusyError, stale_cutoff, JOB_KIND_DOWNLOAD, JOB_KIND_PARSE
+
+
+@pytest.fixture
+def db(tmp_path):
+    handler = DatabaseHandler(str(tmp_path / "database.db"))
+    yield handler
+    handler.close()
+
+
+def test_only_stale_or_released_jobs_are_resumable(db):
+    # Último heartbeat do dono antigo antes do corte; os demais depois dele
+    stale = db.create_job(JOB_KIND_DOWNLOAD, [1], owner="gui-antiga")
+    time.sleep(0.01)
+    cutoff = datetime.now()
+    live = db.create_job(JOB_KIND_DOWNLOAD, [2], owner="cli")
+    released = db.create_job(JOB_KIND_PARSE, [3], owner="cli")
+    db.release_job(released, "cli")
+
+    resumable = [job_id for job_id, *_ in db.get_unfinished_jobs(stale_before=cutoff)]
+    assert resumable == [stale, released]
+    # Sem filtro (ex.: relatório do Ctrl+C na linha de comando), todos aparecem
+    assert [job_id for job_id, *_ in db.get_unfinished_jobs()] == [stale, live, released]
+
+    assert not db.claim_job(live, "gui", cutoff)
+    assert db.claim_job(live, "cli", cutoff)
+    assert db.claim_job(stale, "gui", cutoff)
+
+
+def test_heartbeat_keeps_the_job_owned_until_closed(db, monkeypatch):
+    monkeypatch.setitem(job_control.JOB_CONFIG, 'heartbeat_interval', 0.05)
+    job_id = db.create_job(JOB_KIND_PARSE, [1], owner="cli")
+    job = JobControl(db, job_id, JOB_KIND_PARSE, owner="cli")
+    # Renovado pela thread do heartbeat: continua vivo mesmo com uma janela curta
+    monkeypatch.setitem(job_control.JOB_CONFIG, 'stale_after', 0.5)
+    time.sleep(0.6)
+    assert db.get_unfinished_jobs(stale_before=stale_cutoff()) == []
+
+    job.close()
+    assert [job_id for job_id, *_ in db.get_unfinished_jobs(stale_before=stale_cutoff())] == [job_id]
+
+
+def test_vm_rejects_a_job_of_another_kind(tmp_path, monkeypatch):
+    from viewmodels.main_vm import MainViewModel
+    monkeypatch.chdir(tmp_path)
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    try:
+        job_id = vm.db.create_job(JOB_KIND_PARSE, [1])
+        with pytest.raises(ValueError):
+            vm.run_download_batch(job_id=job_id)
+        other = vm.db.create_job(JOB_KIND_PARSE, [1], owner="outro")
+        with pytest.raises(JobBusyError):
+            vm.run_parser_batch(job_id=other)
+    finally:
+        vm.db.close()
@@ -0,0 +1,218 @@
+import threading
+import pytest
+from services.oai_harvester import OaiHarvester, OaiError
+
+HEAD = '<?xml version="1.0" encoding="UTF-8"?><OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+TAIL = '</OAI-PMH>'
+
+DIM_RECORD = """
+<record><header><identifier>oai:repositorio.exemplo.br:123/1</identifier>
+<datestamp>2024-03-01T10:00:00Z</datestamp></header>
+<metadata><dim:dim xmlns:dim="http://www.dspace.org/xmlns/dspace/dim">
+<dim:field mdschema="dc" element="identifier" qualifier="uri">http://hdl.handle.net/123/1</dim:field>
+<dim:field mdschema="dc" element="publisher" qualifier="initials">UFX</dim:field>
+<dim:field mdschema="dc" element="publisher" qualifier="institution">Universidade X</dim:field>
+<dim:field mdschema="dc" element="publisher" qualifier="program">Programa de Pós-Graduação em Educação</dim:field>
+<dim:field mdschema="dc" element="identifier">{base}/bitstream/123/1/tese.pdf</dim:field>
+</dim:dim></metadata></record>
+"""
+
+# xoai do DSpace: schema/elemento[/qualificador]/idioma/field; "uri" e "por" não são idiomas
+XOAI_RECORD = """
+<record><header><identifier>oai:repositorio.exemplo.br:123/2</identifier>
+<datestamp>2024-05-20T08:30:00Z</datestamp></header>
+<metadata><metadata xmlns="http://www.lyncode.com/xoai">
+<element name="dc">
+  <element name="title"><element name="pt_BR"><field name="value">Tese xoai</field></element></element>
+  <element name="identifier"><element name="uri">
+    <element name="none"><field name="value">{base}/handle/123/2</field></element></element></element>
+  <element name="publisher">
+    <element name="initials"><element name="none"><field name="value">UFY</field></element></element>
+    <element name="program"><element name="pt_BR"><field name="value">Programa de Pós-Graduação em Letras</field></element></element>
+    <element name="por"><field name="value">Editora Y</field></element>
+  </element>
+  <element name="subject"><element name="uri"><field name="value">http://vocab.exemplo/1</field></element></element>
+</element>
+<element name="bundles"><element name="bundle"><field name="name">ORIGINAL</field>
+  <element name="bitstreams"><element name="bitstream">
+    <field name="url">{base}/bitstream/123/2/dissertacao.pdf</field></element></element></element></element>
+</metadata></metadata></record>
+"""
+
+DELETED_RECORD = """
+<record><header status="deleted"><identifier>oai:repositorio.exemplo.br:123/3</identifier>
+<datestamp>2024-06-01T00:00:00Z</datestamp></header></record>
+"""
+
+
+def oai_error(code):
+    return 200, "text/xml", f'{HEAD}<error code="{code}">erro simulado</error>{TAIL}'
+
+
+def list_records(records, token):
+    body = "".join(records) + f"<resumptionToken>{token}</resumptionToken>"
+    return 200, "text/xml", f"{HEAD}<ListRecords>{body}</ListRecords>{TAIL}"
+
+
+def dspace_oai(base):
+    """
+    Provedor OAI de um DSpace: a primeira página (dim) aponta para a segunda (xoai)
+    pelo resumptionToken; tokens desconhecidos e datas futuras respondem com erro.
+    """
+    def respond(path, query):
+        if path != "/oai/request":
+            return 404, "text/html", "<html>Not found</html>"
+        verb = query["verb"][0]
+        if verb == "Identify":
+            return 200, "text/xml", f"{HEAD}<Identify><repositoryName>X</repositoryName></Identify>{TAIL}"
+        if verb == "ListMetadataFormats":
+            prefixes = "".join(f"<metadataFormat><metadataPrefix>{p}</metadataPrefix></metadataFormat>"
+                               for p in ("oai_dc", "xoai", "dim"))
+            return 200, "text/xml", f"{HEAD}<ListMetadataFormats>{prefixes}</ListMetadataFormats>{TAIL}"
+        token = query.get("resumptionToken", [None])[0]
+        if token == "pagina2":
+            return list_records([XOAI_RECORD.format(base=base), DELETED_RECORD], "")
+        if token is not None:
+            return oai_error("badResumptionToken")
+        if query.get("from", [""])[0] > "2024-12-31":
+            return oai_error("noRecordsMatch")
+        return list_records([DIM_RECORD.format(base=base)], "pagina2")
+    return respond
+
+
+@pytest.fixture
+def dspace(fixture_server):
+    holder = {}
+    server = fixture_server(lambda path, query: holder['respond'](path, query))
+    holder['respond'] = dspace_oai(server.url)
+    return server
+
+
+def test_list_records_follows_resumption_token(dspace):
+    harvester = OaiHarvester()
+    endpoint = harvester.discover(dspace.url.split("://", 1)[1], "http")
+    assert endpoint == f"{dspace.url}/oai/request"
+    assert harvester.pick_format(endpoint) == "dim"
+
+    pages = list(harvester.iter_pages(endpoint, "dim"))
+
+    assert [token for _, token in pages] == ["pagina2", None]
+    (dim,), (xoai, deleted) = [records for records, _ in pages]
+    assert deleted['deleted'] and not dim['deleted'] and not xoai['deleted']
+    assert OaiHarvester.join_keys(dim) == {"123/1"}
+    assert OaiHarvester.join_keys(xoai) == {"123/2"}
+    assert OaiHarvester.to_details(dim) == {
+        'sigla': "UFX", 'universidade': "Universidade X",
+        'programa': "Programa de Pós-Graduação em Educação",
+        'link_pdf': f"{dspace.url}/bitstream/123/1/tese.pdf",
+    }
+    assert OaiHarvester.to_details(xoai) == {
+        'sigla': "UFY", 'universidade': "-",
+        'programa': "Programa de Pós-Graduação em Letras",
+        'link_pdf': f"{dspace.url}/bitstream/123/2/dissertacao.pdf",
+    }
+    # Só o nó de idioma é removido da chave
+    assert xoai['fields']["dc.title"] == ["Tese xoai"]
+    assert xoai['fields']["dc.subject.uri"] == ["http://vocab.exemplo/1"]
+    assert xoai['fields']["dc.publisher.por"] == ["Editora Y"]
+
+    # A página seguinte pede apenas o token
+    assert dspace.requests[-1][1] == {"verb": ["ListRecords"], "resumptionToken": ["pagina2"]}
+
+
+def test_errors_from_the_provider(dspace):
+    harvester = OaiHarvester()
+    endpoint = f"{dspace.url}/oai/request"
+
+    assert list(harvester.iter_pages(endpoint, "dim", from_date="2025-01-01")) == []
+    with pytest.raises(OaiError) as error:
+        list(harvester.iter_pages(endpoint, "dim", token="expirado"))
+    assert error.value.code == "badResumptionToken"
+
+
+def bdtd_oai(path, query):
+    """OAI do VuFind da BDTD: identificadores oai:bdtd.ibict.br:<id do registro>."""
+    if path != "/vufind/OAI/Server":
+        return 404, "text/html", "<html>Not found</html>"
+    verb = query["verb"][0]
+    if verb == "Identify":
+        return 200, "text/xml", f"{HEAD}<Identify><repositoryName>BDTD</repositoryName></Identify>{TAIL}"
+    if verb == "ListMetadataFormats":
+        return 200, "text/xml", f"{HEAD}<ListMetadataFormats><metadataFormat><metadataPrefix>oai_dc" \
+                                f"</metadataPrefix></metadataFormat></ListMetadataFormats>{TAIL}"
+    record = """
+        <record><header><identifier>oai:bdtd.ibict.br:UFZ_abc</identifier>
+        <datestamp>2024-02-02T00:00:00Z</datestamp></header>
+        <metadata><oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/"
+            xmlns:dc="http://purl.org/dc/elements/1.1/">
+        <dc:publisher>Universidade Z</dc:publisher></oai_dc:dc></metadata></record>
+    """
+    return list_records([record], "")
+
+
+def test_harvest_restarts_after_bad_token_and_includes_the_search_engine(
+        fixture_server, dspace, tmp_path, monkeypatch):
+    from viewmodels.main_vm import MainViewModel
+
+    monkeypatch.chdir(tmp_path)
+    engine = fixture_server(bdtd_oai)
+    repo_domain = dspace.url.split("://", 1)[1]
+    engine_domain = engine.url.split("://", 1)[1]
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    try:
+        vm.db.insert_extracted_data([
+            ("Tese 1", "A", f"{engine.url}/vufind/Record/UFX_1", f"{dspace.url}/handle/123/1", None, "t", "2024"),
+            ("Tese 2", "B", f"{engine.url}/vufind/Record/UFY_2", f"{dspace.url}/handle/123/2", None, "t", "2024"),
+            ("Tese 3", "C", f"{engine.url}/vufind/Record/UFZ_abc", "-", None, "t", "2024"),
+        ])
+        # Coleta anterior interrompida com um token que o provedor já descartou
+        vm.db.save_oai_state(repo_domain, f"{dspace.url}/oai/request", "dim", None,
+                             "2024-01-01T00:00:00Z", "expirado")
+
+        finished = threading.Event()
+        messages = []
+
+        def on_status(message):
+            messages.append(message)
+            if "finalizada" in message or message.startswith("Erro"):
+                finished.set()
+
+        vm.harvest_oai_metadata(on_status, None)
+        assert finished.wait(30), messages
+
+        assert "Coleta OAI-PMH finalizada: 3 pesquisas atualizadas em 2 domínios." in messages
+        rows = vm.db.conn.execute(
+            "SELECT titulo, sigla_univ, nome_univ, programa, link_pdf FROM pesquisas_extraidas ORDER BY titulo"
+        ).fetchall()
+        assert rows[0] == ("Tese 1", "UFX", "Universidade X", "Programa de Pós-Graduação em Educação",
+                           f"{dspace.url}/bitstream/123/1/tese.pdf")
+        assert rows[1][:2] == ("Tese 2", "UFY") and rows[1][3] == "Programa de Pós-Graduação em Letras"
+        assert rows[2][2] == "Universidade Z"
+
+        # Recomeçou pelo último datestamp concluído e gravou o mais novo visto (registros apagados não contam)
+        assert {"verb": ["ListRecords"], "metadataPrefix": ["dim"], "from": ["2024-01-01"]} in \
+            [query for _, query in dspace.requests]
+        assert vm.db.get_oai_state(repo_domain) == (
+            f"{dspace.url}/oai/request", "dim", None, "2024-05-20T08:30:00Z", None)
+        assert vm.db.get_oai_state(engine_domain) == (
+            f"{engine.url}/vufind/OAI/Server", "oai_dc", None, "2024-02-02T00:00:00Z", None)
+    finally:
+        vm.db.close()
+
+
+def test_open_breaker_stops_the_harvest(dspace):
+    from services.domain_throttle import DomainThrottle
+    from services.oai_harvester import DOMAIN_PAUSED
+
+    throttle = DomainThrottle()
+    domain = dspace.url.split("://", 1)[1]
+    for _ in range(throttle.failure_threshold):
+        throttle.record(domain, 0.1, error=True)
+    harvester = OaiHarvester(throttle=throttle)
+
+    with pytest.raises(OaiError) as error:
+        harvester.discover(domain, "http")
+    assert error.value.code == DOMAIN_PAUSED
+    with pytest.raises(OaiError):
+        list(harvester.iter_pages(f"{dspace.url}/oai/request", "dim"))
+    assert dspace.requests == []
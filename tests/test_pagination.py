@@ -0,0 +1,48 @@
+from services.pagination_engine import parse_search_stats, page_url
+
+TOTAL = 7
+
+
+def test_stats_come_only_from_the_stats_block():
+    html = '<div class="search-stats">Mostrando <b>1</b> - <b>20</b> resultados de <b>1.234</b></div>'
+    assert parse_search_stats(html) == (1, 20, 1234)
+    # Sem o bloco, faixas nos cards (períodos, páginas) não são lidas como estatísticas
+    assert parse_search_stats("<p>Publicado 2019 - 2020 de 3 volumes</p>") is None
+    assert parse_search_stats(None) is None
+
+
+def search_results(path, query):
+    """VuFind com 7 resultados, `limit` itens por página."""
+    if path != "/vufind/Search/Results":
+        return 404, "text/html", "<html>Not found</html>"
+    limit, page = int(query.get("limit", ["20"])[0]), int(query.get("page", ["1"])[0])
+    first, last = (page - 1) * limit + 1, min(page * limit, TOTAL)
+    cards = "".join(f'<div class="result">Tese {i}</div>' for i in range(first, last + 1))
+    body = f'<html><div class="search-stats">Mostrando {first} - {last} resultados de {TOTAL}</div>{cards}</html>'
+    return 200, "text/html; charset=utf-8", body
+
+
+def test_larger_page_size_drops_stale_pages(fixture_server, tmp_path, monkeypatch):
+    from viewmodels.main_vm import MainViewModel
+
+    monkeypatch.chdir(tmp_path)
+    server = fixture_server(search_results)
+    link = f"{server.url}/vufind/Search/Results?lookfor=x&limit=3"
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    vm.pagination.page_size = 3
+    try:
+        vm.run_scrape(link, "x", "2020")
+        row_id = vm.get_history_ids(first_page_only=True)[0]
+        vm.run_pagination_batch([row_id], None)
+        assert sorted(vm.db.get_search_pages("BDTD", "x", "2020")) == [1, 2, 3]
+
+        # Com páginas de 5 itens a busca cabe em 2 páginas e a 3ª fica obsoleta
+        vm.pagination.page_size = 5
+        vm.run_pagination_batch([row_id], None)
+
+        pages = vm.db.get_search_pages("BDTD", "x", "2020")
+        assert sorted(pages) == [1, 2]
+        assert pages[2] == page_url(pages[1], 2, 5)
+        assert vm.db.conn.execute("SELECT COUNT(*) FROM html_blobs").fetchone()[0] == 2
+    finally:
+        vm.db.close()
@@ -0,0 +1,89 @@
+import pytest
+from parsers.bdtd_parser import BDTDParser
+from parsers.ufmg_parser import UfmgParser
+from parsers.base_parser import parse_document
+from services.parser_factory import ParserFactory
+
+# Página de repositório com a marca do VuFind: get_parser escolhe o BDTDParser pelo conteúdo
+HTML = "<html><head><title>Tese</title></head><body>" + "x" * 200 + \
+       '<footer>Powered by VuFind</footer><a href="arquivo.pdf">PDF</a></body></html>'
+LINKS = ("https://repositorio.ufmg.br/handle/1843/1", "https://repositorio.ufmg.br/handle/1843/2")
+
+
+@pytest.fixture
+def vm(tmp_path, monkeypatch):
+    from viewmodels.main_vm import MainViewModel
+
+    monkeypatch.chdir(tmp_path)
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    vm.db.insert_extracted_data([
+        (f"Tese {i}", "A", f"https://bdtd.ibict.br/vufind/Record/R{i}", link, None, "t", "2024")
+        for i, link in enumerate(LINKS)
+    ])
+    for res_id, link in vm.db.get_research_links_and_ids():
+        vm.db.update_html_repositorio(res_id, HTML)
+    yield vm
+    vm.db.close()
+
+
+def run_batch(vm):
+    messages = []
+    vm.run_parser_batch(messages.append, processes=1)
+    return messages[-1]
+
+
+def test_cache_follows_the_parser_the_worker_used(vm, monkeypatch):
+    assert "(0 reaproveitados do cache)" in run_batch(vm)
+
+    rows = vm.db.conn.execute("SELECT link, parser FROM cache_extracoes ORDER BY link").fetchall()
+    assert rows == [(link, ParserFactory.parser_name(BDTDParser)) for link in LINKS]
+
+    # Mesmo HTML em links diferentes: cada registro recebe os campos do próprio link
+    factory = ParserFactory()
+    for res_id, link in vm.db.conn.execute("SELECT id, link_repositorio FROM pesquisas_extraidas"):
+        expected = factory.get_parser(link, HTML).extract_pure_soup(parse_document(HTML), link)
+        stored = vm.db.conn.execute("SELECT link_pdf FROM pesquisas_extraidas WHERE id = ?", (res_id,)).fetchone()
+        assert stored[0] == expected['link_pdf']
+
+    # A versão do parser escolhido pelo link não invalida nada
+    monkeypatch.setattr(UfmgParser, "VERSION", UfmgParser.VERSION + 1)
+    assert "(2 reaproveitados do cache)" in run_batch(vm)
+
+    # A versão do parser que produziu o resultado invalida os dois registros
+    monkeypatch.setattr(BDTDParser, "VERSION", BDTDParser.VERSION + 1)
+    assert "(0 reaproveitados do cache)" in run_batch(vm)
+    assert "(2 reaproveitados do cache)" in run_batch(vm)
+
+
+def test_cached_result_is_not_reused_for_another_link(vm):
+    run_batch(vm)
+    # Página genérica com link relativo: o link do PDF é resolvido contra a URL do registro
+    html = '<html><body>' + "y" * 200 + '<a href="/bitstream/1/tese.pdf">tese.pdf</a></body></html>'
+    links = ("https://outro.exemplo.br/handle/9/1", "https://mais.exemplo.br/handle/9/2")
+
+    for i, link in enumerate(links):
+        vm.db.insert_extracted_data([(f"Genérica {i}", "B", f"https://bdtd.ibict.br/vufind/Record/G{i}",
+                                      link, None, "t", "2024")])
+        res_id = vm.db.conn.execute("SELECT id FROM pesquisas_extraidas WHERE link_repositorio = ?",
+                                    (link,)).fetchone()[0]
+        vm.db.update_html_repositorio(res_id, html)
+        run_batch(vm)
+
+    pdfs = dict(vm.db.conn.execute(
+        "SELECT link_repositorio, link_pdf FROM pesquisas_extraidas WHERE titulo LIKE 'Genérica%'"
+    ).fetchall())
+    assert pdfs == {
+        links[0]: "https://outro.exemplo.br/bitstream/1/tese.pdf",
+        links[1]: "https://mais.exemplo.br/bitstream/1/tese.pdf",
+    }
+
+
+def test_batch_restricted_to_the_given_ids(vm):
+    first, second = [row[0] for row in vm.db.conn.execute("SELECT id FROM pesquisas_extraidas ORDER BY id")]
+    messages = []
+
+    job_id = vm.run_parser_batch(messages.append, processes=1, ids=[second])
+
+    assert vm.db.get_job_summary(job_id)['total'] == 1
+    assert "1 registros atualizados" in messages[-1]
+    assert vm.run_parser_batch(messages.append, processes=1, ids=[]) is None
@@ -0,0 +1,64 @@
+import pytest
+from parsers.unb_parser import UnbParser
+from parsers.ufmg_parser import UfmgParser
+from parsers.unifesp_parser import UNIFESPParser
+from services.parser_factory import ParserFactory
+
+URLS = (
+    "https://hdl.handle.net/1843/123",        # prefixo de handle da UFMG
+    "https://hdl.handle.net/10482/9",         # prefixo de handle da UnB
+    "https://hdl.handle.net/99999/1",         # handle sem rota
+    "https://repositorio.ufmg.br/handle/1843/5",
+    "https://www.repositorio.unifesp.br/handle/11600/7",
+    "https://repositorio.exemplo.br/fdv/handle/1",
+    "https://repositorio.exemplo.br/handle/1",
+)
+
+
+def test_route_domains_resolves_each_host_once_and_keeps_prefix_rules():
+    factory = ParserFactory()
+    routes = factory.route_domains(URLS)
+
+    assert set(routes) == {"hdl.handle.net", "repositorio.ufmg.br", "www.repositorio.unifesp.br",
+                           "repositorio.exemplo.br"}
+    # Mesmo resultado de `route` URL a URL, inclusive os prefixos de handle de um mesmo host
+    assert [factory.route(url, routes) for url in URLS] == [factory.route(url) for url in URLS]
+    assert factory.route(URLS[0], routes) is UfmgParser
+    assert factory.route(URLS[1], routes) is UnbParser
+    assert factory.route(URLS[2], routes) is None
+    assert factory.route(URLS[4], routes) is UNIFESPParser
+
+
+def test_get_parser_with_routes_still_checks_the_content():
+    factory = ParserFactory()
+    routes = factory.route_domains(URLS)
+
+    assert isinstance(factory.get_parser(URLS[3], "<html></html>", routes), UfmgParser)
+    assert type(factory.get_parser(URLS[3], "<footer>VuFind</footer>", routes)).__name__ == "BDTDParser"
+    # Host fora do lote pré-roteado: resolvido na hora
+    assert isinstance(factory.get_parser("https://repositorio.unb.br/handle/1", routes=routes), UnbParser)
+
+
+def test_single_repository_scrape_uses_the_dspace_rest_api(tmp_path, monkeypatch):
+    import threading
+    from viewmodels.main_vm import MainViewModel
+
+    monkeypatch.chdir(tmp_path)
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    try:
+        url = "https://repositorio.ufscar.br/handle/20.500.14289/1"
+        document = "<html><body>" + "item montado pela API REST " * 10 + "</body></html>"
+        monkeypatch.setattr(vm.dspace, "item_document", lambda item_url: document)
+        monkeypatch.setattr(vm.scraper, "download_page", lambda *args, **kwargs: pytest.fail("download direto"))
+        vm.db.insert_extracted_data([("Tese", "A", "-", url, None, "t", "2024")])
+        res_id = vm.db.conn.execute("SELECT id FROM pesquisas_extraidas").fetchone()[0]
+
+        done = threading.Event()
+        statuses = []
+        vm.scrape_repositorio_link(res_id, url, lambda message: (statuses.append(message), done.set()), None)
+
+        assert done.wait(10)
+        assert statuses == ["HTML do Repositório salvo."]
+        assert vm.db.get_html_repositorio(res_id) == document
+    finally:
+        vm.db.close()
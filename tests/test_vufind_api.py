@@ -0,0 +1,137 @@
+import json
+import threading
+import pytest
+from services.vufind_api import VuFindApiClient
+from parsers.bdtd_parser import BDTD_BASE_URL
+
+TOTAL = 250
+
+
+def api_record(rid):
+    return {
+        "id": rid,
+        "title": f"Tese {rid}",
+        "authors": {"primary": {f"Autor {rid}": {}}},
+        "urls": [{"url": f"https://repositorio.exemplo.br/handle/1/{rid}"}],
+        "rawData": {"network_acronym_str": "UFX", "network_name_str": "Universidade X"},
+    }
+
+
+def vufind_api(path, query):
+    """VuFind com a API REST: 250 resultados, registro inexistente e filtro inválido."""
+    if path == "/vufind/api/v1/search":
+        if query.get("filter[]") == ["invalido"]:
+            return 400, "application/json", json.dumps({"status": "ERROR", "statusMessage": "Invalid filter"})
+        page, limit = int(query["page"][0]), int(query["limit"][0])
+        ids = [f"R{i}" for i in range((page - 1) * limit + 1, min(page * limit, TOTAL) + 1)]
+        body = {"status": "OK", "resultCount": TOTAL, "records": [api_record(rid) for rid in ids]}
+        return 200, "application/json", json.dumps(body)
+    if path == "/vufind/api/v1/record":
+        rid = query["id"][0]
+        if rid == "APAGADO":
+            return 404, "application/json", json.dumps({"status": "ERROR", "statusMessage": "Record not found"})
+        return 200, "application/json", json.dumps({"status": "OK", "resultCount": 1, "records": [api_record(rid)]})
+    return 404, "text/html", "<html>Not found</html>"
+
+
+@pytest.fixture
+def client():
+    return VuFindApiClient()
+
+
+def test_iter_search_walks_every_page(fixture_server, client):
+    server = fixture_server(vufind_api)
+    search_url = f"{server.url}/vufind/Search/Results?lookfor=ensino&page=3&limit=20"
+
+    pages = list(client.iter_search(search_url))
+
+    assert [(page, total) for page, total, _ in pages] == [(1, 3), (2, 3), (3, 3)]
+    ids = [rec["id"] for _, _, records in pages for rec in records]
+    assert ids == [f"R{i}" for i in range(1, TOTAL + 1)]
+    # page/limit da URL original são substituídos pelos da paginação da API
+    assert all(query["limit"] == ["100"] for _, query in server.requests)
+    assert client.to_research_row(pages[0][2][0], search_url) == (
+        "Tese R1", "Autor R1", f"{server.url}/vufind/Record/R1", "https://repositorio.exemplo.br/handle/1/R1"
+    )
+
+
+def test_record_and_details(fixture_server, client):
+    server = fixture_server(vufind_api)
+
+    record = client.record(f"{server.url}/vufind/Record/R7")
+
+    assert record["id"] == "R7"
+    assert client.to_details(record) == {
+        'sigla': "UFX", 'universidade': "Universidade X", 'programa': "-",
+        'link_pdf': "https://repositorio.exemplo.br/handle/1/R7",
+    }
+
+
+def test_missing_record_does_not_disable_the_host(fixture_server, client):
+    server = fixture_server(vufind_api)
+
+    assert client.record(f"{server.url}/vufind/Record/APAGADO") is None
+    assert client.search(f"{server.url}/vufind/Search/Results?lookfor=x&filter[]=invalido") is None
+
+    assert client.available(server.url)
+    assert client.record(f"{server.url}/vufind/Record/R1")["id"] == "R1"
+
+
+def test_host_without_api_raises_for_fallback(fixture_server, client):
+    server = fixture_server(lambda path, query: (404, "text/html", "<html>Página não encontrada</html>"))
+    search_url = f"{server.url}/vufind/Search/Results?lookfor=x"
+
+    with pytest.raises(LookupError):
+        list(client.iter_search(search_url))
+    assert not client.available(search_url)
+
+    # O host fica lembrado: nenhuma nova requisição à API
+    requests_before = len(server.requests)
+    assert client.record(f"{server.url}/vufind/Record/R1") is None
+    assert len(server.requests) == requests_before
+
+
+def html_search(path, query):
+    """VuFind sem API: 7 resultados servidos em páginas HTML de 3 cards."""
+    if path != "/vufind/Search/Results":
+        return 404, "text/html", "<html>Not found</html>"
+    limit, page = min(int(query.get("limit", ["3"])[0]), 3), int(query.get("page", ["1"])[0])
+    first, last = (page - 1) * limit + 1, min(page * limit, 7)
+    cards = "".join(
+        f'<div class="result card-results"><h2><a class="title" href="/vufind/Record/H{i}">Tese H{i}</a></h2>'
+        f'<a href="/vufind/Author/Home?author=A{i}">Autor H{i}</a>'
+        f'<a href="https://repositorio.exemplo.br/handle/2/{i}">Acessar documento</a></div>'
+        for i in range(first, last + 1)
+    )
+    body = f'<html><div class="search-stats">Mostrando {first} - {last} resultados de 7</div>{cards}</html>'
+    return 200, "text/html; charset=utf-8", body
+
+
+def test_import_falls_back_to_html_pagination(fixture_server, tmp_path, monkeypatch):
+    from viewmodels.main_vm import MainViewModel
+
+    monkeypatch.chdir(tmp_path)
+    server = fixture_server(html_search)
+    search_url = f"{server.url}/vufind/Search/Results?lookfor=x"
+    vm = MainViewModel(str(tmp_path / "database.db"))
+    try:
+        vm.run_scrape(search_url, "x", "2020")
+        row_id = vm.get_history_ids(first_page_only=True)[0]
+
+        finished = threading.Event()
+        messages = []
+
+        def on_status(message):
+            messages.append(message)
+            if "finalizada" in message or message.startswith("Erro"):
+                finished.set()
+
+        vm.import_search_via_api(row_id, on_status, None)
+        assert finished.wait(30), messages
+
+        assert "Importação de 'x' finalizada: 7 pesquisas." in messages
+        links = sorted(link for _, link, _ in vm.db.get_research_join_links())
+        # Os cards relativos são resolvidos contra a BDTD (BDTD_BASE_URL)
+        assert links == sorted(f"{BDTD_BASE_URL}/vufind/Record/H{i}" for i in range(1, 8))
+    finally:
+        vm.db.close()
@@ -0,0 +1,20 @@
+import time
+from models.web_scraper import _build_session
+
+
+def test_retry_after_is_capped(fixture_server):
+    def respond(path, query):
+        # O servidor pede uma hora de espera antes da segunda tentativa
+        if len(server.requests) == 1:
+            return 429, "text/plain", "devagar", {"Retry-After": "3600"}
+        return 200, "text/plain", "ok"
+
+    server = fixture_server(respond)
+    session = _build_session(pool_connections=1, pool_maxsize=1, retries=2, backoff_factor=0, max_retry_after=0.2)
+
+    started = time.monotonic()
+    response = session.get(f"{server.url}/pagina", timeout=5)
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+    assert time.monotonic() - started < 5
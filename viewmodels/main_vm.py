@@ -2,16 +2,35 @@ import threading
 import webbrowser
 import tempfile
 import os
-import re  # Necessário para encontrar os padrões de página no HTML
+import re
+import socket
 import time
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from datetime import datetime
 from html.parser import HTMLParser
 from io import StringIO
-from models.db_handler import DatabaseHandler
+from models.db_handler import DatabaseHandler, research_link_key
 from models.web_scraper import WebScraper
-from bs4 import BeautifulSoup
+from models.http_cache import HttpCache, HTTP_CACHE_CONFIG
+from models.blob_store import HtmlBlobStore
 from services.parser_factory import ParserFactory # Certifique-se de que o caminho está correto
+from parsers.base_parser import parse_document
+from parsers.bdtd_parser import iter_result_cards
+from services.download_engine import DownloadEngine
+from services.domain_throttle import DomainThrottle
+from services.parse_engine import ParseEngine
+from services.pagination_engine import PaginationEngine, parse_search_stats, page_url
+from services.vufind_api import VuFindApiClient
+from services.dspace_rest import DSpaceRestClient
+from parsers.dspace_angular import DSpaceAngularParser
+from services.oai_harvester import OaiHarvester, OaiError, handle_of, record_id_of
+from services.job_control import (
+    JobControl, JobBusyError, stale_cutoff, JOB_PAUSED, JOB_DONE,
+    JOB_KIND_DOWNLOAD, JOB_KIND_PARSE, JOB_KIND_PAGINATION, JOB_KIND_EXTRACTION
+)
+from viewmodels.research_grid import ResearchGridModel
 
 class MLStripper(HTMLParser):
 
@@ -29,9 +48,47 @@ class MLStripper(HTMLParser):
         return self.text.getvalue()
 class MainViewModel:
 
-    def __init__(self):
-        self.db = DatabaseHandler()
+    def __init__(self, db_name="database.db"):
+        self.db = DatabaseHandler(db_name)
         self.factory = ParserFactory() # Inicializa a fábrica de parsers
+        # Limitador adaptativo e disjuntor por domínio, compartilhado por todos os downloads
+        self.throttle = DomainThrottle()
+        # Cache HTTP em disco, ao lado do banco: re-downloads viram GETs condicionais (304)
+        self.http_cache = HttpCache(
+            os.path.join(os.path.dirname(os.path.abspath(db_name)), HTTP_CACHE_CONFIG['path'])
+        )
+        # Scraper único: todos os downloads compartilham a sessão HTTP com pool de conexões
+        self.scraper = WebScraper(throttle=self.throttle, cache=self.http_cache)
+
+        # Modelo virtual da grade de Pesquisas (janelas keyset + pré-busca)
+        self.research_grid = ResearchGridModel(self.db)
+
+        # Concorrência do download em lote (global e por domínio)
+        self.download_workers = 8
+        self.download_per_domain = 2
+        # Processos do parser em lote (None = um por núcleo)
+        self.parse_processes = None
+
+        # Paginação das buscas: páginas restantes baixadas em paralelo (limite por host)
+        self.pagination = PaginationEngine(self.scraper.download_page, is_blocked=self.throttle.is_open)
+
+        # API JSON do VuFind: caminho rápido para buscas e registros da BDTD (fallback em HTML)
+        self.vufind_api = VuFindApiClient(self.scraper.session, throttle=self.throttle)
+
+        # Coleta OAI-PMH: metadados de repositórios inteiros em poucas requisições
+        self.oai = OaiHarvester(self.scraper.session, throttle=self.throttle)
+
+        # API REST do DSpace 7+: repositórios Angular sem navegador
+        self.dspace = DSpaceRestClient(self.scraper.session, throttle=self.throttle)
+
+        # Jobs em lote em execução nesta sessão: {job_id: JobControl}
+        self.active_jobs = {}
+        # Dono gravado nos jobs deste processo (a GUI não retoma jobs com dono vivo)
+        self.job_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        # Filtro de links já ingeridos: {(link_chave, termo, ano)}, carregado na primeira extração
+        self._seen_research = None
+        self._seen_lock = threading.Lock()
 
     def _update_step(self, message, callback):
         self.db.log_event(message)
@@ -44,31 +101,7 @@ class MainViewModel:
         """
         def task():
             try:
-                self._update_step(f"Validando busca: {termo_amigavel}...", on_status_change)
-                if not url.strip():
-                    raise ValueError("A URL de destino não pode estar vazia.")
-
-                engine = "BDTD"
-
-                self._update_step(f"Baixando conteúdo da BDTD ({ano_selecionado})...", on_status_change)
-                
-                scraper = WebScraper()
-                html = scraper.download_page(url, on_progress=on_status_change)
-                
-                if not html:
-                    raise Exception("Falha ao capturar o HTML da página inicial da BDTD.")
-
-                self._update_step("Persistindo busca no histórico...", on_status_change)
-                self.db.insert_scrape(
-                    engine=engine,
-                    termo=termo_amigavel,
-                    ano=str(ano_selecionado),
-                    pagina=1,
-                    html_source=html,
-                    link_busca=url
-                )
-                # Adicionada a palavra 'finalizado' para gatilho na View
-                self._update_step(f"Captura de '{termo_amigavel}' finalizada com sucesso!", on_status_change)
+                self.run_scrape(url, termo_amigavel, ano_selecionado, on_status_change)
             except Exception as e:
                 erro_msg = str(e)
                 self.db.log_event(f"ERRO NO SCRAPE: {erro_msg}")
@@ -76,15 +109,120 @@ class MainViewModel:
 
         threading.Thread(target=task, daemon=True).start()
 
-    def get_history(self):
-        return self.db.fetch_all()
+    def run_scrape(self, url, termo_amigavel, ano_selecionado, on_status_change=None):
+        """Núcleo síncrono de perform_scrape (usado também pela linha de comando); levanta em caso de falha."""
+        self._update_step(f"Validando busca: {termo_amigavel}...", on_status_change)
+        if not url.strip():
+            raise ValueError("A URL de destino não pode estar vazia.")
+
+        engine = "BDTD"
+
+        self._update_step(f"Baixando conteúdo da BDTD ({ano_selecionado})...", on_status_change)
+
+        html = self.scraper.download_page(url, on_progress=on_status_change)
+
+        if not html:
+            raise Exception("Falha ao capturar o HTML da página inicial da BDTD.")
+
+        self._update_step("Persistindo busca no histórico...", on_status_change)
+        self.db.insert_scrape(
+            engine=engine,
+            termo=termo_amigavel,
+            ano=str(ano_selecionado),
+            pagina=1,
+            html_source=html,
+            link_busca=url
+        )
+        # Adicionada a palavra 'finalizado' para gatilho na View
+        self._update_step(f"Captura de '{termo_amigavel}' finalizada com sucesso!", on_status_change)
+
+    def get_history_page(self, page=1, page_size=50):
+        """Retorna (linhas, total) de uma página do histórico, sem carregar HTML."""
+        page = max(1, page)
+        rows = self.db.fetch_history_page(page_size, (page - 1) * page_size)
+        return rows, self.db.count_history()
+
+    def get_history_ids(self, first_page_only=False):
+        return self.db.get_history_ids(first_page_only)
 
-    def get_system_logs(self):
-        return self.db.fetch_all_logs()
+    def get_history_text(self, rowid):
+        """Carrega sob demanda o HTML de uma captura e o converte em texto."""
+        html_content = self.db.get_scrape_content_by_id(rowid)
+        return self.render_html_to_text(html_content) if html_content else ""
 
     def get_initial_status(self):
         return self.db.get_last_log_message()
 
+    # --- Jobs em lote (retomáveis, com pausa e cancelamento) ---
+
+    def _claim_job(self, job_id, kind):
+        """
+        Assume um job existente para retomá-lo. ValueError se ele não existe ou é de
+        outro tipo; JobBusyError se outro processo vivo ainda o executa.
+        """
+        summary = self.db.get_job_summary(job_id)
+        if summary is None:
+            raise ValueError(f"Job {job_id} não encontrado.")
+        if summary['tipo'] != kind:
+            raise ValueError(f"Job {job_id} é do tipo '{summary['tipo']}', não '{kind}'.")
+        if not self.db.claim_job(job_id, self.job_owner, stale_cutoff()):
+            raise JobBusyError(f"Job {job_id} está em execução em outro processo.")
+
+    def _open_job(self, kind, items, params=None, job_id=None):
+        """Cria o job com seus itens ou reabre um job existente (mantendo a pausa salva)."""
+        paused = False
+        if job_id is None:
+            job_id = self.db.create_job(kind, items, params, owner=self.job_owner)
+        else:
+            self._claim_job(job_id, kind)
+            paused = self.db.get_job_state(job_id) == JOB_PAUSED
+        job = JobControl(self.db, job_id, kind, paused=paused, owner=self.job_owner)
+        self.active_jobs[job_id] = job
+        return job
+
+    def _close_job(self, job, complete=True):
+        job.finish(complete)
+
+    def _release_job(self, job):
+        if job:
+            self.active_jobs.pop(job.job_id, None)
+            job.close()
+
+    def has_active_jobs(self):
+        return bool(self.active_jobs)
+
+    def pause_jobs(self):
+        for job in list(self.active_jobs.values()):
+            job.pause()
+        return "Lote pausado. Use Retomar para continuar." if self.active_jobs else "Nenhum lote em execução."
+
+    def resume_jobs(self):
+        for job in list(self.active_jobs.values()):
+            job.resume()
+        return "Lote retomado." if self.active_jobs else "Nenhum lote em execução."
+
+    def cancel_jobs(self):
+        for job in list(self.active_jobs.values()):
+            job.cancel()
+        return "Cancelando lote..." if self.active_jobs else "Nenhum lote em execução."
+
+    def resume_unfinished_jobs(self, on_status_change, callback_refresh):
+        """
+        Retoma, na abertura do aplicativo, os jobs interrompidos por fechamento
+        ou queda. Jobs que estavam pausados voltam pausados. Jobs cujo dono
+        (ex.: um processo da linha de comando) ainda dá sinal de vida ficam com ele.
+        """
+        for job_id, kind, state, params in self.db.get_unfinished_jobs(stale_before=stale_cutoff()):
+            self.db.log_event(f"Retomando job {job_id} ({kind}, {state}).")
+            if kind == JOB_KIND_DOWNLOAD:
+                self.batch_download_repository_html(on_status_change, callback_refresh, job_id=job_id, **params)
+            elif kind == JOB_KIND_PARSE:
+                self.batch_extract_university_info(on_status_change, callback_refresh, job_id=job_id, **params)
+            elif kind == JOB_KIND_PAGINATION:
+                self.batch_process_pagination(None, on_status_change, callback_refresh, job_id=job_id)
+            elif kind == JOB_KIND_EXTRACTION:
+                self.batch_extract_research_data(None, on_status_change, None, callback_refresh, job_id=job_id)
+
     def render_html_to_text(self, html_content):
         try:
             s = MLStripper()
@@ -96,41 +234,69 @@ class MainViewModel:
     def process_pagination(self, row_id, on_status_change, callback_refresh):
         def task():
             try:
-                record = self.db.get_scrape_by_id(row_id)
+                record = self.db.get_scrape_full_details(row_id)
                 if not record:
                     self._update_step("Registro não encontrado.", on_status_change)
                     return
 
-                termo = record[1]
-                html_page_1 = record[3]
-                
-                total_pages = self.scraper.detect_total_pages(html_page_1) 
-                
-                if total_pages <= 1:
-                    self._update_step(f"Apenas 1 página encontrada para '{termo}'. Nada a fazer.", on_status_change)
-                    return
+                self._internal_pagination_logic(row_id, on_status_change)
+                self._update_step(f"Paginação de '{record[1]}' finalizada.", on_status_change)
+                if callback_refresh: callback_refresh()
 
-                self._update_step(f"Encontradas {total_pages} páginas para '{termo}'. Baixando...", on_status_change)
+            except Exception as e:
+                self.db.log_event(f"Erro paginação ID {row_id}: {str(e)}")
+                self._update_step(f"Erro: {str(e)}", on_status_change)
 
-                for page_num in range(2, total_pages + 1):
-                    self._update_step(f"Baixando página {page_num}/{total_pages}...", on_status_change)
-                    
-                    new_html = self.scraper.download_page(termo, page=page_num)
-                    
-                    if new_html:
-                        self.db.insert_scrape(termo, new_html, page_num)
-                    else:
-                        self._update_step(f"Falha ao baixar pág {page_num}.", on_status_change)
+        threading.Thread(target=task, daemon=True).start()
 
-                self._update_step("Paginação concluída!", on_status_change)
-                if callback_refresh: callback_refresh()
+    def import_search_via_api(self, row_id, on_status_change, callback_refresh):
+        """
+        Importa todos os resultados da busca (página 1 do histórico) para a aba de
+        Pesquisas pela API JSON do VuFind, em páginas de 100 registros. Sem API,
+        pagina e extrai pelo HTML.
+        """
+        def task():
+            try:
+                record = self.db.get_scrape_full_details(row_id)
+                if not record:
+                    self._update_step("Registro não encontrado.", on_status_change)
+                    return
 
+                engine, termo_orig, ano, _, _, link_busca = record
+                imported = 0
+                try:
+                    with self.db.bulk() as bulk:
+                        for page, total_pages, records in self.vufind_api.iter_search(link_busca):
+                            rows = [
+                                self.vufind_api.to_research_row(rec, link_busca) + (row_id, termo_orig, ano)
+                                for rec in records
+                            ]
+                            imported += self._ingest_research_rows(rows, bulk)
+                            self._update_step(f"API: página {page}/{total_pages} ({imported} registros)...", on_status_change)
+                except LookupError as e:
+                    self.db.log_event(f"{e}: importando '{termo_orig}' ({ano}) pelo HTML.")
+                    imported += self._import_search_via_html(row_id, on_status_change)
+
+                self._update_step(f"Importação de '{termo_orig}' finalizada: {imported} pesquisas.", on_status_change)
+                if callback_refresh: callback_refresh()
             except Exception as e:
-                self.db.log_event(f"Erro paginação ID {row_id}: {str(e)}")
+                self.db.log_event(f"Erro na importação via API (ID {row_id}): {e}")
                 self._update_step(f"Erro: {str(e)}", on_status_change)
 
         threading.Thread(target=task, daemon=True).start()
 
+    def _import_search_via_html(self, row_id, on_status_change):
+        """Fallback da API: captura as páginas faltantes e extrai os cards de todas elas."""
+        self._internal_pagination_logic(row_id, on_status_change)
+        engine, termo_orig, ano = self.db.get_scrape_full_details(row_id)[:3]
+        imported = 0
+        with self.db.bulk() as bulk:
+            for page_id in self.db.get_search_page_ids(engine, termo_orig, ano):
+                page_record = self.db.get_scrape_full_details(page_id)
+                if page_record:
+                    imported += self._process_single_record_to_research(page_record, page_id, bulk)
+        return imported
+
     def open_in_browser(self, rowid):
         """
         Recupera o HTML do banco, cria um arquivo temporário e abre no navegador padrão.
@@ -169,29 +335,11 @@ class MainViewModel:
                 record = self.db.get_scrape_full_details(rowid)
                 if not record: return
                 
-                # record: (engine, termo_orig, ano_orig, pagina, html)
-                termo_orig, ano_orig, html_content = record[1], record[2], record[4]
-                soup = BeautifulSoup(html_content, 'html.parser')
-                results = soup.select('.result.card-results')
-
-                extracted_to_db = []
-                for res in results:
-                    title_tag = res.select_one('h2 a.title')
-                    titulo = title_tag.get_text(" ",strip=True) if title_tag else "-"
-                    l_busc = title_tag['href'] if title_tag else "-"
-                    if l_busc.startswith('/'): 
-                        l_busc = "https://bdtd.ibict.br" + l_busc
-
-                    autor = res.select_one('a[href*="/Author/"]').get_text(" ", strip=True) if res.select_one('a[href*="/Author/"]') else "-"
-                    repo_tag = res.find('a', string=lambda s: s and "Acessar documento" in s)
-                    l_repo = repo_tag['href'] if repo_tag else "-"
-
-                    # 7 valores: titulo, autor, link_busc, link_repo, rowid, termo, ano
-                    extracted_to_db.append((titulo, autor, l_busc, l_repo, rowid, termo_orig, ano_orig))
-
-                if extracted_to_db:
-                    self.db.insert_extracted_data(extracted_to_db)
-                    self._update_step(f"Sucesso: {len(extracted_to_db)} pesquisas extraídas.", on_status_change)
+                extracted = self._process_single_record_to_research(record, rowid)
+                if extracted:
+                    self._update_step(f"Sucesso: {extracted} pesquisas extraídas.", on_status_change)
+                else:
+                    self._update_step("Nenhuma pesquisa nova: a página já foi extraída.", on_status_change)
                 
                 if callback_refresh: callback_refresh()
             except Exception as e:
@@ -205,8 +353,7 @@ class MainViewModel:
 
     def scrape_buscador_link(self, res_id, url, on_status, callback_display):
         def task():
-            scraper = WebScraper()
-            html = scraper.download_page(url)
+            html = self.scraper.download_page(url)
             if html:
                 self.db.save_html_buscador(res_id, html)
                 on_status("HTML do Buscador salvo.")
@@ -239,8 +386,8 @@ class MainViewModel:
 
     def scrape_repositorio_link(self, res_id, url, on_status, callback_display):
         def task():
-            scraper = WebScraper()
-            html = scraper.download_page(url)
+            # Mesmo caminho do lote: DSpace Angular pela API REST, demais pelo scraper
+            html = self._fetch_repository_html(url)
             if html:
                 self.db.save_html_repositorio(res_id, html)
                 on_status("HTML do Repositório salvo.")
@@ -313,9 +460,12 @@ class MainViewModel:
 
                 url = row[0]
                 
-                # 2. Instancia o scraper e chama o método correto
-                scraper = WebScraper()
-                html_content = scraper.download_page(url, on_progress=on_status_change)
+                # 2. DSpace Angular pela API REST; demais pelo scraper compartilhado (sessão com pool de conexões)
+                html_content = self._fetch_via_dspace_rest(url)
+                if html_content:
+                    self._update_step("Metadados obtidos pela API REST do DSpace.", on_status_change)
+                else:
+                    html_content = self.scraper.download_page(url, on_progress=on_status_change)
 
                 if html_content:
                     self.db.update_html_repositorio(res_id, html_content)
@@ -333,26 +483,35 @@ class MainViewModel:
         threading.Thread(target=task, daemon=True).start()
 
     def extract_from_search_engine(self, res_id, on_status_change, on_refresh_callback):
+        """Dados do registro na BDTD: API JSON do VuFind primeiro, HTML do buscador como fallback."""
         def task():
-            html = self.fetch_saved_html_buscador(res_id)
-            if not html:
-                on_status_change("HTML do buscador não disponível.")
-                return
-
             try:
-                from parsers.bdtd_parser import BDTDParser
-                parser = BDTDParser()
-                data = parser.extract_buscador_data(html)
-                
+                row = self.db.fetch_research_record(res_id)
+                link_buscador = row[2] if row else None
+
+                data = None
+                api_record = self.vufind_api.record(link_buscador) if link_buscador else None
+                if api_record:
+                    data = self.vufind_api.to_details(api_record)
+                else:
+                    html = self.fetch_saved_html_buscador(res_id)
+                    if not html:
+                        on_status_change("HTML do buscador não disponível.")
+                        return
+                    from parsers.bdtd_parser import BDTDParser
+                    data = BDTDParser().extract_pure_soup(parse_document(html), link_buscador)
+
+                # "-" é o marcador de campo não encontrado dos parsers
+                data = {k: v for k, v in (data or {}).items() if v and v != "-"}
                 if data:
                     self.db.update_research_extracted_data(
                         res_id,
                         data.get('sigla'),
                         data.get('universidade'),
                         data.get('programa'),
-                        None 
+                        data.get('link_pdf')
                     )
-                    on_status_change("Dados do buscador extraídos.")
+                    on_status_change("Dados do buscador extraídos" + (" (API)." if api_record else "."))
                     if on_refresh_callback: on_refresh_callback()
                 else:
                     on_status_change("Nenhum dado novo encontrado no buscador.")
@@ -383,6 +542,122 @@ class MainViewModel:
         except Exception as e:
             print(f"Erro ao abrir HTML no navegador: {e}")
 
+    def get_domain_breaker_states(self):
+        """Domínios pausados ou em teste pelo disjuntor: {domínio: estado}."""
+        return self.throttle.breaker_states()
+
+    def harvest_oai_metadata(self, on_status_change, callback_refresh, domains=None, set_spec=None):
+        """
+        Coleta por OAI-PMH os metadados dos repositórios (por padrão, os domínios
+        ativos na aba de Raízes) e preenche universidade, sigla, programa e PDF das
+        pesquisas, casando os registros por handle (DSpace) ou id do registro (VuFind).
+        Cada domínio continua de onde parou: resumptionToken salvo ou último datestamp.
+        """
+        def task():
+            try:
+                index, schemes, engines = self._build_oai_index()
+                targets = domains
+                if targets is None:
+                    states = self.db.get_domain_states()
+                    targets = [d for d in self.get_unique_domains() if states.get(d, True)]
+                    # O buscador (BDTD) não aparece na aba de Raízes, mas também tem OAI-PMH
+                    targets += sorted(engines - set(targets))
+                targets = [d for d in targets if d in index]
+                if not targets:
+                    self._update_step("Nenhum domínio com pesquisas para coletar via OAI-PMH.", on_status_change)
+                    return
+
+                self._update_step(f"Coleta OAI-PMH iniciada em {len(targets)} domínios...", on_status_change)
+                with ThreadPoolExecutor(max_workers=min(len(targets), self.download_workers)) as pool:
+                    counts = list(pool.map(
+                        lambda d: self._harvest_domain(d, index[d], schemes.get(d, "https"), set_spec, on_status_change),
+                        targets
+                    ))
+
+                self._update_step(
+                    f"Coleta OAI-PMH finalizada: {sum(counts)} pesquisas atualizadas em {len(targets)} domínios.",
+                    on_status_change)
+                if callback_refresh: callback_refresh()
+            except Exception as e:
+                self.db.log_event(f"Erro na coleta OAI-PMH: {e}")
+                self._update_step(f"Erro na coleta OAI-PMH: {str(e)}", on_status_change)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def _build_oai_index(self):
+        """
+        {domínio: {handle ou id do registro: [ids das pesquisas]}}, o esquema (http/https)
+        de cada domínio e os domínios de buscador (links /Record/ do VuFind).
+        """
+        index, schemes, engines = {}, {}, set()
+        for res_id, l_busc, l_repo in self.db.get_research_join_links():
+            for link, key, engine in ((l_repo, handle_of(l_repo), False), (l_busc, record_id_of(l_busc), True)):
+                if not key:
+                    continue
+                parsed = urlparse(link)
+                index.setdefault(parsed.netloc, {}).setdefault(key, []).append(res_id)
+                schemes.setdefault(parsed.netloc, parsed.scheme or "https")
+                if engine:
+                    engines.add(parsed.netloc)
+        return index, schemes, engines
+
+    def _harvest_domain(self, domain, keys, scheme, set_spec, on_status_change):
+        """Coleta um domínio e grava página a página; retorna o número de pesquisas atualizadas."""
+        state = self.db.get_oai_state(domain)
+        endpoint, fmt, _, last_datestamp, token = state or (None, None, None, None, None)
+        if not endpoint:
+            try:
+                endpoint = self.oai.discover(domain, scheme)
+                if endpoint:
+                    fmt = self.oai.pick_format(endpoint)
+            except OaiError as e:
+                # Domínio pausado pelo disjuntor: tenta de novo na próxima coleta
+                self.db.log_event(f"OAI-PMH {domain}: {e}")
+                return 0
+            if not endpoint:
+                self.db.log_event(f"OAI-PMH: nenhum endpoint encontrado em {domain}.")
+                return 0
+
+        # O datestamp só avança ao fim da coleta: os registros não vêm em ordem de data
+        from_date = last_datestamp[:10] if last_datestamp else None
+        newest = last_datestamp
+        updated = 0
+
+        while True:
+            try:
+                for page, (records, next_token) in enumerate(
+                        self.oai.iter_pages(endpoint, fmt, set_spec, from_date, token), 1):
+                    items = []
+                    for record in records:
+                        if record['deleted']:
+                            continue
+                        if record['datestamp'] and (newest is None or record['datestamp'] > newest):
+                            newest = record['datestamp']
+                        ids = {res_id for key in self.oai.join_keys(record) for res_id in keys.get(key, ())}
+                        if ids:
+                            details = self.oai.to_details(record)
+                            items.extend((res_id, details) for res_id in ids)
+
+                    self.db.update_research_details_many(items)
+                    self.db.save_oai_state(
+                        domain, endpoint, fmt, set_spec,
+                        last_datestamp if next_token else newest, next_token, len(records)
+                    )
+                    updated += len(items)
+                    self._update_step(
+                        f"OAI {domain}: página {page}, {updated} pesquisas atualizadas...", on_status_change)
+                return updated
+            except OaiError as e:
+                # Token expirado: recomeça a partir do último datestamp concluído
+                if e.code == "badResumptionToken" and token:
+                    token = None
+                    continue
+                self.db.log_event(f"OAI-PMH {domain}: {e}")
+                return updated
+            except Exception as e:
+                self.db.log_event(f"Falha na coleta OAI-PMH de {domain}: {e}")
+                return updated
+
     def get_unique_domains(self):
         """Retorna domínios únicos em ORDEM ALFABÉTICA."""
         try:
@@ -415,24 +690,15 @@ class MainViewModel:
         except Exception as e:
             print(f"Erro ao abrir navegador: {e}")
 
-    def batch_extract_research_data(self, row_ids, on_status_change, on_error, callback_refresh):
+    def batch_extract_research_data(self, row_ids, on_status_change, on_error, callback_refresh, job_id=None):
         """
         Executa a extração de dados em lote para uma lista de IDs do histórico.
         Processa sequencialmente para manter a integridade do SQLite.
+        Com `job_id`, retoma um job interrompido a partir dos itens pendentes.
         """
         def batch_task():
-            total = len(row_ids)
             try:
-                for index, rowid in enumerate(row_ids, 1):
-                    self._update_step(f"Lote: Processando item {index} de {total}...", on_status_change)
-                    
-                    # Recupera detalhes (incluindo Termo e Ano amigáveis)
-                    record = self.db.get_scrape_full_details(rowid) 
-                    if record:
-                        # Reutiliza a lógica interna de processamento de HTML
-                        self._process_single_record_to_research(record, rowid)
-                
-                self._update_step(f"Lote finalizado: {total} capturas processadas.", on_status_change)
+                self.run_extraction_batch(row_ids, on_status_change, job_id)
                 if callback_refresh:
                     callback_refresh()
             except Exception as e:
@@ -441,135 +707,371 @@ class MainViewModel:
 
         threading.Thread(target=batch_task, daemon=True).start()
 
-    def _process_single_record_to_research(self, record, rowid):
-        """Lógica interna de extração isolada para suportar lote e unitário."""
+    def run_extraction_batch(self, row_ids, on_status_change=None, job_id=None):
+        """Núcleo síncrono de batch_extract_research_data; retorna o id do job."""
+        job = None
+        try:
+            job = self._open_job(JOB_KIND_EXTRACTION, row_ids, job_id=job_id)
+            pending = [int(item) for item in self.db.get_pending_job_items(job.job_id)]
+            total = len(pending)
+
+            with self.db.bulk() as bulk:
+                job.bulk = bulk
+                for index, rowid in enumerate(pending, 1):
+                    if not job.wait_if_paused():
+                        break
+                    self._update_step(f"Lote: Processando item {index} de {total}...", on_status_change)
+
+                    try:
+                        # Recupera detalhes (incluindo Termo e Ano amigáveis)
+                        record = self.db.get_scrape_full_details(rowid)
+                        if record:
+                            # Reutiliza a lógica interna de processamento de HTML
+                            self._process_single_record_to_research(record, rowid, bulk)
+                        job.done(rowid)
+                    except Exception as e:
+                        self.db.log_event(f"Erro ao extrair captura {rowid}: {e}")
+                        job.failed(rowid, e)
+
+            self._close_job(job)
+            if job.cancelled:
+                self._update_step("Lote cancelado.", on_status_change)
+            else:
+                self._update_step(f"Lote finalizado: {total} capturas processadas.", on_status_change)
+            return job.job_id
+        finally:
+            self._release_job(job)
+
+    def _process_single_record_to_research(self, record, rowid, bulk=None):
+        """
+        Lógica interna de extração isolada para suportar lote e unitário.
+        Com `bulk`, a gravação entra no lote em vez de gerar um commit próprio.
+        Retorna o número de pesquisas extraídas.
+        """
         # record: (engine, termo_orig, ano_orig, pagina, html)
         termo_orig, ano_orig, html_content = record[1], record[2], record[4]
-        soup = BeautifulSoup(html_content, 'html.parser')
-        results = soup.select('.result.card-results')
-
-        extracted_to_db = []
-        for res in results:
-            title_tag = res.select_one('h2 a.title')
-            titulo = title_tag.get_text(" ", strip=True) if title_tag else "-"
-            l_busc = title_tag['href'] if title_tag else "-"
-            if l_busc.startswith('/'): 
-                l_busc = "https://bdtd.ibict.br" + l_busc
 
-            autor = res.select_one('a[href*="/Author/"]').get_text(" ", strip=True) if res.select_one('a[href*="/Author/"]') else "-"
-            repo_tag = res.find('a', string=lambda s: s and "Acessar documento" in s)
-            l_repo = repo_tag['href'] if repo_tag else "-"
+        # 7 campos de db.insert_extracted_data: titulo, autor, link_busc, link_repo, rowid, termo, ano
+        extracted_to_db = [
+            card + (rowid, termo_orig, ano_orig) for card in iter_result_cards(html_content)
+        ]
 
-            # Monta a tupla com os 7 campos requeridos pelo db.insert_extracted_data
-            extracted_to_db.append((titulo, autor, l_busc, l_repo, rowid, termo_orig, ano_orig))
+        return self._ingest_research_rows(extracted_to_db, bulk)
 
-        if extracted_to_db:
-            self.db.insert_extracted_data(extracted_to_db)
+    def _ingest_research_rows(self, rows, bulk=None):
+        """
+        Grava as linhas no formato de db.insert_extracted_data descartando antes, sem ir
+        ao banco, as pesquisas já ingeridas para a mesma busca (termo, ano).
+        Retorna o número de linhas enviadas ao banco.
+        """
+        with self._seen_lock:
+            if self._seen_research is None:
+                self._seen_research = set(self.db.get_research_origin_keys())
+            fresh = []
+            for row in rows:
+                key = research_link_key(row[2])
+                origin = (key, row[5], str(row[6]))
+                if key is None or origin not in self._seen_research:
+                    fresh.append(row)
+                    if key is not None:
+                        self._seen_research.add(origin)
+
+        if fresh:
+            if bulk:
+                bulk.call(self.db.insert_extracted_data, fresh, rows=len(fresh))
+            else:
+                self.db.insert_extracted_data(fresh)
+        return len(fresh)
 
-    def batch_process_pagination(self, row_ids_list, on_status_change, callback_refresh):
+    def batch_process_pagination(self, row_ids_list, on_status_change, callback_refresh, job_id=None):
         def task():
-            total_items = len(row_ids_list)
-            for idx, row_id in enumerate(row_ids_list, 1):
-                try:
-                    record = self.db.get_scrape_by_id(row_id)
-                    if not record: continue
-                    
-                    termo = record[1]
-                    page_idx = record[4] 
-                    
-                    if page_idx != 1:
-                        continue
+            try:
+                self.run_pagination_batch(row_ids_list, on_status_change, job_id)
+                if callback_refresh: callback_refresh()
+            except Exception as e:
+                self.db.log_event(f"Erro no lote de paginação: {e}")
+                self._update_step(f"Erro no Lote: {str(e)}", on_status_change)
 
-                    self._update_step(f"[{idx}/{total_items}] Analisando paginação: {termo}...", on_status_change)
-                    
-                    html_page_1 = record[3]
-                    total_pages = self.scraper.detect_total_pages(html_page_1)
-
-                    if total_pages > 1:
-                        for p in range(2, total_pages + 1):
-                            self._update_step(f"   > Baixando pág {p}/{total_pages}...", on_status_change)
-                            html = self.scraper.download_page(termo, page=p)
-                            if html:
-                                self.db.insert_scrape(termo, html, p)
-                    else:
-                        self._update_step(f"   > Pesquisa única (sem paginação extra).", on_status_change)
-                        
+        threading.Thread(target=task, daemon=True).start()
+
+    def run_pagination_batch(self, row_ids_list, on_status_change=None, job_id=None):
+        """Núcleo síncrono de batch_process_pagination; retorna o id do job."""
+        job = None
+        try:
+            job = self._open_job(JOB_KIND_PAGINATION, row_ids_list, job_id=job_id)
+            pending = [int(item) for item in self.db.get_pending_job_items(job.job_id)]
+            total_items = len(pending)
+
+            for idx, row_id in enumerate(pending, 1):
+                if not job.wait_if_paused():
+                    break
+                try:
+                    record = self.db.get_scrape_full_details(row_id)
+                    # Apenas a página 1 de cada busca dispara a paginação
+                    if record and record[3] == 1:
+                        self._update_step(f"[{idx}/{total_items}] Analisando paginação: {record[1]}...", on_status_change)
+                        self._internal_pagination_logic(row_id, on_status_change, job)
+                    job.done(row_id)
                 except Exception as e:
                     self.db.log_event(f"Erro lote paginação ID {row_id}: {e}")
+                    job.failed(row_id, e)
 
-            self._update_step("Lote de paginação finalizado.", on_status_change)
-            if callback_refresh: callback_refresh()
-
-        threading.Thread(target=task, daemon=True).start()
+            self._close_job(job)
+            self._update_step(
+                "Lote de paginação cancelado." if job.cancelled else "Lote de paginação finalizado.",
+                on_status_change)
+            return job.job_id
+        finally:
+            self._release_job(job)
 
-    def _internal_pagination_logic(self, rowid, on_status_change):
-        """Lógica central de paginação para reuso (Individual e Lote)."""
+    def _internal_pagination_logic(self, rowid, on_status_change, job=None):
+        """
+        Lógica central de paginação para reuso (Individual e Lote).
+        O total de páginas vem do total de resultados informado pelo VuFind;
+        apenas as páginas ainda não capturadas (com o mesmo tamanho de página) são baixadas.
+        """
         record = self.db.get_scrape_full_details(rowid)
         if not record: return
         
-        # Agora record possui 6 campos: (engine, termo, ano, pagina, html, link_busca)
+        # record: (engine, termo, ano, pagina, html, link_busca)
         engine, termo_orig, ano, pagina_inicial, html_source, link_original = record
-        
-        # Encontra o total de páginas no HTML da página 1
-        matches = re.findall(r'page=(\d+)', html_source)
-        if not matches: return
-        max_page = max(map(int, matches))
-
-        # Usa a URL de busca salva no banco para montar os links das próximas páginas
-        parsed_url = urlparse(link_original)
-        query_params = parse_qs(parsed_url.query)
-        scraper = WebScraper()
-
-        for p in range(2, max_page + 1):
-            self._update_step(f"Capturando página {p} de {max_page}...", on_status_change)
-            query_params['page'] = [str(p)]
-            new_query = urlencode(query_params, doseq=True)
-            new_url = urlunparse((parsed_url.scheme, parsed_url.netloc, parsed_url.path, 
-                                  parsed_url.params, new_query, parsed_url.fragment))
-            
-            # Baixa e insere no histórico
-            new_html = scraper.download_page(new_url, on_progress=on_status_change)
-            if new_html:
-                self.db.insert_scrape(engine, termo_orig, ano, p, new_html, new_url)
-            
-            # Intervalo de segurança contra bloqueios (Bot protection)
-            time.sleep(1)
+        if pagina_inicial != 1 or not link_original:
+            return
+
+        stats = parse_search_stats(html_source)
+        if not stats:
+            self.db.log_event(f"Total de resultados não encontrado na busca '{termo_orig}' ({ano}).")
+            return
+
+        # Página 1 capturada com o tamanho padrão: recaptura com o maior `limit` aceito
+        if self.pagination.needs_larger_page(stats, link_original):
+            link_original = page_url(link_original, 1, self.pagination.page_size)
+            self._update_step(f"Recapturando página 1 de '{termo_orig}' com {self.pagination.page_size} itens...", on_status_change)
+            new_html = self.scraper.download_page(link_original, on_progress=on_status_change)
+            new_stats = parse_search_stats(new_html)
+            if new_stats:
+                self.db.insert_scrape(engine, termo_orig, ano, 1, new_html, link_original)
+                stats = new_stats
+
+        total, per_page, total_pages = self.pagination.plan(stats)
+        stored = self.db.get_search_pages(engine, termo_orig, ano)
+        missing = [
+            p for p in range(2, total_pages + 1)
+            if stored.get(p) != page_url(link_original, p, per_page)
+        ]
+
+        if not missing:
+            self.db.save_pagination_state(engine, termo_orig, ano, total, per_page, total_pages, 0, link_original)
+            self._update_step(f"'{termo_orig}' ({ano}): {total} resultados, {total_pages} páginas já capturadas.", on_status_change)
+            return
+
+        self._update_step(
+            f"'{termo_orig}' ({ano}): {total} resultados em {total_pages} páginas. "
+            f"Baixando {len(missing)} faltantes...", on_status_change)
+
+        saved = []
+
+        def fetch(url):
+            if job and not job.wait_if_paused():
+                return None
+            return self.scraper.download_page(url)
+
+        # Executado na thread da paginação: único escritor no banco
+        def on_page(page, url, new_html):
+            if new_html and parse_search_stats(new_html):
+                bulk.call(self.db.insert_scrape, engine, termo_orig, ano, page, new_html, url)
+                saved.append(page)
+
+        def on_progress(done, total_items):
+            self._update_step(f"Capturando páginas de '{termo_orig}': {done}/{total_items}...", on_status_change)
+
+        with self.db.bulk() as bulk:
+            self.pagination.run(
+                link_original, missing, per_page, on_page, on_progress,
+                should_stop=(lambda: job.cancelled) if job else None, fetch=fetch
+            )
+
+        # Faltantes (falhas ou canceladas) são baixadas na próxima execução
+        failed = sorted(set(missing) - set(saved))
+        if failed:
+            self.db.log_event(f"Páginas não capturadas de '{termo_orig}' ({ano}): {failed}")
+        self.db.save_pagination_state(
+            engine, termo_orig, ano, total, per_page, total_pages, len(failed), link_original
+        )
 
     def get_research_row(self, res_id):
         return self.db.fetch_research_record(res_id)
 
-    def batch_extract_university_info(self, on_status_change, callback_refresh):
+    def batch_extract_university_info(self, on_status_change, callback_refresh, processes=None, job_id=None,
+                                      ids=None):
         def task():
             try:
-                ids = self.db.get_ids_with_stored_html()
-                total = len(ids)
-                
-                if total == 0:
-                    self._update_step("Nenhum registro com HTML salvo encontrado para processar.", on_status_change)
-                    return
-
-                self._update_step(f"Iniciando processamento em lote de {total} registros...", on_status_change)
-                
-                success_count = 0
-                
-                for index, res_id in enumerate(ids, 1):
-                    if index % 5 == 0 or index == 1:
-                        self._update_step(f"Parser Lote: Processando {index}/{total}...", on_status_change)
-                    
-                    if self._internal_extraction_logic(res_id):
-                        success_count += 1
-                
-                self._update_step(f"Processamento finalizado! {success_count} registros atualizados.", on_status_change)
-                
+                self.run_parser_batch(on_status_change, processes, job_id, ids)
                 if callback_refresh:
                     callback_refresh()
-
             except Exception as e:
                 self.db.log_event(f"Erro no Parser em Lote: {str(e)}")
                 self._update_step(f"Erro Crítico no Lote: {str(e)}", on_status_change)
 
         threading.Thread(target=task, daemon=True).start()
 
+    def run_parser_batch(self, on_status_change=None, processes=None, job_id=None, ids=None):
+        """
+        Núcleo síncrono de batch_extract_university_info; retorna o id do job (None sem registros).
+        Com `ids`, um lote novo processa só esses registros (ex.: domínios marcados em 'Raízes de URLs').
+        """
+        job = None
+        try:
+            if job_id is None:
+                items = self.db.get_ids_with_stored_html()
+                if ids is not None:
+                    wanted = set(ids)
+                    items = [res_id for res_id in items if res_id in wanted]
+                if not items:
+                    self._update_step("Nenhum registro com HTML salvo encontrado para processar.", on_status_change)
+                    return None
+            else:
+                items = None
+
+            job = self._open_job(JOB_KIND_PARSE, items, {'processes': processes}, job_id)
+            total = len(self.db.get_pending_job_items(job.job_id))
+
+            self._update_step(f"Iniciando processamento em lote de {total} registros...", on_status_change)
+
+            engine = ParseEngine(max_workers=processes or self.parse_processes)
+            counters = {'success': 0, 'cached': 0, 'processed': 0}
+            # Chave de cache de cada registro enviado aos processos de parsing
+            pending_keys = {}
+
+            def report():
+                self._update_step(
+                    f"Parser Lote: Processando {counters['processed']}/{total} "
+                    f"({counters['cached']} do cache)...", on_status_change)
+
+            bulk = job.bulk = self.db.bulk()
+
+            def on_cached(parsed, unchanged):
+                # Resultado idêntico ao já gravado: nada a escrever além do checkpoint
+                if parsed:
+                    bulk.call(self.db.update_parser_data_many, parsed, rows=len(parsed))
+                for res_id in [res_id for res_id, _ in parsed] + unchanged:
+                    job.done(res_id)
+                hits = len(parsed) + len(unchanged)
+                counters['success'] += hits
+                counters['cached'] += hits
+                counters['processed'] += hits
+                report()
+
+            # Único escritor: cada lote de resultados vira uma transação
+            def on_results(results):
+                parsed, cache_entries = [], []
+                for res_id, details, error in results:
+                    key = pending_keys.pop(res_id, None)
+                    if details is None:
+                        self.db.log_event(f"Falha ao processar ID {res_id}: {error}")
+                        continue
+                    parsed.append((res_id, details))
+                    if key:
+                        cache_entries.append(key + (details,))
+                bulk.call(self.db.update_parser_data_many, parsed, rows=len(parsed))
+                bulk.call(self.db.save_cached_extractions, cache_entries, rows=0)
+                for res_id, details, error in results:
+                    if details is None:
+                        job.failed(res_id, error)
+                    else:
+                        job.done(res_id)
+                counters['success'] += len(parsed)
+                counters['processed'] += len(results)
+                report()
+
+            batches = self._iter_uncached_batches(pending_keys, on_cached, job)
+            with bulk:
+                engine.run(batches, on_results)
+
+            self._close_job(job)
+            status = "cancelado" if job.cancelled else "finalizado"
+            self._update_step(
+                f"Processamento {status}! {counters['success']} registros atualizados "
+                f"({counters['cached']} reaproveitados do cache).", on_status_change)
+            return job.job_id
+        finally:
+            self._release_job(job)
+
+    def _iter_parse_sources(self, batch_size=50, job=None):
+        """
+        Gera lotes (id, link, ref do HTML, dados atuais) com a fonte que o parser deve
+        usar em cada registro, sem descomprimir as páginas.
+        Com `job`, percorre apenas os itens pendentes e respeita pausa/cancelamento.
+        """
+        for rows in self.db.iter_parse_sources(batch_size, job.job_id if job else None):
+            if job and not job.wait_if_paused():
+                return
+            batch = []
+            for res_id, l_busc, h_busc, l_repo, h_repo, repo_size, *current in rows:
+                # Prefere o HTML do repositório; usa o do buscador quando ele está vazio
+                ref, link = (h_repo, l_repo) if h_repo and (repo_size or 0) > 100 else (h_busc, l_busc)
+                if ref:
+                    batch.append((res_id, link, ref, tuple(current)))
+                elif job:
+                    job.done(res_id)
+            if batch:
+                yield batch
+
+    def _iter_uncached_batches(self, pending_keys, on_cached, job=None, batch_size=50):
+        """
+        Filtra os lotes pelo cache de extrações. A chave é (hash da referência do blob,
+        link, versão das rotas): os dados dependem do link (link do PDF, URLs relativas)
+        e o parser é o que get_parser escolheu ao gravar a entrada, que só vale enquanto
+        a versão desse parser não mudar. Verificar um acerto não descomprime a página.
+        Acertos vão para `on_cached(alterados, inalterados)`, onde os inalterados já têm
+        no banco o mesmo resultado; os demais seguem para os processos com o HTML,
+        com a chave completa da entrada anotada em `pending_keys`.
+        """
+        versions = self.factory.parser_versions()
+        for batch in self._iter_parse_sources(batch_size, job):
+            keys = {res_id: self._parse_cache_key(link, ref) for res_id, link, ref, _ in batch}
+            cached = self.db.get_cached_extractions(keys.values())
+            routes = self.factory.route_domains(link for res_id, link, _, _ in batch if keys[res_id] not in cached)
+
+            changed, unchanged, misses = [], [], []
+            for res_id, link, ref, current in batch:
+                key = keys[res_id]
+                entry = cached.get(key)
+                if entry and versions.get(entry[0]) == entry[1]:
+                    if self._parser_fields(entry[2]) == current:
+                        unchanged.append(res_id)
+                    else:
+                        changed.append((res_id, entry[2]))
+                    continue
+                html = self.db.blobs.get(ref)
+                if html:
+                    # Mesma decisão do processo trabalhador (_parse_batch)
+                    parser_cls = type(self.factory.get_parser(link, html_content=html, routes=routes))
+                    pending_keys[res_id] = key + (self.factory.parser_name(parser_cls), parser_cls.VERSION)
+                    misses.append((res_id, link, html))
+                elif job:
+                    job.failed(res_id, "HTML não encontrado no armazenamento")
+
+            if changed or unchanged:
+                on_cached(changed, unchanged)
+            if misses:
+                yield misses
+
+    def _parse_cache_key(self, link, ref):
+        """(hash do HTML, link, versão das rotas); o hash sai da referência 'blob:<sha>' sem descomprimir."""
+        return HtmlBlobStore.hash_of(ref), link or "", self.factory.VERSION
+
+    @staticmethod
+    def _parser_fields(data):
+        """Valores que db.update_parser_data_many gravaria: (sigla, universidade, programa, link_pdf)."""
+        return tuple(data.get(field, '-') for field in ('sigla', 'universidade', 'programa', 'link_pdf'))
+
+    def _select_parse_source(self, l_busc, h_busc, l_repo, h_repo):
+        """Prefere o HTML do repositório; usa o do buscador quando ele está vazio."""
+        if h_repo and len(h_repo) > 100:
+            return h_repo, l_repo
+        return h_busc, l_busc
+
     def _sync_extract_university_info(self, res_id, on_status_change):
         record = self.db.fetch_research_record(res_id)
         if not record: return False
@@ -577,7 +1079,6 @@ class MainViewModel:
         link_buscador = record[2]
         link_repo = record[3]
         
-        scraper = WebScraper()
         parser = None
         html_content = None
         base_url = None
@@ -597,7 +1098,7 @@ class MainViewModel:
             html_content = saved_html
         else:
             self._update_step(f"Baixando: {base_url[:40]}...", on_status_change)
-            html_content = scraper.download_page(base_url)
+            html_content = self.scraper.download_page(base_url)
             if html_content:
                 self.db.save_html_repositorio(res_id, html_content)
 
@@ -647,25 +1148,17 @@ class MainViewModel:
 
     def _internal_extraction_logic(self, res_id):
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                SELECT link_buscador, html_buscador, link_repositorio, html_repositorio 
-                FROM pesquisas_extraidas WHERE id=?
-            """, (res_id,))
-            row = cursor.fetchone()
+            row = self.db.get_extraction_sources(res_id)
             
             if not row: return False
 
-            l_busc, h_busc, l_repo, h_repo = row
-            
-            source_html = h_repo if (h_repo and len(h_repo) > 100) else h_busc
-            active_link = l_repo if (h_repo and len(h_repo) > 100) else l_busc
+            source_html, active_link = self._select_parse_source(*row)
 
             if not source_html: return False
 
             parser = self.factory.get_parser(active_link, html_content=source_html)
             
-            details = parser.extract_pure_soup(source_html, active_link)
+            details = parser.extract_pure_soup(parse_document(source_html), active_link)
             
             self.db.update_parser_data(res_id, details)
             return True
@@ -695,42 +1188,110 @@ class MainViewModel:
                 except Exception:
                     pass
 
-    def batch_download_repository_html(self, on_status_change, callback_refresh):
+    def batch_download_repository_html(self, on_status_change, callback_refresh,
+                                       max_workers=None, per_domain=None, job_id=None, refresh=False):
         def task():
             try:
-                cursor = self.db.conn.cursor()
-                cursor.execute("""
-                    SELECT id FROM pesquisas_extraidas 
-                    WHERE (html_repositorio IS NULL OR html_repositorio = '')
-                    AND (link_repositorio IS NOT NULL OR link_buscador IS NOT NULL)
-                """)
-                rows = cursor.fetchall()
-                total = len(rows)
-
-                if total == 0:
-                    self._update_step("Todos os registros já possuem HTML salvo.", on_status_change)
-                    return
-
-                self._update_step(f"Iniciando download em lote de {total} itens...", on_status_change)
-                
-                success_count = 0
-                for i, (rid,) in enumerate(rows, 1):
-                    self._update_step(f"[{i}/{total}] Baixando HTML (ID {rid})...", on_status_change)
-                    
-                    if self._internal_download_logic(rid):
-                        success_count += 1
-                    
-                    time.sleep(0.5)
-
-                self._update_step(f"Lote finalizado! {success_count} novos arquivos salvos.", on_status_change)
-                if callback_refresh: callback_refresh()
-
+                self.run_download_batch(on_status_change, max_workers, per_domain, job_id, refresh)
+                if callback_refresh:
+                    callback_refresh()
             except Exception as e:
                 self.db.log_event(f"Erro Crítico Batch Download: {str(e)}")
                 self._update_step(f"Erro no Lote: {str(e)}", on_status_change)
 
         threading.Thread(target=task, daemon=True).start()
 
+    def run_download_batch(self, on_status_change=None, max_workers=None, per_domain=None, job_id=None,
+                           refresh=False):
+        """
+        Núcleo síncrono de batch_download_repository_html; retorna o id do job (None se um lote novo não tinha o que baixar).
+        Com `refresh`, baixa de novo também os registros que já têm HTML: as páginas em cache
+        são revalidadas por GET condicional e as inalteradas voltam como 304, sem corpo.
+        """
+        job = None
+        try:
+            # Na retomada, os itens do job definem o lote (inclusive os de uma atualização)
+            rows = self.db.get_pending_repository_downloads(include_stored=refresh or job_id is not None)
+            if job_id is not None:
+                self._claim_job(job_id, JOB_KIND_DOWNLOAD)
+                # Retomada: apenas os itens que o job ainda não concluiu
+                pending = set(self.db.get_pending_job_items(job_id))
+                rows = [row for row in rows if str(row[0]) in pending]
+
+            jobs = []
+            for rid, l_busc, l_repo in rows:
+                target_url = self._pick_download_url(l_busc, l_repo)
+                if target_url:
+                    jobs.append((rid, target_url))
+            total = len(jobs)
+
+            if total == 0:
+                if job_id is not None:
+                    self.db.set_job_state(job_id, JOB_DONE)
+                    self.db.release_job(job_id, self.job_owner)
+                self._update_step("Todos os registros já possuem HTML salvo.", on_status_change)
+                return job_id
+
+            job = self._open_job(
+                JOB_KIND_DOWNLOAD, [rid for rid, _ in jobs],
+                {'max_workers': max_workers, 'per_domain': per_domain, 'refresh': refresh}, job_id
+            )
+
+            self._update_step(f"Iniciando download em lote de {total} itens...", on_status_change)
+
+            # Parser de cada domínio resolvido uma vez: decide quem vai pela API REST do DSpace
+            routes = self.factory.route_domains(url for _, url in jobs)
+
+            # Os downloads esperam durante a pausa e desistem após o cancelamento
+            def fetch(url):
+                if not job.wait_if_paused():
+                    return None
+                return self._fetch_repository_html(url, routes)
+
+            engine = DownloadEngine(
+                fetch,
+                max_workers=max_workers or self.download_workers,
+                per_domain=per_domain or self.download_per_domain,
+                is_blocked=self.throttle.is_open
+            )
+            success = {'count': 0}
+            skipped = {'count': 0}
+
+            # Executado sempre na thread do lote: único escritor no banco
+            def on_result(rid, url, html_content):
+                if html_content:
+                    bulk.call(self.db.update_html_repositorio, rid, html_content)
+                    job.done(rid)
+                    success['count'] += 1
+                elif not job.cancelled:
+                    self.db.log_event(f"HTML vazio ou inválido para ID {rid}")
+                    job.failed(rid, "HTML vazio ou inválido")
+
+            def on_skip(rid, url):
+                skipped['count'] += 1
+
+            def on_progress(done, total_items):
+                if done % 10 == 0 or done == total_items:
+                    self._update_step(f"[{done}/{total_items}] HTMLs de repositório baixados...", on_status_change)
+
+            # HTMLs são gravados em transações agrupadas (N itens ou T ms)
+            with self.db.bulk() as bulk:
+                job.bulk = bulk
+                engine.run(jobs, on_result, on_progress, on_skip, should_stop=lambda: job.cancelled)
+
+            # Itens adiados pelo disjuntor continuam pendentes: o job fica aberto para ser retomado
+            self._close_job(job, complete=not skipped['count'])
+            if skipped['count']:
+                self.db.log_event(
+                    f"{skipped['count']} itens adiados por domínios pausados pelo disjuntor; "
+                    f"o job {job.job_id} será retomado.")
+            status = "cancelado" if job.cancelled else "finalizado"
+            deferred = f" ({skipped['count']} adiados pelo disjuntor)" if skipped['count'] else ""
+            self._update_step(f"Lote {status}! {success['count']} novos arquivos salvos{deferred}.", on_status_change)
+            return job.job_id
+        finally:
+            self._release_job(job)
+
     def download_repository_html(self, row_id, on_status_change, callback_refresh):
         def task():
             self._update_step(f"Baixando HTML para ID {row_id}...", on_status_change)
@@ -747,18 +1308,13 @@ class MainViewModel:
             record = self.db.fetch_research_record(row_id)
             if not record: return False
 
-            l_busc = record[2]
-            l_repo = record[3]
-
-            target_url = l_repo if (l_repo and l_repo.startswith('http')) else l_busc
-            
-            if not target_url or not target_url.startswith('http'):
+            target_url = self._pick_download_url(record[2], record[3])
+            if not target_url:
                 return False
 
-            scraper = WebScraper()
-            html_content = scraper.download_page(target_url)
-            
-            if html_content and len(html_content) > 100:
+            html_content = self._fetch_repository_html(target_url)
+
+            if html_content:
                 self.db.update_html_repositorio(row_id, html_content)
                 return True
             else:
@@ -768,4 +1324,27 @@ class MainViewModel:
         except Exception as e:
             self.db.log_event(f"Erro interno download ID {row_id}: {str(e)}")
             return False
-    
\ No newline at end of file
+
+    def _fetch_via_dspace_rest(self, url, routes=None):
+        """Página do item montada pela API REST quando o repositório usa um parser DSpace Angular."""
+        if not isinstance(self.factory.get_parser(url, routes=routes), DSpaceAngularParser):
+            return None
+        try:
+            return self.dspace.item_document(url)
+        except Exception as e:
+            self.db.log_event(f"API REST do DSpace indisponível para {url}: {e}")
+            return None
+
+    def _pick_download_url(self, l_busc, l_repo):
+        """Prioriza o link do repositório; usa o do buscador como alternativa."""
+        target_url = l_repo if (l_repo and l_repo.startswith('http')) else l_busc
+        if not target_url or not target_url.startswith('http'):
+            return None
+        return target_url
+
+    def _fetch_repository_html(self, url, routes=None):
+        """Baixa a página (seguro para threads) e descarta respostas vazias; `routes` de route_domains."""
+        html_content = self._fetch_via_dspace_rest(url, routes) or self.scraper.download_page(url)
+        if html_content and len(html_content) > 100:
+            return html_content
+        return None
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from models.db_handler import RESEARCH_SORT_COLUMNS
+
+# Posição de cada coluna ordenável na linha retornada pelo banco (id na posição 0)
+_ROW_INDEX = {key: idx for idx, key in enumerate(
+    ['titulo', 'autor', 'link_busc', 'link_repo', 'sigla', 'univ', 'prog', 'pdf', 'termo', 'ano'], 1)}
+
+
+class ResearchGridModel:
+    """
+    Modelo virtual da grade de Pesquisas.
+
+    Entrega os registros em janelas de tamanho fixo (keyset pela chave de
+    ordenação + id) e já busca a janela seguinte em segundo plano, para que a
+    rolagem não espere pelo banco.
+    """
+
+    def __init__(self, db, window_size=200):
+        self.db = db
+        self.window_size = window_size
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.reset()
+
+    def reset(self, filters=None, sort_key=None, descending=False, query=""):
+        """Reinicia a grade com novos filtros/ordenação e, opcionalmente, uma busca textual."""
+        self.filters = dict(filters or {})
+        self.query = (query or "").strip()
+        self.sort_key = sort_key if sort_key in RESEARCH_SORT_COLUMNS else None
+        self.descending = descending
+        self.has_more = True
+        self._cursor = None
+        self._prefetch = None
+
+    def next_window(self):
+        """Retorna a próxima janela de linhas (lista vazia quando acabou)."""
+        if not self.has_more:
+            return []
+
+        if self._prefetch is not None and self._prefetch[0] == self._cursor:
+            rows = self._prefetch[1].result()
+        else:
+            rows = self._fetch(self._cursor)
+        self._prefetch = None
+
+        if len(rows) < self.window_size:
+            self.has_more = False
+        if rows:
+            self._cursor = self._advance(rows)
+
+        # Antecipa a janela vizinha enquanto o usuário ainda está lendo esta
+        if self.has_more:
+            cursor = self._cursor
+            self._prefetch = (cursor, self._executor.submit(self._fetch, cursor))
+        return rows
+
+    def _fetch(self, after):
+        if self.query:
+            # Resultados da busca vêm por relevância: paginação por deslocamento
+            return self.db.search_research_window(
+                self.query, self.filters, self.sort_key, self.descending, after or 0, self.window_size
+            )
+        return self.db.fetch_research_window(
+            self.filters, self.sort_key, self.descending, after, self.window_size
+        )
+
+    def _advance(self, rows):
+        if self.query:
+            return (self._cursor or 0) + len(rows)
+        return self._key_of(rows[-1])
+
+    def _key_of(self, row):
+        if self.sort_key is None:
+            return (None, row[0])
+        return (row[_ROW_INDEX[self.sort_key]] or '', row[0])
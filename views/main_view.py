@@ -41,7 +41,7 @@ class MainView(ctk.CTk):
         # 2. Inicialização das Abas (Instanciação das Classes Modulares)
         
         # Guia 4: URLs (Raízes)
-        self.url_roots_view = UrlRootsTab(self.tab_urls, self.vm)
+        self.url_roots_view = UrlRootsTab(self.tab_urls, self.vm, self.update_status_ui)
         self.url_roots_view.pack(fill="both", expand=True)
 
         # Guia 3: Pesquisas (Passa callback para atualizar URLs)
@@ -87,6 +87,31 @@ class MainView(ctk.CTk):
         )
         self.status_label.pack(side="left", padx=15, pady=2)
 
+        # Controles dos lotes em execução (alinhados à direita)
+        self.btn_cancel_job = ctk.CTkButton(
+            self.status_frame, text="✖ Cancelar", width=80, height=22,
+            fg_color="#8b0000", command=lambda: self.update_status_ui(self.vm.cancel_jobs())
+        )
+        self.btn_cancel_job.pack(side="right", padx=(5, 15), pady=2)
+
+        self.btn_resume_job = ctk.CTkButton(
+            self.status_frame, text="▶ Retomar", width=80, height=22,
+            command=lambda: self.update_status_ui(self.vm.resume_jobs())
+        )
+        self.btn_resume_job.pack(side="right", padx=5, pady=2)
+
+        self.btn_pause_job = ctk.CTkButton(
+            self.status_frame, text="⏸ Pausar", width=80, height=22,
+            command=lambda: self.update_status_ui(self.vm.pause_jobs())
+        )
+        self.btn_pause_job.pack(side="right", padx=5, pady=2)
+
+        # Lotes interrompidos no último fechamento continuam de onde pararam
+        self.vm.resume_unfinished_jobs(
+            self.update_status_ui,
+            lambda: self.after(0, self.research_view.load_research_data)
+        )
+
     def _setup_html_viewers(self):
         """Campos de texto para visualização de código fonte."""
         self.txt_html_busc = ctk.CTkTextbox(self.tab_html_busc, wrap="none", font=("Consolas", 12))
@@ -108,7 +133,7 @@ class MainView(ctk.CTk):
         
         # Verifica palavras-chave de conclusão para reabilitar botões
         msg_lower = message.lower()
-        keywords = ["finalizado", "finalizada", "concluída", "sucesso", "erro", "expandidas"]
+        keywords = ["finalizado", "finalizada", "concluída", "sucesso", "erro", "expandidas", "cancelado"]
         
         if any(kw in msg_lower for kw in keywords):
             self._reall_buttons()
@@ -10,6 +10,11 @@ class HistoryTab(ctk.CTkFrame):
         
         self.history_buttons = []
         
+        # Paginação da lista (apenas metadados; o HTML é carregado ao selecionar)
+        self.page_size = 50
+        self.current_page = 1
+        self.total_pages = 1
+        
         self.selected_row_id = None
         self.selected_row_termo = None
         self.selected_row_page = None
@@ -21,9 +26,24 @@ class HistoryTab(ctk.CTkFrame):
         self.history_container = ctk.CTkFrame(self)
         self.history_container.pack(fill="both", expand=True, padx=5, pady=5)
         
-        # Painel Esquerdo: Lista de Capturas
-        self.list_frame = ctk.CTkScrollableFrame(self.history_container, width=220, label_text="Capturas")
-        self.list_frame.pack(side="left", fill="y", padx=(0, 5))
+        # Painel Esquerdo: Lista de Capturas (paginada)
+        self.list_panel = ctk.CTkFrame(self.history_container, fg_color="transparent")
+        self.list_panel.pack(side="left", fill="y", padx=(0, 5))
+
+        self.list_frame = ctk.CTkScrollableFrame(self.list_panel, width=220, label_text="Capturas")
+        self.list_frame.pack(fill="y", expand=True)
+
+        self.pager_frame = ctk.CTkFrame(self.list_panel, fg_color="transparent")
+        self.pager_frame.pack(fill="x", pady=(5, 0))
+
+        self.btn_prev_page = ctk.CTkButton(self.pager_frame, text="◀", width=40, height=24, command=self.prev_page)
+        self.btn_prev_page.pack(side="left")
+
+        self.lbl_page = ctk.CTkLabel(self.pager_frame, text="1/1", font=("Roboto", 11))
+        self.lbl_page.pack(side="left", expand=True)
+
+        self.btn_next_page = ctk.CTkButton(self.pager_frame, text="▶", width=40, height=24, command=self.next_page)
+        self.btn_next_page.pack(side="right")
         
         # Painel Direito: Conteúdo e Ações
         self.content_frame = ctk.CTkFrame(self.history_container)
@@ -74,15 +94,20 @@ class HistoryTab(ctk.CTkFrame):
                 btn.destroy()     # Destrói o objeto
         self.history_buttons.clear()
 
-        # 2. Busca dados atualizados
-        data = self.vm.get_history()
+        # 2. Busca apenas a página atual (metadados, sem HTML)
+        data, total = self.vm.get_history_page(self.current_page, self.page_size)
+        self.total_pages = max(1, -(-total // self.page_size))
+        if self.current_page > self.total_pages:
+            self.current_page = self.total_pages
+            data, total = self.vm.get_history_page(self.current_page, self.page_size)
+        self._update_pager()
         if not data:
             return
 
         # 3. Recria a lista
         for row in data:
-            # row: (rowid, termo, data_coleta, html_source, pagina)
-            display_text = f"Pág {row[4]}: {row[1][:20]}..."
+            # row: (rowid, termo, data_coleta, pagina, ano)
+            display_text = f"Pág {row[3]}: {row[1][:20]}..."
             
             btn = ctk.CTkButton(
                 self.list_frame, 
@@ -94,16 +119,31 @@ class HistoryTab(ctk.CTkFrame):
             btn.pack(fill="x", pady=2)
             
             # Bind para botão direito (Menu de Contexto)
-            btn.bind("<Button-3>", lambda e, rid=row[0], rt=row[1], rp=row[4]: 
+            btn.bind("<Button-3>", lambda e, rid=row[0], rt=row[1], rp=row[3]: 
                      self.show_context_menu(e, rid, rt, rp))
             
             self.history_buttons.append(btn)
 
+    def _update_pager(self):
+        self.lbl_page.configure(text=f"{self.current_page}/{self.total_pages}")
+        self.btn_prev_page.configure(state="normal" if self.current_page > 1 else "disabled")
+        self.btn_next_page.configure(state="normal" if self.current_page < self.total_pages else "disabled")
+
+    def prev_page(self):
+        if self.current_page > 1:
+            self.current_page -= 1
+            self.load_history_list()
+
+    def next_page(self):
+        if self.current_page < self.total_pages:
+            self.current_page += 1
+            self.load_history_list()
+
     def display_content(self, row_data):
-        """Exibe o HTML convertido em texto na área de visualização."""
+        """Carrega o HTML da captura selecionada sob demanda e o exibe como texto."""
         self.txt_content.configure(state="normal")
         self.txt_content.delete("0.0", "end")
-        self.txt_content.insert("0.0", self.vm.render_html_to_text(row_data[3]))
+        self.txt_content.insert("0.0", self.vm.get_history_text(row_data[0]))
         self.txt_content.configure(state="disabled")
 
     def show_context_menu(self, event, row_id, termo, page):
@@ -115,6 +155,7 @@ class HistoryTab(ctk.CTkFrame):
         
         if page == 1: 
             self.context_menu.add_command(label="🔍 Buscar Todas Páginas", command=self.trigger_pagination_scrape)
+            self.context_menu.add_command(label="⚡ Importar via API", command=self.trigger_api_import)
             
         self.context_menu.add_separator()
         self.context_menu.add_command(label="Excluir", command=self.delete_current_selection)
@@ -131,20 +172,21 @@ class HistoryTab(ctk.CTkFrame):
         if self.selected_row_id: 
             self.vm.process_pagination(self.selected_row_id, self.update_status_ui, self.load_history_list)
 
+    def trigger_api_import(self):
+        if self.selected_row_id:
+            self.vm.import_search_via_api(self.selected_row_id, self.update_status_ui, self.load_research_data)
+
     def trigger_batch_extraction(self):
-        data = self.vm.get_history()
-        if data:
+        row_ids = self.vm.get_history_ids()
+        if row_ids:
             self.btn_extract_all.configure(state="disabled", text="Processando...")
-            row_ids = [row[0] for row in data]
             self.vm.batch_extract_research_data(row_ids, self.update_status_ui, None, self.load_research_data)
 
     def trigger_batch_pagination(self):
-        data = self.vm.get_history()
-        if data:
-            target_ids = [row[0] for row in data if row[4] == 1]
-            if target_ids:
-                self.btn_paginate_all.configure(state="disabled", text="Paginando...")
-                self.vm.batch_process_pagination(target_ids, self.update_status_ui, self.load_history_list)
+        target_ids = self.vm.get_history_ids(first_page_only=True)
+        if target_ids:
+            self.btn_paginate_all.configure(state="disabled", text="Paginando...")
+            self.vm.batch_process_pagination(target_ids, self.update_status_ui, self.load_history_list)
 
     def delete_current_selection(self):
         if self.selected_row_id: 
@@ -12,6 +12,12 @@ class ResearchTab(ctk.CTkFrame):
         # Labels fixos para o menu de contexto
         self.LABEL_EXTRACT = "🎓 Extrair Dados Institucionais"
         self.LABEL_PDF = "📄 Abrir Link do PDF"
+
+        # Grade virtual: linhas chegam em janelas conforme a rolagem
+        self.grid_model = self.vm.research_grid
+        self.sort_key = None
+        self.sort_desc = False
+        self._loading_window = False
         
         self.setup_ui()
 
@@ -30,16 +36,31 @@ class ResearchTab(ctk.CTkFrame):
         else:
              current_filters = {}
         
-        rows = self.vm.filter_researches(current_filters)
-        self._populate_treeview(rows)
+        query = self.search_var.get() if hasattr(self, 'search_var') else ""
+        self.grid_model.reset(current_filters, self.sort_key, self.sort_desc, query)
+        self._populate_treeview(self.grid_model.next_window())
 
     def sort_treeview(self, col, reverse):
-        """Ordena o conteúdo da Treeview ao clicar no título da coluna."""
-        l = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
-        l.sort(reverse=reverse)
-        for index, (val, k) in enumerate(l):
-            self.tree.move(k, '', index)
+        """Ordena pelo banco ao clicar no título da coluna e recarrega a primeira janela."""
+        self.sort_key, self.sort_desc = col, reverse
+        for key, text in self.headers.items():
+            arrow = (" ▼" if reverse else " ▲") if key == col else ""
+            self.tree.heading(key, text=text + arrow)
         self.tree.heading(col, command=lambda: self.sort_treeview(col, not reverse))
+        self.load_research_data()
+
+    def _on_tree_scroll(self, first, last):
+        """Repassa a posição à barra de rolagem e carrega a próxima janela perto do fim."""
+        self.vsb.set(first, last)
+        if float(last) > 0.95 and self.grid_model.has_more and not self._loading_window:
+            self._loading_window = True
+            self.after_idle(self._append_next_window)
+
+    def _append_next_window(self):
+        try:
+            self._populate_treeview(self.grid_model.next_window(), clear=False)
+        finally:
+            self._loading_window = False
 
     def show_research_context_menu(self, event):
         """Menu de contexto atualizado com callbacks de atualização pontual."""
@@ -110,12 +131,11 @@ class ResearchTab(ctk.CTkFrame):
             self.research_menu.tk_popup(event.x_root, event.y_root)
 
     def _get_id_from_selected(self):
-        """Recupera o ID da base de dados através do título selecionado."""
+        """Recupera o ID da base de dados a partir da linha selecionada."""
         selected = self.tree.selection()
         if not selected: return None
-        titulo = self.tree.item(selected[0])['values'][0]
-        res = self.vm.db.conn.execute("SELECT id FROM pesquisas_extraidas WHERE titulo=?", (titulo,)).fetchone()
-        return res[0] if res else None
+        # O IID de cada linha é o próprio id do registro no banco
+        return int(selected[0])
 
     def trigger_extract_univ(self):
         """Dispara o Parser e atualiza apenas a linha selecionada ao finalizar."""
@@ -210,7 +230,11 @@ class ResearchTab(ctk.CTkFrame):
             self.after(0, lambda: self.btn_batch_extract.configure(state="normal", text="🚀 Extrair Dados de Todas as Pesquisas (Lote)"))
             self.after(0, self.load_research_data)
 
-        self.vm.batch_extract_university_info(ids, self.update_status_ui, on_finish)
+        self.vm.batch_extract_university_info(
+            on_status_change=self.update_status_ui,
+            callback_refresh=on_finish,
+            ids=ids
+        )
 
     def trigger_batch_parser(self):
         self.btn_process_all.configure(state="disabled", text="Processando...")
@@ -288,7 +312,7 @@ class ResearchTab(ctk.CTkFrame):
         cols = ("titulo", "autor", "link_busc", "link_repo", "sigla", "univ", "prog", "pdf", "termo", "ano")
         self.tree = ttk.Treeview(self.res_container, columns=cols, show="headings")
         
-        headers = {
+        self.headers = headers = {
             "titulo": "Pesquisa", "autor": "Autor", "link_busc": "Buscador", 
             "link_repo": "Repos.", "sigla": "Sigla", "univ": "Univ", 
             "prog": "Programa", "pdf": "PDF", "termo": "Termo Busca", "ano": "Ano Filtro"
@@ -299,13 +323,13 @@ class ResearchTab(ctk.CTkFrame):
             width = 90 if col in ["termo", "ano", "sigla", "pdf"] else 120
             self.tree.column(col, width=width)
         
-        vsb = ttk.Scrollbar(self.res_container, orient="vertical", command=self.tree.yview)
+        self.vsb = ttk.Scrollbar(self.res_container, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(self.res_container, orient="horizontal", command=self.tree.xview)
         
-        self.tree.configure(yscroll=vsb.set, xscroll=hsb.set)
+        self.tree.configure(yscroll=self._on_tree_scroll, xscroll=hsb.set)
         
         self.tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
+        self.vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
         
         self.res_container.grid_rowconfigure(0, weight=1)
@@ -364,18 +388,44 @@ class ResearchTab(ctk.CTkFrame):
         )
         self.btn_filter.pack(side="left", padx=10, pady=10)
 
+        # Busca textual (título, autor, programa, universidade, termo e texto das páginas)
+        self.search_var = ctk.StringVar(value="")
+        self.entry_search = ctk.CTkEntry(
+            self.filter_frame,
+            textvariable=self.search_var,
+            placeholder_text="Buscar texto...",
+            width=180,
+            height=24
+        )
+        self.entry_search.pack(side="left", padx=(0, 5), pady=10)
+        self.entry_search.bind("<Return>", self.apply_filters)
+
+        self.btn_clear_search = ctk.CTkButton(
+            self.filter_frame,
+            text="✕",
+            width=24,
+            height=24,
+            fg_color="#444444",
+            command=self.clear_search
+        )
+        self.btn_clear_search.pack(side="left", pady=10)
+
     def apply_filters(self, _=None):
-        current_filters = {key: var.get() for key, var in self.filter_vars.items()}
-        rows = self.vm.filter_researches(current_filters)
-        self._populate_treeview(rows)
+        self.load_research_data()
+
+    def clear_search(self):
+        self.search_var.set("")
+        self.load_research_data()
 
-    def _populate_treeview(self, rows):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _populate_treeview(self, rows, clear=True):
+        if clear:
+            self.tree.delete(*self.tree.get_children())
             
         for row in rows:
             display_values = row[1:]
-            self.tree.insert("", "end", values=display_values, tags=(row[0],))
+            iid = str(row[0])
+            if not self.tree.exists(iid):
+                self.tree.insert("", "end", iid=iid, values=display_values, tags=(row[0],))
 
     def trigger_batch_download(self):
         self.btn_download_all.configure(state="disabled", text="Baixando...")
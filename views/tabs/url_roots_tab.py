@@ -2,14 +2,17 @@ import tkinter as tk
 import customtkinter as ctk
 
 class UrlRootsTab(ctk.CTkFrame):
-    def __init__(self, master, vm, **kwargs):
+    def __init__(self, master, vm, on_status_change=None, **kwargs):
         super().__init__(master, **kwargs)
         self.vm = vm
+        self.on_status_change = on_status_change
         
         # Dicionário para rastrear as variáveis dos checkboxes em memória
         self.domain_vars = {}
+        self.domain_checkboxes = {}
         
         self.setup_ui()
+        self._schedule_breaker_refresh()
 
     def setup_ui(self):
         """Configura a interface da guia com botão de sincronização e lista de filtros."""
@@ -23,7 +26,16 @@ class UrlRootsTab(ctk.CTkFrame):
             command=self.update_url_roots_list,
             width=300
         )
-        self.btn_sync_domains.pack(pady=10)
+        self.btn_sync_domains.pack(side="left", expand=True, pady=10)
+
+        # Coleta em massa dos metadados dos domínios ativos (substitui o download página a página)
+        self.btn_harvest_oai = ctk.CTkButton(
+            self.frame_url_actions,
+            text="📚 Coletar Metadados (OAI-PMH)",
+            command=self.trigger_oai_harvest,
+            width=250
+        )
+        self.btn_harvest_oai.pack(side="left", expand=True, pady=10)
 
         # Área rolável para exibir os domínios únicos
         self.scroll_urls = ctk.CTkScrollableFrame(
@@ -49,7 +61,10 @@ class UrlRootsTab(ctk.CTkFrame):
             widget.destroy()
             
         self.domain_vars = {}
+        self.domain_checkboxes = {}
+        breaker_states = self.vm.get_domain_breaker_states()
         
+        new_domains = {}
         for dom in domains:
             # Recupera estado salvo (True por padrão se for um novo domínio)
             state = saved_states.get(dom, True)
@@ -58,13 +73,42 @@ class UrlRootsTab(ctk.CTkFrame):
             # Cria o checkbox vinculado à função de salvamento do banco
             cb = ctk.CTkCheckBox(
                 self.scroll_urls, 
-                text=dom, 
+                text=self._domain_label(dom, breaker_states), 
                 variable=var,
                 command=lambda d=dom, v=var: self.vm.db.save_domain_state(d, v.get())
             )
             cb.pack(anchor="w", padx=20, pady=5)
             self.domain_vars[dom] = var
+            self.domain_checkboxes[dom] = cb
             
-            # Se for um domínio novo, persiste o estado padrão imediatamente
+            # Se for um domínio novo, persiste o estado padrão (todos em uma única transação)
             if dom not in saved_states:
-                self.vm.db.save_domain_state(dom, True)
\ No newline at end of file
+                new_domains[dom] = True
+
+        self.vm.db.save_domain_states(new_domains)
+
+    def trigger_oai_harvest(self):
+        self.btn_harvest_oai.configure(state="disabled")
+
+        def on_status(message):
+            if self.on_status_change:
+                self.on_status_change(message)
+            if "finalizada" in message or "Erro" in message or "Nenhum" in message:
+                self.after(0, lambda: self.btn_harvest_oai.configure(state="normal"))
+
+        self.vm.harvest_oai_metadata(on_status, None)
+
+    def _domain_label(self, dom, breaker_states):
+        """Texto do checkbox com o estado do disjuntor, quando o domínio não está normal."""
+        state = breaker_states.get(dom)
+        return f"{dom}   ⛔ {state}" if state else dom
+
+    def _schedule_breaker_refresh(self):
+        """Atualiza periodicamente o estado do disjuntor exibido em cada domínio."""
+        if not self.winfo_exists():
+            return
+        breaker_states = self.vm.get_domain_breaker_states()
+        for dom, cb in self.domain_checkboxes.items():
+            if cb.winfo_exists():
+                cb.configure(text=self._domain_label(dom, breaker_states))
+        self.after(5000, self._schedule_breaker_refresh)